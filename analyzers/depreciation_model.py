@@ -0,0 +1,361 @@
+"""
+중고차 감가 모델 (로그 선형 회귀, 계수 테이블 캐시)
+- log(가격) = 절편 + 연식 경과(age) 기울기 + 주행거리 구간 효과 (sample_count 가중)
+- 모델별 충분통계량 X'WX, X'Wy, y'Wy를 DepreciationModel 테이블에 저장해
+  새로 들어온 행만 더하는 증분 재적합 (보존 기간이 지난 가격 행의 정보도 유지)
+  - UsedCarPrice: price_id 워터마크 (늦게 적재된 과거 수집일 행도 반영)
+  - 매물 저장 소스(UsedCarListing): 집계 행은 최근 N일 창이 겹쳐 같은 매물이 여러 번
+    들어가므로 집계 대신 first_seen 기준으로 매물당 한 번만 (가중치 1)
+- 세그먼트 / 전체 통계량은 모델 통계량의 합. 모델 계수는 세그먼트 계수 쪽으로,
+  세그먼트 계수는 전체 계수 쪽으로 수축 (데이터가 적은 모델은 사전분포가 지배)
+- 예측: 기준 시세 x exp(age 기울기 x 경과 연수) -> 메모리 조회 + 상수 시간 계산
+
+    model = DepreciationModel()
+    model.refit()                     # 새 가격 행만 반영
+    model.predict(model_id, years=3)  # [1년 뒤, 2년 뒤, 3년 뒤] 예상 시세
+"""
+import sys
+import os
+import json
+import time
+import threading
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_helper import db_helper
+from config.config import DEPRECIATION_CONFIG, MILEAGE_BANDS, CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 특성(주행거리 구간 등)이 바뀌면 올려서 전체 재적합
+MODEL_VERSION = 1
+
+BAND_LABELS = [label for _, label in MILEAGE_BANDS]
+# 구간 라벨이 아닌 행 (미확인, 'YYYY년식 평균')은 기준 범주 (더미 전부 0)
+FEATURES = ['intercept', 'age'] + [f'band:{label}' for label in BAND_LABELS]
+GLOBAL_KEY = '전체'
+ACCUMULATE_CHUNK = 50000
+
+
+def design_matrix(ages, bands):
+    """경과 연수, 주행거리 구간 라벨 -> (n, p) 설계 행렬"""
+    ages = np.asarray(ages, dtype=float)
+    codes = pd.Categorical(pd.Series(bands, dtype=object), categories=BAND_LABELS).codes
+    X = np.zeros((len(ages), len(FEATURES)))
+    X[:, 0] = 1.0
+    X[:, 1] = ages
+    known = codes >= 0
+    X[np.flatnonzero(known), 2 + codes[known]] = 1.0
+    return X
+
+
+def observation_frame(rows):
+    """get_used_price_observations 결과 -> age / log 가격 / 가중치 컬럼 추가"""
+    frame = rows.copy()
+    collected = pd.to_datetime(frame['collected_date'])
+    frame['age'] = np.maximum(collected.dt.year + (collected.dt.month - 1) / 12
+                              - pd.to_numeric(frame['year'], errors='coerce'), 0)
+    frame['log_price'] = np.log(pd.to_numeric(frame['avg_price'], errors='coerce'))
+    frame['weight'] = pd.to_numeric(frame['sample_count'], errors='coerce').fillna(1).clip(lower=1)
+    return frame[np.isfinite(frame['log_price']) & frame['age'].notna()]
+
+
+def accumulate(keys, X, y, w):
+    """그룹별 충분통계량 -> (keys, X'WX (g,p,p), X'Wy (g,p), y'Wy, 가중치 합, 행 수)
+
+    키 순으로 정렬 후 reduceat으로 묶고, 외적 메모리는 ACCUMULATE_CHUNK 행 단위로 제한
+    """
+    order = np.argsort(keys, kind='stable')
+    keys, X, y, w = keys[order], X[order], y[order], w[order]
+    unique, starts = np.unique(keys, return_index=True)
+    p = X.shape[1]
+    xtx = np.zeros((len(unique), p, p))
+    xty = np.zeros((len(unique), p))
+    yty = np.zeros(len(unique))
+    weight_sum = np.zeros(len(unique))
+    group = np.repeat(np.arange(len(unique)), np.diff(np.append(starts, len(keys))))
+
+    for start in range(0, len(keys), ACCUMULATE_CHUNK):
+        part = slice(start, start + ACCUMULATE_CHUNK)
+        g = group[part]
+        bounds = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+        Xw = X[part] * w[part, None]
+        xtx[g[bounds]] += np.add.reduceat(Xw[:, :, None] * X[part][:, None, :], bounds, axis=0)
+        xty[g[bounds]] += np.add.reduceat(Xw * y[part, None], bounds, axis=0)
+        yty[g[bounds]] += np.add.reduceat(w[part] * y[part] ** 2, bounds)
+        weight_sum[g[bounds]] += np.add.reduceat(w[part], bounds)
+    counts = np.diff(np.append(starts, len(keys)))
+    return unique, xtx, xty, yty, weight_sum, counts
+
+
+def solve(xtx, xty, prior=None, strength=0.0):
+    """가중 최소제곱 계수 (사전 계수 쪽으로 ridge 수축, 절편은 수축하지 않음)
+
+    (X'WX + Λ) β = X'Wy + Λ β_prior. 배치 (g,p,p) 입력은 한 번에 풀고, 특이 행렬이면
+    그 그룹만 lstsq (최소 노름 해)로 대체
+    """
+    xtx = np.asarray(xtx, dtype=float)
+    single = xtx.ndim == 2
+    xtx = xtx.reshape(-1, xtx.shape[-2], xtx.shape[-1])
+    xty = np.asarray(xty, dtype=float).reshape(len(xtx), -1)
+    p = xty.shape[1]
+    penalty = np.full(p, float(strength))
+    penalty[0] = 0.0
+    prior = np.zeros((len(xtx), p)) if prior is None else np.broadcast_to(prior, (len(xtx), p))
+
+    A = xtx + penalty[None, :, None] * np.eye(p)[None]
+    b = xty + penalty * prior
+    coefficients = np.empty((len(xtx), p))
+    for index in range(len(xtx)):
+        try:
+            coefficients[index] = np.linalg.solve(A[index], b[index])
+        except np.linalg.LinAlgError:
+            coefficients[index] = np.linalg.lstsq(A[index], b[index], rcond=None)[0]
+    return coefficients[0] if single else coefficients
+
+
+def weighted_rmse(coefficients, xtx, xty, yty, weight_sum):
+    """충분통계량만으로 가중 RMSE (로그 가격 단위)"""
+    rss = yty - 2 * np.einsum('gp,gp->g', coefficients, xty) + np.einsum('gp,gpq,gq->g', coefficients, xtx, coefficients)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(np.maximum(rss, 0) / weight_sum)
+
+
+class DepreciationModel:
+    """계수 테이블 적재/재적합 + 상수 시간 예측"""
+
+    def __init__(self, db=None, config=None):
+        self.db = db or db_helper
+        self.config = {**DEPRECIATION_CONFIG, **(config or {})}
+        self._lock = threading.RLock()
+        self._models = {}     # model_id -> (anchor_price, age_slope)
+        self._segments = {}   # segment -> age_slope
+        self._global_slope = None
+        self.loaded_at = None
+
+    # === 적재 / 조회 ===
+
+    def load(self):
+        """DepreciationModel 테이블 -> 메모리 (쿼리 1회)"""
+        rows = self.db.get_depreciation_models(MODEL_VERSION)
+        models, segments, global_slope = {}, {}, None
+        for row in rows.to_dict('records'):
+            slope = json.loads(row['coefficients'])[1]
+            if row['scope'] == 'model':
+                anchor = float(row['anchor_price']) if row['anchor_price'] is not None else None
+                models[int(row['scope_key'])] = (anchor, slope)
+            elif row['scope'] == 'segment':
+                segments[row['scope_key']] = slope
+            else:
+                global_slope = slope
+        with self._lock:
+            self._models, self._segments, self._global_slope = models, segments, global_slope
+            self.loaded_at = time.monotonic()
+        logger.info(f"감가 모델 적재: 모델 {len(models)}개, 세그먼트 {len(segments)}개")
+
+    def is_stale(self):
+        ttl = CACHE_CONFIG.get('ttl', 3600) if CACHE_CONFIG.get('enable', True) else 0
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > ttl
+
+    def _ensure_fresh(self):
+        if self.is_stale():
+            self.load()
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+
+    def annual_rate(self, model_id=None, segment=None):
+        """연간 감가율 = 1 - exp(age 기울기). 모델 -> 세그먼트 -> 전체 -> 기본값 순"""
+        self._ensure_fresh()
+        with self._lock:
+            if model_id in self._models:
+                slope = self._models[model_id][1]
+            elif segment in self._segments:
+                slope = self._segments[segment]
+            else:
+                slope = self._global_slope
+        if slope is None:
+            return self.config['default_rate']
+        return 1 - float(np.exp(slope))
+
+    def lookup(self, model_id):
+        """(기준 시세, 연간 감가율) 또는 적합 결과가 없으면 None"""
+        self._ensure_fresh()
+        with self._lock:
+            fitted = self._models.get(model_id)
+        if fitted is None or fitted[0] is None:
+            return None
+        return fitted[0], 1 - float(np.exp(fitted[1]))
+
+    def predict(self, model_id, years=3, current_price=None, segment=None):
+        """1..years년 뒤 예상 시세 배열 (적합 결과도 current_price도 없으면 None)"""
+        fitted = self.lookup(model_id)
+        if fitted is not None:
+            anchor, rate = fitted
+        elif current_price is not None:
+            anchor, rate = current_price, self.annual_rate(segment=segment)
+        else:
+            return None
+        return anchor * (1 - rate) ** np.arange(1, years + 1)
+
+    # === 재적합 ===
+
+    def _stored_statistics(self):
+        """저장된 모델 단위 충분통계량 -> {model_id: dict}"""
+        rows = self.db.get_depreciation_models(MODEL_VERSION, scope='model', with_statistics=True)
+        stored = {}
+        for row in rows.to_dict('records'):
+            stored[int(row['scope_key'])] = {
+                'segment': row['segment'],
+                'xtx': np.array(json.loads(row['xtx'])),
+                'xty': np.array(json.loads(row['xty'])),
+                'yty': float(row['yty']),
+                'weight_sum': float(row['weight_sum']),
+                'n_obs': int(row['n_obs']),
+                'anchor_year': row['anchor_year'],
+                'anchor_price': float(row['anchor_price']) if row['anchor_price'] is not None else None,
+                'anchor_date': row['anchor_date'],
+                'price_watermark': int(row['price_watermark']) if pd.notna(row['price_watermark']) else None,
+                'listing_watermark': row['listing_watermark'] if pd.notna(row['listing_watermark']) else None,
+            }
+        return stored
+
+    def _new_observations(self, stored):
+        """저장된 워터마크 이후 적재된 관측 -> (관측 frame, 새 워터마크 dict)
+
+        오늘 적재분은 당일 재집계로 바뀔 수 있어 다음 날 반영
+        """
+        def latest(key):
+            marks = [s[key] for s in stored.values() if s[key] is not None]
+            return max(marks) if marks else None
+
+        before = date.today()
+        price_watermark, listing_watermark = latest('price_watermark'), latest('listing_watermark')
+        prices = self.db.get_used_price_observations(after_price_id=price_watermark, before=before)
+        listings = self.db.get_listing_observations(since=listing_watermark, before=before)
+
+        watermarks = {
+            'price_watermark': int(prices['price_id'].max()) if not prices.empty else price_watermark,
+            'listing_watermark': (pd.to_datetime(listings['collected_date']).max().date()
+                                  if not listings.empty else listing_watermark),
+        }
+        frames = [frame.drop(columns=['price_id'], errors='ignore') for frame in (prices, listings) if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=['model_id', 'segment', 'year', 'mileage_range', 'avg_price',
+                                         'sample_count', 'collected_date', 'age', 'log_price', 'weight']), watermarks
+        return observation_frame(pd.concat(frames, ignore_index=True)), watermarks
+
+    @staticmethod
+    def _anchors(observations):
+        """모델별 최신 수집일의 가장 최근 연식 평균 시세 (기존 predict_future_price의 현재 시세)"""
+        latest = observations[observations['collected_date'] ==
+                              observations.groupby('model_id')['collected_date'].transform('max')]
+        latest = latest[latest['year'] == latest.groupby('model_id')['year'].transform('max')]
+        price = pd.to_numeric(latest['avg_price'], errors='coerce')
+        grouped = (price * latest['weight']).groupby(latest['model_id']).sum() / \
+            latest['weight'].groupby(latest['model_id']).sum()
+        first = latest.groupby('model_id')[['year', 'collected_date']].first()
+        return pd.DataFrame({'anchor_price': grouped, 'anchor_year': first['year'],
+                             'anchor_date': first['collected_date']})
+
+    def refit(self, full=False):
+        """새로 적재된 가격/매물 행을 충분통계량에 더하고 전체 계수 재계산 -> 통계 dict
+
+        full=True면 저장된 통계량을 버리고 현재 UsedCarPrice / UsedCarListing 전체로
+        다시 적합 (보존 기간 이전 정보는 사라짐)
+        """
+        started = time.perf_counter()
+        stored = {} if full else self._stored_statistics()
+        observations, watermarks = self._new_observations(stored)
+        p = len(FEATURES)
+        segments = {model_id: s['segment'] for model_id, s in stored.items()}
+        if not observations.empty:
+            keys, xtx, xty, yty, weight_sum, counts = accumulate(
+                observations['model_id'].to_numpy(dtype=np.int64),
+                design_matrix(observations['age'], observations['mileage_range']),
+                observations['log_price'].to_numpy(dtype=float),
+                observations['weight'].to_numpy(dtype=float)
+            )
+            anchors = self._anchors(observations)
+            segments.update(observations.groupby('model_id')['segment'].last().to_dict())
+            for index, model_id in enumerate(keys.tolist()):
+                entry = stored.setdefault(model_id, {
+                    'xtx': np.zeros((p, p)), 'xty': np.zeros(p), 'yty': 0.0, 'weight_sum': 0.0, 'n_obs': 0,
+                    'anchor_year': None, 'anchor_price': None, 'anchor_date': None})
+                entry['xtx'] = entry['xtx'] + xtx[index]
+                entry['xty'] = entry['xty'] + xty[index]
+                entry['yty'] += yty[index]
+                entry['weight_sum'] += weight_sum[index]
+                entry['n_obs'] += int(counts[index])
+                anchor = anchors.loc[model_id]
+                # 늦게 적재된 과거 수집일 행으로 최신 기준 시세를 덮어쓰지 않음
+                if entry['anchor_date'] is None or pd.Timestamp(anchor['anchor_date']) >= pd.Timestamp(entry['anchor_date']):
+                    entry.update(anchor_price=float(anchor['anchor_price']), anchor_year=int(anchor['anchor_year']),
+                                 anchor_date=anchor['anchor_date'])
+
+        if not stored:
+            logger.info("감가 모델: 적합할 가격 데이터가 없습니다.")
+            return {'models': 0, 'segments': 0, 'observations': 0}
+
+        model_ids = list(stored)
+        XtX = np.stack([stored[m]['xtx'] for m in model_ids])
+        Xty = np.stack([stored[m]['xty'] for m in model_ids])
+        yty = np.array([stored[m]['yty'] for m in model_ids])
+        wsum = np.array([stored[m]['weight_sum'] for m in model_ids])
+        model_segments = [segments.get(m) or GLOBAL_KEY for m in model_ids]
+
+        # 전체 -> 세그먼트 -> 모델 순으로 사전 계수 전달
+        ridge = self.config['ridge']
+        global_coef = solve(XtX.sum(axis=0), Xty.sum(axis=0), strength=ridge)
+        segment_names = sorted(set(model_segments))
+        segment_index = np.array([segment_names.index(s) for s in model_segments])
+        seg_xtx = np.stack([XtX[segment_index == i].sum(axis=0) for i in range(len(segment_names))])
+        seg_xty = np.stack([Xty[segment_index == i].sum(axis=0) for i in range(len(segment_names))])
+        seg_coef = solve(seg_xtx, seg_xty, prior=global_coef, strength=self.config['segment_prior_strength'])
+        model_coef = solve(XtX, Xty, prior=seg_coef[segment_index], strength=self.config['model_prior_strength'])
+        model_rmse = weighted_rmse(model_coef, XtX, Xty, yty, wsum)
+
+        records = []
+        for index, model_id in enumerate(model_ids):
+            entry = stored[model_id]
+            records.append(self._record('model', str(model_id), model_segments[index], model_coef[index],
+                                        entry, model_rmse[index], watermarks))
+        for index, name in enumerate(segment_names):
+            members = segment_index == index
+            records.append(self._record('segment', name, name, seg_coef[index], {
+                'xtx': seg_xtx[index], 'xty': seg_xty[index], 'yty': yty[members].sum(),
+                'weight_sum': wsum[members].sum(), 'n_obs': sum(stored[m]['n_obs'] for m, ok in zip(model_ids, members) if ok)
+            }, None, watermarks))
+        records.append(self._record('global', GLOBAL_KEY, None, global_coef, {
+            'xtx': XtX.sum(axis=0), 'xty': Xty.sum(axis=0), 'yty': yty.sum(), 'weight_sum': wsum.sum(),
+            'n_obs': sum(s['n_obs'] for s in stored.values())
+        }, None, watermarks))
+
+        self.db.upsert_depreciation_models(pd.DataFrame(records), replace=full)
+        self.invalidate()
+        stats = {'models': len(model_ids), 'segments': len(segment_names), 'observations': len(observations),
+                 'elapsed': time.perf_counter() - started}
+        logger.info(f"감가 모델 재적합 ({'전체' if full else '증분'}): 새 관측 {stats['observations']}건, "
+                    f"모델 {stats['models']}개, 세그먼트 {stats['segments']}개 ({stats['elapsed']:.2f}초)")
+        return stats
+
+    @staticmethod
+    def _record(scope, key, segment, coefficients, statistics, rmse, watermarks):
+        slope = float(coefficients[1])
+        return {
+            'scope': scope, 'scope_key': key, 'model_version': MODEL_VERSION, 'segment': segment,
+            'coefficients': json.dumps([round(float(c), 10) for c in coefficients]),
+            'xtx': json.dumps(np.asarray(statistics['xtx']).tolist()),
+            'xty': json.dumps(np.asarray(statistics['xty']).tolist()),
+            'yty': float(statistics['yty']), 'weight_sum': float(statistics['weight_sum']),
+            'n_obs': int(statistics['n_obs']),
+            'rmse': None if rmse is None or not np.isfinite(rmse) else float(rmse),
+            'annual_depreciation': round(1 - float(np.exp(slope)), 4),
+            'anchor_year': statistics.get('anchor_year'), 'anchor_price': statistics.get('anchor_price'),
+            'anchor_date': statistics.get('anchor_date'), **watermarks,
+        }
@@ -4,74 +4,151 @@
 import pandas as pd
 import numpy as np
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db_helper import db_helper
-from config.config import ANALYSIS_WEIGHTS
+from config.config import ANALYSIS_WEIGHTS, CACHE_CONFIG
+from analyzers.tco_engine import TCOEngine, TCO_COLUMNS
+from analyzers.depreciation_model import DepreciationModel, MODEL_VERSION as DEPRECIATION_VERSION
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SCORE_COLUMNS = ['price_score', 'reliability_score', 'popularity_score', 'total_score']
+
+# 점수 산식이 바뀌면 올려서 ModelScore를 새 버전으로 다시 채움
+SCORE_VERSION = 1
+
+
+def compute_value_scores(inputs, weights):
+    """get_model_score_inputs 결과에 대해 가성비 점수를 배열 연산으로 계산"""
+    used_avg = pd.to_numeric(inputs['used_avg_price'], errors='coerce').to_numpy(dtype=float)
+    new_avg = pd.to_numeric(inputs['new_avg_price'], errors='coerce').to_numpy(dtype=float)
+    recall_count = pd.to_numeric(inputs['recall_count'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    severe_recalls = pd.to_numeric(inputs['severe_recalls'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    registrations = pd.to_numeric(inputs['total_registrations'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    has_registrations = inputs['has_registrations'].fillna(0).astype(bool).to_numpy()
+
+    # 1. 가격 점수 (신차 대비 중고차 가격 비율)
+    has_prices = ~np.isnan(used_avg) & ~np.isnan(new_avg) & (new_avg > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_ratio = 1 - used_avg / new_avg
+    price_score = np.where(has_prices, np.minimum(price_ratio * 100, 100), 50.0)
+
+    # 2. 신뢰도 점수 (리콜 횟수 기반)
+    reliability_score = np.maximum(100 - recall_count * 10 - severe_recalls * 10, 0)
+
+    # 3. 인기도 점수 (등록 대수 기반, 로그 스케일)
+    popularity_score = np.where(
+        has_registrations,
+        np.minimum(np.log10(np.maximum(registrations, 0) + 1) * 20, 100),
+        50.0
+    )
+
+    # 4. 종합 점수
+    total_score = np.round(
+        price_score * weights['price_weight'] +
+        reliability_score * weights['reliability_weight'] +
+        popularity_score * weights['popularity_weight'],
+        1
+    )
+
+    scores = inputs[['model_id', 'manufacturer', 'model_name', 'segment']].copy()
+    scores['used_avg_price'] = used_avg
+    scores['new_avg_price'] = new_avg
+    scores['price_score'] = price_score
+    scores['reliability_score'] = reliability_score
+    scores['popularity_score'] = popularity_score
+    scores['total_score'] = total_score
+    return scores
+
+
 class PriceAnalyzer:
     def __init__(self):
         self.weights = ANALYSIS_WEIGHTS
+        self._score_cache = None
+        self._score_cache_at = 0.0
+        self._score_lock = threading.Lock()
+        self.tco_engine = TCOEngine()
+        self.depreciation_model = DepreciationModel()
+        
+    def score_all_models(self, model_ids=None, use_cache=True):
+        """전체(또는 지정) 모델의 가성비 점수를 그룹 쿼리 한 번으로 계산"""
+        ttl = CACHE_CONFIG.get('ttl', 3600) if CACHE_CONFIG.get('enable', True) else 0
+        
+        if use_cache and ttl:
+            with self._score_lock:
+                cached = self._score_cache
+                fresh = cached is not None and time.monotonic() - self._score_cache_at < ttl
+            if fresh:
+                if model_ids is None:
+                    return cached.copy()
+                subset = cached[cached['model_id'].isin(model_ids)]
+                if len(subset) == len(set(model_ids)):
+                    return subset.copy()
+        
+        inputs = db_helper.get_model_score_inputs(model_ids)
+        if inputs.empty:
+            return pd.DataFrame(columns=['model_id', 'manufacturer', 'model_name', 'segment',
+                                         'used_avg_price', 'new_avg_price'] + SCORE_COLUMNS)
+        scores = compute_value_scores(inputs, self.weights)
+        
+        if model_ids is None and ttl:
+            with self._score_lock:
+                self._score_cache = scores
+                self._score_cache_at = time.monotonic()
+        return scores.copy()
+        
+    def invalidate_score_cache(self):
+        """점수 캐시 초기화"""
+        with self._score_lock:
+            self._score_cache = None
+            self._score_cache_at = 0.0
+        
+    def refresh_model_scores(self, full=False):
+        """ModelScore 테이블 갱신 (기본: 입력 데이터가 바뀐 모델만)"""
+        # 입력 조회 전에 워터마크를 먼저 잡아야 그 사이 변경분이 다음 갱신에 포함됨
+        watermarks = db_helper.get_score_source_watermarks()
+        
+        if full:
+            model_ids = None
+        else:
+            model_ids = db_helper.get_changed_score_model_ids(SCORE_VERSION)
+            if not model_ids:
+                logger.info("변경된 모델이 없어 점수 갱신을 건너뜁니다.")
+                return 0
+        
+        scores = self.score_all_models(model_ids=model_ids, use_cache=False)
+        if scores.empty:
+            return 0
+        
+        db_helper.upsert_model_scores(scores, SCORE_VERSION, watermarks)
+        self.invalidate_score_cache()
+        logger.info(f"모델 점수 갱신 완료: {len(scores)}개 모델 ({'전체' if full else '증분'})")
+        return len(scores)
         
     def calculate_value_score(self, model_id):
-        """차량의 가성비 점수 계산"""
+        """차량의 가성비 점수 계산 (ModelScore 조회, 없으면 일괄 계산 결과 조회)"""
         try:
-            # 가격 정보 조회
-            price_comparison = db_helper.get_latest_prices_comparison(model_id)
-            
-            # 리콜 정보 조회
-            recall_df = db_helper.get_recall_info(model_id)
-            
-            # 등록 통계 조회
-            reg_stats = db_helper.get_registration_stats(model_id)
+            stored = db_helper.get_model_score(model_id, SCORE_VERSION)
+            if stored:
+                return {col: float(stored[col]) for col in SCORE_COLUMNS}
             
-            # 점수 계산
-            scores = {}
+            scores = self.score_all_models()
+            row = scores[scores['model_id'] == model_id]
+            if row.empty:
+                # 캐시 이후 추가된 모델
+                row = self.score_all_models(model_ids=[model_id], use_cache=False)
+            if row.empty:
+                raise ValueError(f"model_id {model_id} not found")
             
-            # 1. 가격 점수 (신차 대비 중고차 가격 비율)
-            if price_comparison['used_prices'] and price_comparison['new_prices']:
-                used_avg = price_comparison['used_prices'].get('used_avg_price', 0)
-                new_avg = price_comparison['new_prices'].get('new_avg_price', 0)
-                if new_avg > 0:
-                    price_ratio = 1 - (used_avg / new_avg)
-                    scores['price_score'] = min(price_ratio * 100, 100)
-                else:
-                    scores['price_score'] = 50
-            else:
-                scores['price_score'] = 50
-                
-            # 2. 신뢰도 점수 (리콜 횟수 기반)
-            if not recall_df.empty:
-                recall_count = len(recall_df)
-                severe_recalls = len(recall_df[recall_df['severity_level'].isin(['심각', '매우심각'])])
-                scores['reliability_score'] = max(100 - (recall_count * 10) - (severe_recalls * 10), 0)
-            else:
-                scores['reliability_score'] = 100
-                
-            # 3. 인기도 점수 (등록 대수 기반)
-            if not reg_stats.empty:
-                total_registrations = reg_stats['registration_count'].sum()
-                # 로그 스케일로 정규화
-                popularity = min(np.log10(total_registrations + 1) * 20, 100)
-                scores['popularity_score'] = popularity
-            else:
-                scores['popularity_score'] = 50
-                
-            # 4. 종합 점수 계산
-            total_score = (
-                scores['price_score'] * self.weights['price_weight'] +
-                scores['reliability_score'] * self.weights['reliability_weight'] +
-                scores['popularity_score'] * self.weights['popularity_weight']
-            )
-            
-            scores['total_score'] = round(total_score, 1)
-            
-            return scores
+            record = row.iloc[0]
+            return {col: float(record[col]) for col in SCORE_COLUMNS}
             
         except Exception as e:
             logger.error(f"점수 계산 오류: {e}")
@@ -82,41 +159,54 @@ class PriceAnalyzer:
                 'total_score': 0
             }
             
-    def find_alternative_new_cars(self, used_car_price, additional_budget=0):
+    def find_alternative_new_cars(self, used_car_price, additional_budget=0, limit=10, min_price=None):
         """중고차 가격 + 추가 예산으로 구매 가능한 신차 찾기"""
         try:
             total_budget = used_car_price + additional_budget
             
-            query = """
-            SELECT cm.manufacturer, cm.model_name, cm.segment,
+            candidates = """
+            SELECT ncp.model_id, cm.manufacturer, cm.model_name, cm.segment,
                    ncp.trim_name, ncp.base_price, ncp.total_price,
-                   ncp.promotion_discount
+                   ncp.promotion_discount, ms.total_score AS value_score
             FROM NewCarPrice ncp
             JOIN CarModel cm ON ncp.model_id = cm.model_id
+            LEFT JOIN ModelScore ms ON ms.model_id = ncp.model_id AND ms.score_version = %s
             WHERE ncp.base_price <= %s
               AND ncp.valid_from <= CURDATE() 
               AND ncp.valid_until >= CURDATE()
-            ORDER BY ncp.base_price DESC
-            LIMIT 10
             """
+            candidate_params = [SCORE_VERSION, total_budget]
             
-            df = db_helper.fetch_dataframe(query, [total_budget])
+            if min_price is not None:
+                candidates += " AND ncp.base_price >= %s"
+                candidate_params.append(min_price)
+                
+            # 점수가 저장된 후보는 점수 순 상위 limit개만, ModelScore가 없는 후보는 전부 가져와
+            # 일괄 계산 점수로 채운 뒤 함께 정렬 (미채점 모델이 상위 N에서 빠지지 않도록)
+            query = f"""
+            ({candidates} AND ms.total_score IS NOT NULL
+             ORDER BY ms.total_score DESC, ncp.base_price DESC LIMIT %s)
+            UNION ALL
+            ({candidates} AND ms.total_score IS NULL)
+            """
+            params = candidate_params + [int(limit)] + candidate_params
+            
+            df = db_helper.fetch_dataframe(query, params)
             
             if not df.empty:
-                # 각 신차의 점수 계산
-                for idx, row in df.iterrows():
-                    model_id = db_helper.get_or_insert_car_model(
-                        row['manufacturer'], 
-                        row['model_name']
-                    )
-                    if model_id:
-                        scores = self.calculate_value_score(model_id)
-                        df.at[idx, 'value_score'] = scores['total_score']
-                    else:
-                        df.at[idx, 'value_score'] = 0
+                df['value_score'] = pd.to_numeric(df['value_score'], errors='coerce')
+                
+                # 아직 ModelScore에 없는 모델만 일괄 계산 결과로 채움
+                missing = df.loc[df['value_score'].isna(), 'model_id'].unique().tolist()
+                if missing:
+                    scores = self.score_all_models(model_ids=missing)
+                    fallback = scores.set_index('model_id')['total_score']
+                    df['value_score'] = df['value_score'].fillna(df['model_id'].map(fallback))
+                df['value_score'] = df['value_score'].fillna(0)
                         
                 # 점수 기준으로 정렬
-                df = df.sort_values('value_score', ascending=False)
+                df = df.sort_values(['value_score', 'base_price'], ascending=False, kind='stable')
+                df = df.head(int(limit)).reset_index(drop=True)
                 
             return df
             
@@ -125,128 +215,123 @@ class PriceAnalyzer:
             return pd.DataFrame()
             
     def predict_future_price(self, model_id, years=3):
-        """미래 가격 예측 (간단한 감가상각 모델)"""
+        """미래 가격 예측 (적합된 감가 모델: 기준 시세 x (1 - 연간 감가율)^연수)"""
         try:
-            # 과거 가격 데이터 조회
-            query = """
-            SELECT year, AVG(avg_price) as avg_price
-            FROM UsedCarPrice
-            WHERE model_id = %s
-            GROUP BY year
-            ORDER BY year DESC
-            """
-            
-            df = db_helper.fetch_dataframe(query, [model_id])
-            
-            if len(df) >= 2:
-                # 연간 감가율 계산
-                depreciation_rates = []
-                for i in range(len(df) - 1):
-                    rate = (df.iloc[i]['avg_price'] - df.iloc[i+1]['avg_price']) / df.iloc[i+1]['avg_price']
-                    depreciation_rates.append(rate)
-                    
-                avg_depreciation = np.mean(depreciation_rates)
-                
-                # 현재 가격
-                current_price = df.iloc[0]['avg_price']
+            predicted = self.depreciation_model.predict(model_id, years)
+            if predicted is None:
+                # 아직 적합되지 않은 모델: 최근 연식 시세 + 전체 감가율 (없으면 연 15%)
+                history = db_helper.get_used_price_history([model_id])
+                current_price = float(history['avg_price'].iloc[0]) if not history.empty else 0.0
+                predicted = self.depreciation_model.predict(model_id, years, current_price=current_price)
                 
-                # 미래 가격 예측
-                predictions = []
-                for year in range(1, years + 1):
-                    future_price = current_price * ((1 - avg_depreciation) ** year)
-                    predictions.append({
-                        'year': year,
-                        'predicted_price': round(future_price, 0)
-                    })
-                    
-                return pd.DataFrame(predictions)
-            else:
-                # 데이터 부족시 일반적인 감가율 적용 (연 15%)
-                current_price = df.iloc[0]['avg_price'] if not df.empty else 0
-                predictions = []
-                for year in range(1, years + 1):
-                    future_price = current_price * (0.85 ** year)
-                    predictions.append({
-                        'year': year,
-                        'predicted_price': round(future_price, 0)
-                    })
-                return pd.DataFrame(predictions)
+            return pd.DataFrame({
+                'year': np.arange(1, years + 1),
+                'predicted_price': np.round(predicted, 0)
+            })
                 
         except Exception as e:
             logger.error(f"가격 예측 오류: {e}")
             return pd.DataFrame()
             
+    def tco_all_models(self, years=5, model_ids=None, use_cache=True):
+        """전체(또는 지정) 모델의 TCO (TCOEngine 배치 계산, 입력은 엔진에 캐시)"""
+        inputs = self.tco_engine.load_inputs(model_ids, use_cache=use_cache)
+        return self.tco_engine.compute(horizons=[years], inputs=inputs)
+        
+    def invalidate_tco_cache(self):
+        """TCO 입력 캐시 초기화 (가격/연비 데이터 갱신 후)"""
+        self.tco_engine.invalidate()
+            
     def calculate_total_cost_of_ownership(self, model_id, years=5):
-        """총 소유 비용 계산 (TCO)"""
+        """총 소유 비용 계산 (TCO) - 저장된 복합연비 기반 연료비 포함"""
         try:
-            # 차량 정보 조회
-            car_info = db_helper.execute_query(
-                "SELECT * FROM CarModel WHERE model_id = %s",
-                [model_id]
-            )[0]
-            
-            # 초기 구매 가격
-            price_data = db_helper.get_latest_prices_comparison(model_id)
-            initial_price = price_data['used_prices'].get('used_avg_price', 0)
+            # 카탈로그 전체 입력(캐시)에서 해당 모델 1행만 계산
+            inputs = self.tco_engine.load_inputs()
+            if not (inputs['model_id'] == model_id).any():
+                # 캐시 이후 추가된 모델
+                inputs = self.tco_engine.load_inputs([model_id], use_cache=False)
+            row = self.tco_engine.compute(model_ids=[model_id], horizons=[years], inputs=inputs)
+            if row.empty:
+                raise ValueError(f"model_id {model_id} not found")
             
-            # 예상 비용 계산 (연간)
-            tco_breakdown = {
-                '구매가격': initial_price,
-                '보험료': initial_price * 0.05 * years,  # 연 5%
-                '유지보수': 200 * years,  # 연 200만원
-                '연료비': 150 * years,  # 연 150만원
-                '세금': initial_price * 0.02 * years,  # 연 2%
-            }
-            
-            # 예상 잔존가치
-            future_price_df = self.predict_future_price(model_id, years)
-            if not future_price_df.empty:
-                residual_value = future_price_df.iloc[-1]['predicted_price']
-                tco_breakdown['잔존가치'] = -residual_value  # 음수로 표시
-                
-            # 총 비용 계산
-            total_cost = sum(tco_breakdown.values())
-            tco_breakdown['총소유비용'] = total_cost
-            
-            return tco_breakdown
+            record = row.iloc[0]
+            if pd.isna(record['구매가격']):
+                raise ValueError(f"model_id {model_id}: 최근 중고차 가격 없음")
+            return {col: float(record[col]) for col in TCO_COLUMNS}
             
         except Exception as e:
             logger.error(f"TCO 계산 오류: {e}")
             return {}
             
-    def compare_models(self, model_ids):
-        """여러 모델 비교 분석"""
-        comparison_data = []
+    def _prefetch_comparison_inputs(self, model_ids, executor=None):
+        """compare_models 입력 일괄 조회
+
+        가격/점수 입력 1회 + (연비, 연식별 시세, 감가 모델, ModelScore) 4회. 뒤의 네 쿼리는 서로
+        독립적이라 executor가 있으면 동시에 실행 (스레드마다 풀에서 별도 연결 사용)
+        """
+        price_inputs = db_helper.get_model_score_inputs(model_ids)
+        if price_inputs.empty:
+            return price_inputs, None, None, None, None
         
-        for model_id in model_ids:
-            # 차량 정보
-            car_info = db_helper.execute_query(
-                "SELECT * FROM CarModel WHERE model_id = %s",
-                [model_id]
-            )
-            
-            if car_info:
-                car_info = car_info[0]
-                
-                # 가격 정보
-                price_data = db_helper.get_latest_prices_comparison(model_id)
-                
-                # 점수 계산
-                scores = self.calculate_value_score(model_id)
-                
-                # TCO 계산
-                tco = self.calculate_total_cost_of_ownership(model_id)
-                
-                comparison_data.append({
-                    'model_name': f"{car_info['manufacturer']} {car_info['model_name']}",
-                    'segment': car_info.get('segment', '-'),
-                    'used_avg_price': price_data['used_prices'].get('used_avg_price', 0),
-                    'new_avg_price': price_data['new_prices'].get('new_avg_price', 0),
-                    'value_score': scores['total_score'],
-                    'total_cost_ownership': tco.get('총소유비용', 0)
-                })
-                
-        return pd.DataFrame(comparison_data)
+        tasks = {
+            'fuel': lambda: db_helper.get_fuel_cost_inputs(model_ids),
+            'history': lambda: db_helper.get_used_price_history(model_ids),
+            'fitted': lambda: db_helper.get_depreciation_rates(DEPRECIATION_VERSION, model_ids),
+            'stored': lambda: db_helper.get_model_scores(model_ids, SCORE_VERSION)
+        }
+        if executor is None:
+            results = {name: task() for name, task in tasks.items()}
+        else:
+            futures = {name: executor.submit(task) for name, task in tasks.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        return price_inputs, results['fuel'], results['history'], results['fitted'], results['stored']
+        
+    def compare_models(self, model_ids, years=5, executor=None, max_workers=None):
+        """여러 모델 비교 분석 (입력 일괄 조회 후 점수/가격/TCO가 같은 결과를 공유)
+
+        executor(concurrent.futures.Executor)나 max_workers를 주면 독립적인 조회를 동시에 실행
+        """
+        columns = ['model_name', 'segment', 'used_avg_price', 'new_avg_price',
+                   'value_score', 'total_cost_ownership']
+        model_ids = list(model_ids)
+        if not model_ids:
+            return pd.DataFrame(columns=columns)
+        unique_ids = list(dict.fromkeys(model_ids))
+        
+        own_executor = None
+        if executor is None and max_workers:
+            executor = own_executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            price_inputs, fuel_inputs, price_history, fitted_rates, stored = \
+                self._prefetch_comparison_inputs(unique_ids, executor)
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown()
+        if price_inputs.empty:
+            return pd.DataFrame(columns=columns)
+        
+        # 가성비 점수: ModelScore 우선, 없으면 같은 입력으로 계산
+        scores = compute_value_scores(price_inputs, self.weights).set_index('model_id')['total_score']
+        if stored is not None and not stored.empty:
+            stored_total = pd.to_numeric(stored.set_index('model_id')['total_score'], errors='coerce')
+            scores = stored_total.reindex(scores.index).fillna(scores)
+        
+        tco_inputs = self.tco_engine.build_inputs(price_inputs, fuel_inputs, price_history, fitted_rates)
+        tco = self.tco_engine.compute(horizons=[years], inputs=tco_inputs).set_index('model_id')
+        
+        frame = price_inputs.set_index('model_id')
+        found = [model_id for model_id in model_ids if model_id in frame.index]
+        frame = frame.loc[found]
+        # 기존 단건 경로와 같은 기본값 (가격/TCO 없음 -> 0, 세그먼트 없음 -> '-')
+        total_cost = tco['총소유비용'].where(tco['구매가격'].notna())
+        return pd.DataFrame({
+            'model_name': (frame['manufacturer'] + ' ' + frame['model_name']).to_numpy(),
+            'segment': frame['segment'].fillna('-').to_numpy(),
+            'used_avg_price': pd.to_numeric(frame['used_avg_price'], errors='coerce').fillna(0).to_numpy(),
+            'new_avg_price': pd.to_numeric(frame['new_avg_price'], errors='coerce').fillna(0).to_numpy(),
+            'value_score': scores.reindex(found).astype(float).to_numpy(),
+            'total_cost_ownership': total_cost.reindex(found).fillna(0).to_numpy()
+        }, columns=columns)
 
 # 테스트 실행
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
 from database.db_helper import db_helper
+from analyzers.severity_classifier import SeverityClassifier
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,4 +25,27 @@ class RecallAnalyzer:
         JOIN CarModel cm ON ri.model_id = cm.model_id
         WHERE ri.recall_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
         """
-        return db_helper.fetch_dataframe(query, [days])
\ No newline at end of file
+        return db_helper.fetch_dataframe(query, [days])
+
+    def reclassify_severity(self, keywords=None, dry_run=False):
+        """RecallInfo 전체 심각도 일괄 재분류 (키워드 변경 후 실행)
+
+        변경된 행만 레벨별 UPDATE ... WHERE id IN (...)로 반영하고
+        레벨 전환 건수를 반환한다.
+        """
+        classifier = SeverityClassifier(keywords)
+        df = db_helper.fetch_dataframe("SELECT id, recall_title, severity_level FROM RecallInfo")
+        if df.empty:
+            return {}
+        
+        df['new_level'] = classifier.classify_many(df['recall_title'])
+        changed = df[df['new_level'] != df['severity_level']]
+        transitions = changed.groupby(['severity_level', 'new_level'], dropna=False).size()
+        summary = {f"{old} -> {new}": int(count) for (old, new), count in transitions.items()}
+        
+        logger.info(f"리콜 심각도 재분류: 전체 {len(df)}건 중 {len(changed)}건 변경")
+        if not changed.empty and not dry_run:
+            ids_by_level = {level: group['id'].astype(int).tolist()
+                            for level, group in changed.groupby('new_level')}
+            db_helper.update_recall_severity(ids_by_level)
+        return summary
@@ -0,0 +1,85 @@
+"""
+리콜 제목 심각도 분류기
+- CRAWLING_CONFIG['recall']['severity_keywords'] 하나의 키워드 표를 공유
+- 전체 키워드를 하나의 정규식 alternation으로 컴파일 (대소문자 무시)
+- 우선순위: 매우심각 > 심각 > 보통 > 경미, 매칭 없으면 기본값
+"""
+import re
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import CRAWLING_CONFIG
+
+SEVERITY_LEVELS = ('매우심각', '심각', '보통', '경미')
+DEFAULT_SEVERITY = '보통'
+
+
+def _alternation(keywords):
+    # 긴 키워드를 먼저 두어 접두 키워드에 가려지지 않게 함
+    return '|'.join(re.escape(keyword) for keyword in sorted(set(keywords), key=len, reverse=True))
+
+
+class SeverityClassifier:
+    """키워드 표 -> 심각도 분류 (단건 classify, 벡터화 classify_many)"""
+
+    def __init__(self, keywords=None, default=DEFAULT_SEVERITY):
+        keywords = keywords or CRAWLING_CONFIG['recall']['severity_keywords']
+        self.default = default
+        # 우선순위 순서로 정렬 (표에 없는 레벨은 뒤로)
+        self.levels = sorted(
+            (level for level, words in keywords.items() if words),
+            key=lambda level: SEVERITY_LEVELS.index(level) if level in SEVERITY_LEVELS else len(SEVERITY_LEVELS)
+        )
+        self._priority = {}
+        for rank, level in enumerate(self.levels):
+            for keyword in keywords[level]:
+                # 같은 키워드가 여러 레벨에 있으면 높은 우선순위 유지
+                self._priority.setdefault(keyword.lower(), rank)
+
+        self.pattern = re.compile(_alternation(self._priority), re.IGNORECASE) if self._priority else None
+        self.level_patterns = [
+            re.compile(_alternation(keywords[level]), re.IGNORECASE) for level in self.levels
+        ]
+
+    def classify(self, title):
+        """제목 하나 분류 (가장 높은 우선순위의 매칭 키워드 기준)"""
+        if not title or self.pattern is None:
+            return self.default
+        best = None
+        for match in self.pattern.finditer(title):
+            rank = self._priority[match.group(0).lower()]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return self.levels[best] if best is not None else self.default
+
+    def classify_many(self, titles):
+        """pandas Series 전체 분류 (레벨별 str.contains + np.select)"""
+        titles = pd.Series(titles).fillna('').astype(str)
+        if titles.empty or self.pattern is None:
+            return pd.Series(self.default, index=titles.index, dtype=object)
+        conditions = [titles.str.contains(pattern, na=False).to_numpy() for pattern in self.level_patterns]
+        return pd.Series(
+            np.select(conditions, list(self.levels), default=self.default),
+            index=titles.index, dtype=object
+        )
+
+
+_default_classifier = None
+
+
+def get_classifier():
+    """설정 키워드 기반 공용 분류기"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = SeverityClassifier()
+    return _default_classifier
+
+
+def classify_severity(title):
+    return get_classifier().classify(title)
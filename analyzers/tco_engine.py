@@ -0,0 +1,247 @@
+"""
+카탈로그 전체 총소유비용(TCO) 배치 계산 엔진
+- 입력: 그룹 쿼리 4회 (가격 입력 / 최신 연식 복합연비 / 연식별 중고 시세 / 적합된 감가 모델)로 모델당 1행
+- 계산: 모델 x 보유기간 격자를 NumPy 브로드캐스팅으로 한 번에 계산
+- 출력: (model_id, years) 당 1행, TCO 구성 항목이 컬럼인 tidy frame
+
+    engine = TCOEngine()
+    frame = engine.compute(model_ids=[1, 2, 3], horizons=range(1, 11), insurance_rate=0.04)
+"""
+import sys
+import os
+import time
+import threading
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_helper import db_helper
+from config.config import TCO_CONFIG, FUEL_COST_CONFIG, CACHE_CONFIG
+from analyzers.depreciation_model import MODEL_VERSION as DEPRECIATION_VERSION
+
+logger = logging.getLogger(__name__)
+
+TCO_COLUMNS = ['구매가격', '보험료', '유지보수', '연료비', '세금', '잔존가치', '총소유비용']
+INPUT_COLUMNS = ['model_id', 'manufacturer', 'model_name', 'segment', 'initial_price', 'fuel_type',
+                 'combined_efficiency', 'efficiency_measured', 'current_price', 'depreciation_rate']
+# compute()에 스칼라 / 모델별 배열 / {model_id: 값}으로 넘길 수 있는 비용 파라미터
+COST_PARAMETERS = ('insurance_rate', 'tax_rate', 'maintenance_per_year', 'annual_km')
+
+
+def normalize_fuel_types(values, config=None):
+    """CarModel / API 연료 표기 (Gasoline, 휘발유, 경유 ...) -> FUEL_COST_CONFIG 표준 연료 종류"""
+    config = config or FUEL_COST_CONFIG
+    known = set(config['prices'])
+    aliases = {key.lower(): value for key, value in config['aliases'].items()}
+    cleaned = pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+    lowered = cleaned.str.lower()
+    return pd.Series(np.where(cleaned.isin(known), cleaned, lowered.map(aliases)),
+                     index=cleaned.index, dtype=object)
+
+
+def select_fuel_efficiency(fuel_inputs, config=None):
+    """get_fuel_cost_inputs 결과 -> 모델별 연료 종류/복합연비 (모델당 1행)
+
+    모델의 연료 종류와 같은 연비 행을 우선 사용하고, 없으면 트림 수가 가장 많은 행,
+    연비 데이터가 아예 없으면 연료 종류별 기본 연비를 사용
+    """
+    config = config or FUEL_COST_CONFIG
+    frame = fuel_inputs.copy()
+    model_fuel = normalize_fuel_types(frame['model_fuel_type'], config)
+    data_fuel = normalize_fuel_types(frame['fuel_type'], config)
+    frame['trims'] = pd.to_numeric(frame['trims'], errors='coerce').fillna(0)
+    frame = frame.assign(_model_fuel=model_fuel, _data_fuel=data_fuel,
+                         _match=(data_fuel == model_fuel).astype(int))
+    frame = frame.sort_values(['model_id', '_match', 'trims'], ascending=[True, False, False], kind='stable')
+    frame = frame.drop_duplicates('model_id')
+
+    efficiency = pd.to_numeric(frame['combined_efficiency'], errors='coerce')
+    measured = efficiency.notna() & (efficiency > 0) & frame['_data_fuel'].notna()
+    fuel_type = frame['_data_fuel'].where(measured, frame['_model_fuel']).fillna(config['default_fuel_type'])
+    efficiency = efficiency.where(measured, fuel_type.map(config['default_efficiency']).astype(float))
+
+    return pd.DataFrame({
+        'model_id': frame['model_id'].to_numpy(),
+        'fuel_type': fuel_type.to_numpy(),
+        'combined_efficiency': efficiency.to_numpy(dtype=float),
+        'efficiency_measured': measured.to_numpy(),
+    })
+
+
+def depreciation_inputs(price_history, default_rate=None):
+    """get_used_price_history 결과 -> 모델별 현재 시세와 연간 감가율 (적합된 감가 모델이 없을 때의 대체 산식)
+
+    연식 내림차순으로 인접 연식 간 가격 하락률의 평균, 연식이 2개 미만이면 기본 감가율
+    """
+    default_rate = TCO_CONFIG['default_depreciation'] if default_rate is None else default_rate
+    if price_history.empty:
+        return pd.DataFrame(columns=['model_id', 'current_price', 'depreciation_rate'])
+    history = price_history.copy()
+    history['avg_price'] = pd.to_numeric(history['avg_price'], errors='coerce')
+    history = history.sort_values(['model_id', 'year'], ascending=[True, False], kind='stable')
+    grouped = history.groupby('model_id', sort=True)
+
+    older = grouped['avg_price'].shift(-1)
+    rates = ((history['avg_price'] - older) / older).groupby(history['model_id']).mean()
+    rates = rates.where(grouped['avg_price'].size() >= 2, default_rate)
+    return pd.DataFrame({'current_price': grouped['avg_price'].first(),
+                         'depreciation_rate': rates}).reset_index()
+
+
+class TCOEngine:
+    """모델 x 보유기간 TCO 배치 계산 (입력 프레임은 TTL 캐시)"""
+
+    def __init__(self, db=None, config=None, fuel_config=None):
+        self.db = db or db_helper
+        self.config = {**TCO_CONFIG, **(config or {})}
+        self.fuel_config = fuel_config or FUEL_COST_CONFIG
+        self._inputs = None
+        self._inputs_at = 0.0
+        self._lock = threading.Lock()
+
+    # === 입력 적재 ===
+
+    def load_inputs(self, model_ids=None, use_cache=True):
+        """모델당 1행 입력 프레임 (INPUT_COLUMNS). 전체 카탈로그 결과만 캐시"""
+        ttl = CACHE_CONFIG.get('ttl', 3600) if CACHE_CONFIG.get('enable', True) else 0
+
+        if use_cache and ttl:
+            with self._lock:
+                cached = self._inputs
+                fresh = cached is not None and time.monotonic() - self._inputs_at < ttl
+            if fresh:
+                if model_ids is None:
+                    return cached
+                subset = cached[cached['model_id'].isin(model_ids)]
+                if len(subset) == len(set(model_ids)):
+                    return subset
+
+        model_ids = list(model_ids) if model_ids is not None else None
+        price_inputs = self.db.get_model_score_inputs(model_ids)
+        if price_inputs.empty:
+            return pd.DataFrame(columns=INPUT_COLUMNS)
+        inputs = self.build_inputs(price_inputs, self.db.get_fuel_cost_inputs(model_ids),
+                                   self.db.get_used_price_history(model_ids),
+                                   self.db.get_depreciation_rates(DEPRECIATION_VERSION, model_ids))
+
+        if model_ids is None and ttl:
+            with self._lock:
+                self._inputs = inputs
+                self._inputs_at = time.monotonic()
+        return inputs
+
+    def build_inputs(self, price_inputs, fuel_inputs, price_history, fitted_rates=None):
+        """이미 조회한 get_model_score_inputs / get_fuel_cost_inputs / get_used_price_history
+        결과로 입력 프레임 구성 (다른 분석과 조회 결과를 공유할 때)
+
+        fitted_rates(get_depreciation_rates 결과)가 있으면 적합된 감가 모델의 기준 시세와
+        감가율이 시세 이력 산식보다 우선
+        """
+        if price_inputs.empty:
+            return pd.DataFrame(columns=INPUT_COLUMNS)
+        fuel = select_fuel_efficiency(fuel_inputs, self.fuel_config)
+        depreciation = depreciation_inputs(price_history, self.config['default_depreciation'])
+        if fitted_rates is not None and not fitted_rates.empty:
+            fitted = pd.DataFrame({
+                'current_price': pd.to_numeric(fitted_rates['anchor_price'], errors='coerce').to_numpy(),
+                'depreciation_rate': pd.to_numeric(fitted_rates['annual_depreciation'], errors='coerce').to_numpy()
+            }, index=pd.Index(fitted_rates['model_id'].astype('int64'), name='model_id'))
+            history = depreciation.astype({'model_id': 'int64'}).set_index('model_id')
+            depreciation = fitted.combine_first(history).reset_index()
+
+        inputs = price_inputs[['model_id', 'manufacturer', 'model_name', 'segment']].copy()
+        inputs['initial_price'] = pd.to_numeric(price_inputs['used_avg_price'], errors='coerce')
+        inputs = inputs.merge(fuel, on='model_id', how='left').merge(depreciation, on='model_id', how='left')
+        inputs['current_price'] = pd.to_numeric(inputs['current_price'], errors='coerce').fillna(0.0)
+        inputs['depreciation_rate'] = pd.to_numeric(inputs['depreciation_rate'], errors='coerce').fillna(
+            self.config['default_depreciation'])
+        return inputs[INPUT_COLUMNS]
+
+    def invalidate(self):
+        """입력 캐시 초기화 (가격/연비 데이터 갱신 후)"""
+        with self._lock:
+            self._inputs = None
+            self._inputs_at = 0.0
+
+    # === 계산 ===
+
+    @staticmethod
+    def _per_model(value, model_ids, name):
+        """스칼라 / {model_id: 값} / 모델 순서 배열 -> (n, 1) 배열"""
+        if np.isscalar(value):
+            return np.full((len(model_ids), 1), float(value))
+        if isinstance(value, (dict, pd.Series)):
+            mapped = pd.Series(model_ids).map(value).to_numpy(dtype=float)
+            if np.isnan(mapped).any():
+                raise ValueError(f"{name}: 값이 없는 model_id가 있습니다")
+            return mapped[:, None]
+        array = np.asarray(value, dtype=float)
+        if array.shape != (len(model_ids),):
+            raise ValueError(f"{name}: 모델 수({len(model_ids)})와 길이가 다릅니다 ({array.shape})")
+        return array[:, None]
+
+    def compute(self, model_ids=None, horizons=(5,), inputs=None, fuel_prices=None, **cost_parameters):
+        """모델 x 보유기간 TCO -> (model_id, years) 당 1행 frame (금액 단위: 만원)
+
+        model_ids를 주면 그 순서대로 (가격 입력이 없는 모델은 제외), cost_parameters는
+        COST_PARAMETERS 중 재정의할 값 (스칼라, 모델별 배열 또는 {model_id: 값})
+        """
+        unknown = set(cost_parameters) - set(COST_PARAMETERS)
+        if unknown:
+            raise TypeError(f"알 수 없는 비용 파라미터: {sorted(unknown)}")
+        if inputs is None:
+            inputs = self.load_inputs(model_ids)
+        if model_ids is not None:
+            inputs = inputs.set_index('model_id').reindex(list(model_ids)).dropna(
+                subset=['manufacturer']).reset_index()
+
+        years = np.asarray(list(horizons), dtype=float)[None, :]   # (1, h)
+        ids = inputs['model_id'].to_numpy()
+        defaults = {'insurance_rate': self.config['insurance_rate'], 'tax_rate': self.config['tax_rate'],
+                    'maintenance_per_year': self.config['maintenance_per_year'],
+                    'annual_km': self.fuel_config['annual_km']}
+        params = {name: self._per_model(cost_parameters.get(name, defaults[name]), ids, name)
+                  for name in COST_PARAMETERS}
+        prices = {**self.fuel_config['prices'], **(fuel_prices or {})}
+
+        initial = inputs['initial_price'].to_numpy(dtype=float)[:, None]   # (n, 1)
+        efficiency = inputs['combined_efficiency'].to_numpy(dtype=float)[:, None]
+        fuel_price = inputs['fuel_type'].map(prices).to_numpy(dtype=float)[:, None]
+        current = inputs['current_price'].to_numpy(dtype=float)[:, None]
+        rate = inputs['depreciation_rate'].to_numpy(dtype=float)[:, None]
+
+        # 연간 주행거리 / 복합연비 * 단가 (원) -> 만원
+        annual_fuel = np.round(params['annual_km'] / efficiency * fuel_price / 10000, 1)
+        components = {
+            '구매가격': np.broadcast_to(initial, (len(ids), years.shape[1])),
+            '보험료': initial * params['insurance_rate'] * years,
+            '유지보수': params['maintenance_per_year'] * years,
+            '연료비': annual_fuel * years,
+            '세금': initial * params['tax_rate'] * years,
+            '잔존가치': -np.round(current * (1 - rate) ** years, 0),
+        }
+        # 구매가격이 없는 모델은 총액도 NaN
+        components['총소유비용'] = sum(components.values())
+
+        horizon_count = years.shape[1]
+        frame = pd.DataFrame({
+            'model_id': np.repeat(ids, horizon_count),
+            'manufacturer': np.repeat(inputs['manufacturer'].to_numpy(), horizon_count),
+            'model_name': np.repeat(inputs['model_name'].to_numpy(), horizon_count),
+            'segment': np.repeat(inputs['segment'].to_numpy(), horizon_count),
+            'fuel_type': np.repeat(inputs['fuel_type'].to_numpy(), horizon_count),
+            'combined_efficiency': np.repeat(efficiency[:, 0], horizon_count),
+            'annual_fuel_cost': np.repeat(annual_fuel[:, 0], horizon_count),
+            'years': np.tile(years[0].astype(int), len(ids)),
+        })
+        for column in TCO_COLUMNS:
+            frame[column] = np.ravel(components[column])
+        return frame
+
+    def compute_long(self, model_ids=None, horizons=(5,), **kwargs):
+        """compute() 결과를 (model_id, years, component, cost) 세로형으로"""
+        wide = self.compute(model_ids, horizons, **kwargs)
+        return wide.melt(id_vars=['model_id', 'manufacturer', 'model_name', 'years'],
+                         value_vars=TCO_COLUMNS, var_name='component', value_name='cost')
@@ -0,0 +1,79 @@
+"""
+Sequential requests.Session vs AsyncFetchEngine throughput against the stub server
+
+Runs the K Car search, recall list and data.go.kr calls of the real crawlers
+against benchmarks/stub_server.py, once through the blocking per-request path
+and once through the async engine, and prints pages/sec for each.
+
+    python benchmarks/fetch_benchmark.py --requests 200 --latency 0.05
+"""
+import os
+import sys
+import argparse
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import StubServer
+from crawlers.kcar_crawler import KCarCrawler
+from crawlers.recall_crawler import RecallCrawler
+from crawlers.public_data_crawler import PublicDataCrawler
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def run(n_requests, latency, per_host_limit, error_rate):
+    fetch = {'per_host_limit': per_host_limit, 'max_connections': per_host_limit * 2,
+             'backoff_base': 0.05, 'backoff_max': 0.5}
+    unthrottled = {'requests_per_second': 10000, 'burst': per_host_limit}
+    rows = []
+
+    with StubServer(latency=latency, error_rate=error_rate) as server:
+        kcar = KCarCrawler({'base_url': server.url, 'delay': 0, 'fetch': fetch, **unthrottled})
+        searches = [{'manufacturer': '현대', 'model': '아반떼', 'year_min': 2015 + i % 10,
+                     'year_max': 2015 + i % 10, 'page': i // 10 + 1} for i in range(n_requests)]
+        seq, seq_time = _timed(lambda: [kcar.search_cars(**search) for search in searches])
+        con, con_time = _timed(lambda: kcar.search_many(searches))
+        kcar._get_fetch_engine().close()
+        rows.append(('kcar search', len(searches), seq_time, con_time,
+                     sum(map(len, seq)), sum(map(len, con))))
+
+        recall = RecallCrawler({'base_url': server.url, 'delay': 0, 'fetch': fetch, **unthrottled})
+        pages = list(range(1, n_requests + 1))
+        seq, seq_time = _timed(lambda: [recall.get_recall_list(page=page) for page in pages])
+        con, con_time = _timed(lambda: recall.get_recall_lists(pages))
+        rows.append(('recall list', len(pages), seq_time, con_time,
+                     sum(len(page or []) for page in seq), sum(len(page or []) for page in con)))
+
+        # 쿼리당 1페이지 (totalCount 2000 = numOfRows), 페이징은 paging_benchmark.py에서 측정
+        public = PublicDataCrawler({'base_url': server.url, 'api_key': 'stub', 'fetch': fetch,
+                                    'num_of_rows': 2000, 'concurrent': True, **unthrottled})
+        queries = [{'year': 2000 + i % 25, 'month': i % 12 + 1} for i in range(n_requests)]
+        seq, seq_time = _timed(lambda: [public.get_car_registration_stats(**query) for query in queries])
+        con, con_time = _timed(lambda: public.get_car_registration_stats_many(queries))
+        rows.append(('registration', len(queries), seq_time, con_time,
+                     sum(map(len, seq)), sum(map(len, con))))
+
+        served = server.requests_served
+
+    print(f"\nlatency: {latency * 1000:.0f}ms  per_host_limit: {per_host_limit}  "
+          f"error_rate: {error_rate}  requests served: {served}")
+    print(f"{'workload':<14} {'pages':>6} {'seq s':>8} {'async s':>8} {'seq p/s':>9} "
+          f"{'async p/s':>10} {'speedup':>8} {'items seq/async':>16}")
+    for name, pages, seq_time, con_time, seq_items, con_items in rows:
+        print(f"{name:<14} {pages:>6} {seq_time:>8.2f} {con_time:>8.2f} {pages / seq_time:>9.1f} "
+              f"{pages / con_time:>10.1f} {seq_time / con_time:>7.1f}x {seq_items:>7}/{con_items:<8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fetch engine throughput benchmark')
+    parser.add_argument('--requests', type=int, default=100, help='pages per workload')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub server latency (s)')
+    parser.add_argument('--per-host-limit', type=int, default=8)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    run(args.requests, args.latency, args.per_host_limit, args.error_rate)
@@ -0,0 +1,82 @@
+"""
+Batched INSERT vs LOAD DATA LOCAL INFILE ingest benchmark
+
+Generates a synthetic RegistrationStats frame (default 1M rows) and loads it
+into a scratch copy of RegistrationStats with both ingest paths.
+Requires a reachable database configured through .env.
+
+    python benchmarks/ingest_benchmark.py --rows 1000000
+"""
+import os
+import sys
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_helper import db_helper
+
+SCRATCH_TABLE = 'bench_RegistrationStats'
+COLUMNS = ['model_id', 'region', 'registration_date', 'registration_count', 'cumulative_count']
+REGIONS = ['서울', '경기', '인천', '부산', '대구', '대전', '광주', '울산', '세종',
+           '강원', '충북', '충남', '전북', '전남', '경북', '경남', '제주']
+
+
+def make_synthetic_frame(rows, n_models=60, seed=42):
+    """Unique (model_id, region, registration_date) rows"""
+    rng = np.random.default_rng(seed)
+    per_day = n_models * len(REGIONS)
+    n_days = -(-rows // per_day)
+
+    model_ids = np.tile(np.repeat(np.arange(1, n_models + 1), len(REGIONS)), n_days)[:rows]
+    regions = np.tile(np.array(REGIONS, dtype=object), n_models * n_days)[:rows]
+    day_offsets = np.repeat(np.arange(n_days), per_day)[:rows]
+    dates = (pd.Timestamp('2000-01-01') + pd.to_timedelta(day_offsets, unit='D')).date
+
+    counts = rng.integers(1, 500, size=rows)
+    return pd.DataFrame({
+        'model_id': model_ids,
+        'region': regions,
+        'registration_date': dates,
+        'registration_count': counts,
+        'cumulative_count': counts * rng.integers(50, 200, size=rows),
+    })
+
+
+def reset_scratch_table():
+    db_helper.execute_query(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}", fetch=False)
+    db_helper.execute_query(f"CREATE TABLE {SCRATCH_TABLE} LIKE RegistrationStats", fetch=False)
+
+
+def run(rows, chunk_size):
+    df = make_synthetic_frame(rows)
+    results = []
+
+    for mode in ('batch', 'infile'):
+        reset_scratch_table()
+        started = time.perf_counter()
+        stats = db_helper.bulk_writer.write_frame(
+            SCRATCH_TABLE, df, COLUMNS,
+            update_columns=['registration_count', 'cumulative_count'],
+            chunk_size=chunk_size, mode=mode
+        )
+        elapsed = time.perf_counter() - started
+        results.append((mode, stats['mode'], elapsed, rows / elapsed if elapsed else 0))
+
+    db_helper.execute_query(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}", fetch=False)
+
+    print(f"\nRows: {rows:,}  chunk_size: {chunk_size}")
+    print(f"{'requested':<10} {'used':<8} {'seconds':>10} {'rows/s':>12}")
+    for requested, used, elapsed, rate in results:
+        print(f"{requested:<10} {used:<8} {elapsed:>10.2f} {rate:>12,.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest path benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    run(args.rows, args.chunk_size)
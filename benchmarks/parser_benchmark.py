@@ -0,0 +1,70 @@
+"""
+HTML parsing micro-benchmark over saved result pages (benchmarks/fixtures)
+
+Compares the original full BeautifulSoup(html, 'html.parser') parse + select
+with crawlers.html_parser for every available backend and prints the parse
+time per page.
+
+    python benchmarks/parser_benchmark.py --iterations 200
+"""
+import os
+import sys
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawlers.html_parser import HtmlParser, available_backends
+from crawlers.kcar_crawler import RESULT_SELECTORS
+from crawlers.recall_crawler import RECALL_ROW_SELECTORS, VIN_RESULT_SELECTORS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURES = [
+    ('kcar_search.html', RESULT_SELECTORS),
+    ('recall_list.html', RECALL_ROW_SELECTORS),
+    ('vin_result.html', VIN_RESULT_SELECTORS),
+]
+
+
+def baseline_select(html, compiled):
+    """Previous behaviour: full html.parser tree, selectors tried in order"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in compiled.selectors:
+        elements = soup.select(selector)
+        if elements:
+            return selector, elements
+    return None, []
+
+
+def time_per_page(func, html, compiled, iterations):
+    func(html, compiled)  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        selector, elements = func(html, compiled)
+    return (time.perf_counter() - started) / iterations * 1000, len(elements)
+
+
+def run(iterations):
+    print(f"\niterations: {iterations}  backends: {', '.join(available_backends())}")
+    print(f"{'fixture':<18} {'KB':>6} {'parser':<24} {'ms/page':>9} {'items':>6} {'speedup':>8}")
+    for name, compiled in FIXTURES:
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            html = f.read()
+
+        base_ms, base_items = time_per_page(baseline_select, html, compiled, iterations)
+        print(f"{name:<18} {len(html.encode('utf-8')) / 1024:>6.0f} {'bs4 html.parser (full)':<24} "
+              f"{base_ms:>9.2f} {base_items:>6} {'1.0x':>8}")
+        for backend in available_backends():
+            parser = HtmlParser(backend)
+            ms, items = time_per_page(parser.select, html, compiled, iterations)
+            label = backend + (' (located)' if backend == 'selectolax' else ' (strained)')
+            print(f"{'':<18} {'':>6} {label:<24} {ms:>9.2f} {items:>6} {base_ms / ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTML parser backend benchmark')
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+
+    run(args.iterations)
@@ -0,0 +1,74 @@
+"""
+One-by-one check_vin_recall_status vs BulkRecallChecker against the stub server
+
+Generates plate numbers and VINs, checks them sequentially through
+RecallCrawler and then through BulkRecallChecker (no DB: save=False,
+ttl_days=0), and prints identifiers/sec for each.
+
+    python benchmarks/recall_check_benchmark.py --identifiers 200 --latency 0.05
+"""
+import os
+import sys
+import argparse
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.stub_server import StubServer
+from crawlers.recall_crawler import RecallCrawler
+from crawlers.recall_check_service import BulkRecallChecker, identifier_kind
+
+VIN_CHARS = 'ABCDEFGHJKLMNPRSTUVWXYZ0123456789'
+
+
+def make_identifiers(n, seed=7):
+    rng = random.Random(seed)
+    identifiers = []
+    for i in range(n):
+        if i % 4 == 0:
+            identifiers.append(''.join(rng.choice(VIN_CHARS) for _ in range(17)))
+        else:
+            identifiers.append(f"{rng.randint(10, 399)}{rng.choice('가나다라마거너더러머')}{rng.randint(1000, 9999)}")
+    return identifiers
+
+
+def run(n_identifiers, latency, workers, error_rate):
+    identifiers = make_identifiers(n_identifiers)
+    unthrottled = {'requests_per_second': 10000, 'burst': workers}
+
+    with StubServer(latency=latency, error_rate=error_rate) as server:
+        crawler = RecallCrawler({'base_url': server.url, 'delay': 0})
+        started = time.perf_counter()
+        seq_found = 0
+        for identifier in identifiers:
+            kind = identifier_kind(identifier)
+            results = (crawler.check_vin_recall_status(vin=identifier) if kind == 'vin'
+                       else crawler.check_vin_recall_status(car_number=identifier))
+            seq_found += sum(1 for r in results if r.get('status') != 'NotSubject')
+        seq_time = time.perf_counter() - started
+
+        checker = BulkRecallChecker({'base_url': server.url, 'delay': 0.01, 'max_workers': workers,
+                                     'progress_every': max(n_identifiers // 4, 1), **unthrottled})
+        stats = checker.check_many(identifiers, ttl_days=0, save=False,
+                                   progress=lambda s: print(f"  progress: {s['processed']}/{n_identifiers}"))
+        served = server.requests_served
+
+    print(f"\nlatency: {latency * 1000:.0f}ms  workers: {workers}  error_rate: {error_rate}  "
+          f"requests served: {served}")
+    print(f"{'path':<12} {'ids':>6} {'seconds':>8} {'ids/s':>8} {'recalls':>8} {'failed':>7}")
+    print(f"{'sequential':<12} {len(identifiers):>6} {seq_time:>8.2f} {len(identifiers) / seq_time:>8.1f} "
+          f"{seq_found:>8} {'-':>7}")
+    print(f"{'bulk':<12} {stats['processed']:>6} {stats['elapsed']:>8.2f} "
+          f"{stats['processed'] / stats['elapsed']:>8.1f} {stats['recalls']:>8} {stats['failed']:>7}")
+    print(f"speedup: {seq_time / stats['elapsed']:.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk recall check benchmark')
+    parser.add_argument('--identifiers', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help='stub server latency (s)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    run(args.identifiers, args.latency, args.workers, args.error_rate)
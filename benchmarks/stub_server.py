@@ -0,0 +1,281 @@
+"""
+Local stub HTTP server mimicking the crawled sites
+
+Serves K Car search pages, car.go.kr recall lists and plate/VIN recall
+checks, and the data.go.kr APIs (paged JSON/XML envelopes with totalCount, daily
+quota errors) with configurable latency and failure injection, so crawler
+throughput can be measured without touching the real sites.
+
+    with StubServer(latency=0.05) as server:
+        crawler = KCarCrawler({'base_url': server.url, ...})
+
+    python benchmarks/stub_server.py --port 8765 --latency 0.05
+"""
+import json
+import random
+import threading
+import time
+from xml.sax.saxutils import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+MODELS = [('현대', '아반떼'), ('현대', '쏘나타'), ('기아', 'K5'), ('기아', '쏘렌토'), ('제네시스', 'G80')]
+RECALL_TITLES = ['브레이크 호스 손상 리콜', '엔진 제어 소프트웨어 시정조치',
+                 '에어백 전개 불량 리콜', '계기판 표시 오류 시정조치', '오디오 전원 차단 조치']
+
+
+def _rng(*parts):
+    """Deterministic per-request RNG so repeated runs serve the same data"""
+    return random.Random('|'.join(str(part) for part in parts))
+
+
+def render_kcar_search(params, page_size=20):
+    page = int(params.get('page', 1))
+    manufacturer = params.get('manufacturer', '현대')
+    model = params.get('model', '아반떼')
+    year_min = int(params.get('year_min', 2020))
+    year_max = int(params.get('year_max', year_min))
+    rng = _rng('kcar', manufacturer, model, year_min, year_max, page)
+
+    items = []
+    for _ in range(page_size):
+        year = rng.randint(year_min, year_max)
+        price = rng.randint(900, 4500)
+        mileage = rng.randint(5, 180) * 1000
+        listing_id = rng.randint(10 ** 8, 10 ** 9 - 1)
+        items.append(
+            f'<div class="car-item" data-car-id="{listing_id}">'
+            f'<a href="/bc/detail/{listing_id}" title="{manufacturer} {model}">{manufacturer} {model}</a>'
+            f'<span class="year">{year}년</span><span class="km">{mileage:,}km</span>'
+            f'<span class="price">{price:,}만원</span></div>'
+        )
+    return '<html><body><div class="list">' + ''.join(items) + '</div></body></html>'
+
+
+def render_recall_list(params, page_size=20):
+    page = int(params.get('pageIndex', 1))
+    rng = _rng('recall', page)
+    rows = []
+    for _ in range(page_size):
+        manufacturer, model = rng.choice(MODELS)
+        title = rng.choice(RECALL_TITLES)
+        day = rng.randint(1, 28)
+        rows.append(
+            f'<tr><td>[{manufacturer}] {model} - {title}</td>'
+            f'<td>2024-{rng.randint(1, 12):02d}-{day:02d}</td></tr>'
+        )
+    return '<html><body><table>' + ''.join(rows) + '</table></body></html>'
+
+
+def render_vin_check(params):
+    identifier = params.get('carNo') or params.get('vinNo') or ''
+    rng = _rng('vin', identifier)
+    if rng.random() < 0.6:
+        body = '<div class="search-result"><p>조회하신 차량은 리콜 대상이 아닙니다.</p></div>'
+    else:
+        rows = []
+        for _ in range(rng.randint(1, 3)):
+            status = rng.choice(['미조치 대상', '조치완료'])
+            rows.append(f'<tr><td>{rng.choice(RECALL_TITLES)}</td><td>내용: {status}</td></tr>')
+        body = '<div class="search-result"><table>' + ''.join(rows) + '</table></div>'
+    return f'<html><body><h1>리콜 대상 조회</h1>{body}</body></html>'
+
+
+def _page_window(params, total_count, default_rows=100):
+    page = int(params.get('pageNo', 1))
+    rows = int(params.get('numOfRows', default_rows))
+    start = (page - 1) * rows
+    return page, rows, max(0, min(rows, total_count - start))
+
+
+def _envelope(items, page, rows, total_count):
+    return {'response': {'header': {'resultCode': '00', 'resultMsg': 'NORMAL SERVICE.'},
+                         'body': {'items': {'item': items}, 'pageNo': page, 'numOfRows': rows,
+                                  'totalCount': total_count}}}
+
+
+def to_xml(envelope):
+    """data.go.kr JSON envelope -> the equivalent XML document"""
+    response = envelope['response']
+    body = response['body']
+    items = ''.join('<item>' + ''.join(f'<{key}>{escape(str(value))}</{key}>' for key, value in item.items())
+                    + '</item>' for item in body['items']['item'])
+    return ('<?xml version="1.0" encoding="UTF-8"?><response><header>'
+            f"<resultCode>{response['header']['resultCode']}</resultCode>"
+            f"<resultMsg>{response['header']['resultMsg']}</resultMsg></header><body>"
+            f"<items>{items}</items><numOfRows>{body['numOfRows']}</numOfRows>"
+            f"<pageNo>{body['pageNo']}</pageNo><totalCount>{body['totalCount']}</totalCount></body></response>")
+
+
+QUOTA_EXCEEDED_XML = ('<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>'
+                      '<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>'
+                      '<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>')
+
+
+def render_registration(params, total_count=2000):
+    page, rows, n_items = _page_window(params, total_count)
+    rng = _rng('registration', params.get('year'), page)
+    items = []
+    for _ in range(n_items):
+        manufacturer, model = rng.choice(MODELS)
+        count = rng.randint(10, 900)
+        items.append({
+            'region': rng.choice(['서울', '경기', '부산', '대구']),
+            'manufacturer': manufacturer,
+            'modelName': model,
+            'registrationCount': count,
+            'cumulativeCount': count * rng.randint(20, 80),
+            'registrationDate': f"{params.get('year', 2024)}-{rng.randint(1, 12):02d}-01",
+            'fuelType': '가솔린'
+        })
+    return _envelope(items, page, rows, total_count)
+
+
+def render_fuel_efficiency(params, total_count=None):
+    """Trims of the manufacturer's models; total_count defaults to one per model"""
+    manufacturer = params.get('manufacturer', '현대')
+    models = [model for maker, model in MODELS if maker == manufacturer]
+    if not models:
+        return _envelope([], int(params.get('pageNo', 1)), int(params.get('numOfRows', 100)), 0)
+    total_count = total_count or len(models)
+    page, rows, n_items = _page_window(params, total_count)
+    start = (page - 1) * rows
+    items = []
+    for index in range(start, start + n_items):
+        model = models[index % len(models)]
+        rng = _rng('fuel', manufacturer, params.get('year'), index)
+        combined = round(rng.uniform(8, 18), 1)
+        items.append({
+            'manufacturer': manufacturer, 'modelName': model, 'year': params.get('year', 2024),
+            'displacement': rng.choice([1598, 1999, 2497, 3342]),
+            'cityEfficiency': round(combined * 0.9, 1), 'highwayEfficiency': round(combined * 1.15, 1),
+            'combinedEfficiency': combined, 'fuelType': '가솔린'
+        })
+    return _envelope(items, page, rows, total_count)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, params):
+        server = self.server
+        server.count_request()
+        if server.latency:
+            time.sleep(server.latency)
+        if server.error_rate and random.random() < server.error_rate:
+            self._send(503, 'unavailable', 'text/plain; charset=utf-8')
+            return
+
+        path = urlparse(self.path).path
+        if path.endswith('/bc/search'):
+            self._send(200, render_kcar_search(params, server.page_size), 'text/html; charset=utf-8')
+        elif path.endswith('/ri/stat/list.do'):
+            self._send(200, render_recall_list(params, server.page_size), 'text/html; charset=utf-8')
+        elif path.endswith('/ri/recall/list.do'):
+            self._send(200, render_vin_check(params), 'text/html; charset=utf-8')
+        elif path.endswith('/CarRegistration'):
+            self._send_api(params, render_registration(params, server.total_count))
+        elif path.endswith('/FuelEfficiency'):
+            self._send_api(params, render_fuel_efficiency(params, server.fuel_total_count))
+        else:
+            self._send(404, 'not found', 'text/plain; charset=utf-8')
+
+    def _send_api(self, params, envelope):
+        """data.go.kr response: XML for dataType=XML, quota error once daily_quota is spent"""
+        if not self.server.take_quota():
+            # 실제 게이트웨이처럼 dataType과 무관하게 XML, HTTP 200으로 응답
+            self._send(200, QUOTA_EXCEEDED_XML, 'text/xml; charset=utf-8')
+        elif str(params.get('dataType', 'JSON')).upper() == 'XML':
+            self._send(200, to_xml(envelope), 'application/xml; charset=utf-8')
+        else:
+            self._send(200, json.dumps(envelope, ensure_ascii=False), 'application/json; charset=utf-8')
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._dispatch({key: values[-1] for key, values in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        form = parse_qs(body)
+        self._dispatch({key: values[-1] for key, values in form.items()})
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server running in a background thread"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0,
+                 page_size=20, total_count=2000, fuel_total_count=None, daily_quota=None):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.page_size = page_size
+        self.total_count = total_count
+        self.fuel_total_count = fuel_total_count
+        self.daily_quota = daily_quota
+        self.api_calls = 0
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self._count_lock:
+            self.requests_served += 1
+
+    def take_quota(self):
+        """Count one data.go.kr call; False once daily_quota calls were served"""
+        with self._count_lock:
+            self.api_calls += 1
+            return self.daily_quota is None or self.api_calls <= self.daily_quota
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Crawler stub server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to each response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 503 responses')
+    args = parser.parse_args()
+
+    server = StubServer(port=args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"Stub server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
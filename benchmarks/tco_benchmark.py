@@ -0,0 +1,92 @@
+"""
+Per-model TCO loop vs TCOEngine.compute on a synthetic input frame
+
+Builds TCOEngine inputs for N models (no database), then computes every
+model over the horizon grid once with a Python loop shaped like the old
+calculate_total_cost_of_ownership (one dict per model and horizon) and once
+with the broadcast engine, and checks both give the same totals.
+
+    python benchmarks/tco_benchmark.py --models 200 --max-years 10
+"""
+import os
+import sys
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analyzers.tco_engine import TCOEngine, INPUT_COLUMNS
+from config.config import FUEL_COST_CONFIG
+
+
+def synthetic_inputs(n_models, seed=0):
+    rng = np.random.default_rng(seed)
+    fuel_types = np.array(['가솔린', '디젤', '하이브리드', '전기'])
+    fuel = fuel_types[rng.integers(0, len(fuel_types), n_models)]
+    efficiency = np.where(fuel == '전기', rng.uniform(4, 6, n_models), rng.uniform(9, 20, n_models))
+    inputs = pd.DataFrame({
+        'model_id': np.arange(1, n_models + 1),
+        'manufacturer': '현대',
+        'model_name': [f'model-{i}' for i in range(n_models)],
+        'segment': '중형',
+        'initial_price': rng.uniform(1000, 6000, n_models),
+        'fuel_type': fuel,
+        'combined_efficiency': efficiency,
+        'efficiency_measured': True,
+        'current_price': rng.uniform(1500, 7000, n_models),
+        'depreciation_rate': rng.uniform(0.05, 0.2, n_models),
+    })
+    return inputs[INPUT_COLUMNS]
+
+
+def per_model_loop(inputs, horizons, config):
+    rows = []
+    for record in inputs.to_dict('records'):
+        annual_fuel = round(FUEL_COST_CONFIG['annual_km'] / record['combined_efficiency']
+                            * FUEL_COST_CONFIG['prices'][record['fuel_type']] / 10000, 1)
+        for years in horizons:
+            breakdown = {
+                '구매가격': record['initial_price'],
+                '보험료': record['initial_price'] * config['insurance_rate'] * years,
+                '유지보수': config['maintenance_per_year'] * years,
+                '연료비': annual_fuel * years,
+                '세금': record['initial_price'] * config['tax_rate'] * years,
+                '잔존가치': -round(record['current_price'] * (1 - record['depreciation_rate']) ** years, 0),
+            }
+            breakdown['총소유비용'] = sum(breakdown.values())
+            rows.append({'model_id': record['model_id'], 'years': years, **breakdown})
+    return pd.DataFrame(rows)
+
+
+def run(n_models, max_years, repeat):
+    engine = TCOEngine(db=object())
+    inputs = synthetic_inputs(n_models)
+    horizons = list(range(1, max_years + 1))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        looped = per_model_loop(inputs, horizons, engine.config)
+    loop_time = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        batch = engine.compute(horizons=horizons, inputs=inputs)
+    batch_time = (time.perf_counter() - started) / repeat
+
+    same = np.allclose(looped['총소유비용'].to_numpy(), batch['총소유비용'].to_numpy())
+    print(f"\nmodels: {n_models}  horizons: 1..{max_years}  rows: {len(batch)}")
+    print(f"per-model loop : {loop_time * 1000:8.2f} ms")
+    print(f"TCOEngine      : {batch_time * 1000:8.2f} ms")
+    print(f"speedup: {loop_time / batch_time:.1f}x  identical totals: {same}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='TCO engine benchmark')
+    parser.add_argument('--models', type=int, default=200)
+    parser.add_argument('--max-years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.models, args.max_years, args.repeat)
@@ -46,7 +46,12 @@ DATABASE_CONFIG = {
     'auth_plugin': 'mysql_native_password',
     'connection_timeout': 60,
     'autocommit': True,
-    'pool_reset_session': False
+    'pool_reset_session': False,
+    # DBHelper 커넥션 풀 설정 (mysql.connector.connect에는 전달되지 않음)
+    'pool_size': get_env_var('DB_POOL_SIZE', 5, int),
+    'pool_max_idle_seconds': get_env_var('DB_POOL_MAX_IDLE_SECONDS', 300, int),
+    'pool_checkout_timeout': get_env_var('DB_POOL_CHECKOUT_TIMEOUT', 30, int),
+    'pool_health_check': get_env_var('DB_POOL_HEALTH_CHECK', True, bool)
 }
 
 
@@ -109,6 +114,17 @@ CAR_SEGMENTS = {
     'SUV대형': ['팰리세이드', '모하비', 'GV80']
 }
 
+# 중고차 주행거리 구간 (상한 km 미만, 라벨) - 마지막 구간은 상한 없음
+MILEAGE_BANDS = [
+    (30000, '3만km 미만'),
+    (50000, '3-5만km'),
+    (70000, '5-7만km'),
+    (100000, '7-10만km'),
+    (150000, '10-15만km'),
+    (None, '15만km 이상')
+]
+MILEAGE_BAND_UNKNOWN = '미확인'
+
 # 분석 가중치 설정
 ANALYSIS_WEIGHTS = {
     'price_weight': 0.4,      # 가격 가중치
@@ -117,12 +133,71 @@ ANALYSIS_WEIGHTS = {
     'age_weight': 0.1         # 연식 가중치
 }
 
+# 연료비 산정 (TCO) - 가격 단위: 원/L (전기는 원/kWh), 효율 단위: km/L (전기는 km/kWh)
+FUEL_COST_CONFIG = {
+    'annual_km': get_env_var('FUEL_ANNUAL_KM', 15000, int),  # 연간 주행거리
+    'prices': {
+        '가솔린': get_env_var('FUEL_PRICE_GASOLINE', 1650, float),
+        '디젤': get_env_var('FUEL_PRICE_DIESEL', 1550, float),
+        'LPG': get_env_var('FUEL_PRICE_LPG', 1000, float),
+        '하이브리드': get_env_var('FUEL_PRICE_GASOLINE', 1650, float),
+        '전기': get_env_var('FUEL_PRICE_ELECTRIC', 300, float),
+        '수소': get_env_var('FUEL_PRICE_HYDROGEN', 10000, float)  # 원/kg (효율은 km/kg)
+    },
+    # 연비 데이터가 없는 모델은 연료 종류별 평균 복합연비 사용
+    'default_efficiency': {
+        '가솔린': 11.0, '디젤': 14.0, 'LPG': 8.5, '하이브리드': 17.0, '전기': 5.0, '수소': 95.0
+    },
+    # CarModel / API 연료 표기 -> 표준 연료 종류
+    'aliases': {
+        'gasoline': '가솔린', '휘발유': '가솔린', 'diesel': '디젤', '경유': '디젤',
+        'lpg': 'LPG', 'lpi': 'LPG', 'hybrid': '하이브리드', 'hev': '하이브리드', 'phev': '하이브리드',
+        'electric': '전기', 'ev': '전기', 'hydrogen': '수소', 'fcev': '수소'
+    },
+    'default_fuel_type': '가솔린'
+}
+
+# 총소유비용(TCO) 산정 파라미터 (금액 단위: 만원)
+TCO_CONFIG = {
+    'insurance_rate': get_env_var('TCO_INSURANCE_RATE', 0.05, float),  # 구매가 대비 연 보험료
+    'tax_rate': get_env_var('TCO_TAX_RATE', 0.02, float),  # 구매가 대비 연 세금
+    'maintenance_per_year': get_env_var('TCO_MAINTENANCE_PER_YEAR', 200, float),
+    'default_depreciation': get_env_var('TCO_DEFAULT_DEPRECIATION', 0.15, float),  # 시세 이력 부족 시 연 감가율
+    'default_years': get_env_var('TCO_DEFAULT_YEARS', 5, int)
+}
+
+# 감가 모델 (로그 선형 회귀) 설정
+DEPRECIATION_CONFIG = {
+    # 사전 계수 쪽 수축 강도 (가중치 = 매물 수 단위)
+    'model_prior_strength': get_env_var('DEPRECIATION_MODEL_PRIOR_STRENGTH', 20.0, float),  # 모델 -> 세그먼트
+    'segment_prior_strength': get_env_var('DEPRECIATION_SEGMENT_PRIOR_STRENGTH', 50.0, float),  # 세그먼트 -> 전체
+    'ridge': get_env_var('DEPRECIATION_RIDGE', 1e-6, float),  # 전체 적합 수치 안정화
+    'default_rate': get_env_var('DEPRECIATION_DEFAULT_RATE', 0.15, float)  # 적합 결과가 없을 때 연 감가율
+}
+
 # 환경 변수 기반 크롤링 설정
 CRAWLING_CONFIG = {
+    'fetch': {  # 비동기 수집 엔진 공통 설정 (crawlers/async_fetcher.py)
+        'max_connections': get_env_var('FETCH_MAX_CONNECTIONS', 20, int),
+        'per_host_limit': get_env_var('FETCH_PER_HOST_LIMIT', 4, int),
+        'keepalive_timeout': get_env_var('FETCH_KEEPALIVE_TIMEOUT', 30, int),
+        'backoff_base': get_env_var('FETCH_BACKOFF_BASE', 1.0, float),
+        'backoff_max': get_env_var('FETCH_BACKOFF_MAX', 30.0, float)
+    },
     'kcar': {
         'delay': get_env_var('KCAR_DELAY', 3, int),
         'max_items_per_model': get_env_var('KCAR_MAX_ITEMS', 20, int),
         'max_pages': get_env_var('KCAR_MAX_PAGES', 3, int),
+        'page_size': get_env_var('KCAR_PAGE_SIZE', 20, int),
+        'search_mode': get_env_var('KCAR_SEARCH_MODE', 'per_year'),  # per_year / model_range
+        'store_listings': get_env_var('KCAR_STORE_LISTINGS', False, bool),  # UsedCarListing 저장 + SQL 집계
+        'listing_window_days': get_env_var('KCAR_LISTING_WINDOW_DAYS', 7, int),
+        'concurrent': get_env_var('KCAR_CONCURRENT', False, bool),
+        'fetch_backend': get_env_var('KCAR_FETCH_BACKEND', 'threads'),  # threads / async
+        'max_workers': get_env_var('KCAR_MAX_WORKERS', 4, int),
+        'requests_per_second': get_env_var('KCAR_RPS', None, float),  # None이면 1/delay
+        'burst': get_env_var('KCAR_BURST', 1, int),
+        'html_parser': get_env_var('HTML_PARSER_BACKEND', 'auto'),  # auto / selectolax / lxml / html.parser
         'search_url': 'https://www.kcar.com/bc/search'
     },
     'encar': {  # 호환성을 위한 기존 설정 유지
@@ -134,6 +209,11 @@ CRAWLING_CONFIG = {
     'recall': {
         'delay': get_env_var('RECALL_DELAY', 1, int),
         'max_items': get_env_var('RECALL_MAX_ITEMS', 50, int),
+        'max_pages': get_env_var('RECALL_MAX_PAGES', 5, int),
+        'check_last_days': get_env_var('RECALL_CHECK_LAST_DAYS', 30, int),
+        'incremental': get_env_var('RECALL_INCREMENTAL', False, bool),  # 체크포인트 기반 증분 수집
+        'concurrent': get_env_var('RECALL_CONCURRENT', False, bool),
+        'html_parser': get_env_var('HTML_PARSER_BACKEND', 'auto'),
         'max_retries': 3,
         'timeout': 30,
         'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -149,11 +229,12 @@ CRAWLING_CONFIG = {
         ],
 
         # 심각도별 키워드
+        # (analyzers/severity_classifier.py가 크롤러/샘플 데이터/재분류 작업에서 공유)
         'severity_keywords': {
-            '매우심각': ['화재', '폭발', '사망', '중상', '에어백', '브레이크', '조향장치'],
-            '심각': ['엔진', '변속기', '연료', '배출가스', '전기계통', '타이어'],
-            '보통': ['누수', '소음', '진동', '센서', '램프', '계기판'],
-            '경미': ['도색', '내장재', '편의장치', '오디오', '네비게이션']
+            '매우심각': ['화재', '폭발', '사망', '중상', '에어백', '브레이크', '조향', '급가속', '급정지'],
+            '심각': ['엔진', '변속기', '연료', '배출가스', '전기계통', '타이어', '서스펜션'],
+            '보통': ['누수', '소음', '진동', '센서', '램프', '계기판', '공조장치'],
+            '경미': ['도색', '내장재', '편의장치', '오디오', '네비게이션', 'USB']
         },
 
         # 크롤링 옵션
@@ -174,8 +255,36 @@ CRAWLING_CONFIG = {
             'slack_webhook': ''  # 슬랙 웹훅 URL
         }
     },
+    'recall_check': {  # 차량번호/차대번호 대량 리콜 확인 (crawlers/recall_check_service.py)
+        'max_workers': get_env_var('RECALL_CHECK_WORKERS', 4, int),
+        'requests_per_second': get_env_var('RECALL_CHECK_RPS', 2.0, float),
+        'burst': get_env_var('RECALL_CHECK_BURST', 2, int),
+        'ttl_days': get_env_var('RECALL_CHECK_TTL_DAYS', 7, int),  # 이 기간 내 확인한 식별자는 건너뜀 (0이면 항상 조회)
+        'write_batch_size': get_env_var('RECALL_CHECK_WRITE_BATCH', 500, int),
+        'lookup_batch_size': 1000,  # TTL 조회 IN 목록 크기
+        'use_index': get_env_var('RECALL_CHECK_USE_INDEX', True, bool),  # 모델+생산일 기준 저장 리콜로 먼저 판정
+        'index_max_age': get_env_var('RECALL_INDEX_MAX_AGE', 3600, int),  # 리콜 적용 인덱스 재적재 주기 (초)
+        # 리콜 목록 수집이 이 기간 내에 끝까지 완료된 경우만 저장 리콜로 '해당 없음' 판정
+        'coverage_max_age_days': get_env_var('RECALL_COVERAGE_MAX_AGE_DAYS', 7, int),
+        'progress_every': 100,
+        'max_retries': 3,
+        'timeout': 30
+    },
     'public_data': {
-        'file_path': get_env_var('PUBLIC_DATA_FILE_PATH', './data/cache/car_registration_data.xlsx')
+        'file_path': get_env_var('PUBLIC_DATA_FILE_PATH', './data/cache/car_registration_data.xlsx'),
+        'concurrent': get_env_var('PUBLIC_DATA_CONCURRENT', False, bool),
+        'chunk_size': get_env_var('PUBLIC_DATA_CHUNK_SIZE', 5000, int),  # 다중 행 upsert 청크 크기
+        'ingest_mode': get_env_var('PUBLIC_DATA_INGEST_MODE', 'auto'),  # batch / infile / auto
+        'read_chunk_rows': get_env_var('PUBLIC_DATA_READ_CHUNK_ROWS', 50000, int),  # 파일 스트리밍 읽기 행 수
+        'max_sheets': get_env_var('PUBLIC_DATA_MAX_SHEETS', 5, int),
+        'cache_enabled': get_env_var('PUBLIC_DATA_CACHE', True, bool),  # 내용 해시 기반 파싱 결과 캐시 (DATA_FILES['cache'])
+        'cache_keep': get_env_var('PUBLIC_DATA_CACHE_KEEP', 3, int),
+        'num_of_rows': get_env_var('PUBLIC_DATA_NUM_OF_ROWS', 1000, int),  # API 페이지 크기
+        'page_workers': get_env_var('PUBLIC_DATA_PAGE_WORKERS', 4, int),  # 2페이지 이후 동시 조회 수
+        'requests_per_second': get_env_var('PUBLIC_DATA_REQUESTS_PER_SECOND', 10.0, float),
+        'burst': get_env_var('PUBLIC_DATA_BURST', 4, int),
+        'daily_quota': get_env_var('PUBLIC_DATA_DAILY_QUOTA', 1000, int),  # 서비스 키 일일 트래픽 (개발계정 1000)
+        'fuel_year': get_env_var('PUBLIC_DATA_FUEL_YEAR', 2024, int)  # 연비 정보 수집 연식
     }
 }
 
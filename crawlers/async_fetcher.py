@@ -0,0 +1,301 @@
+"""
+asyncio/aiohttp based fetch engine shared by the crawlers
+- connection pooling + HTTP keep-alive (one TCPConnector per run)
+- per-host concurrency caps and shared per-host token buckets
+- jittered exponential backoff on network errors / 429 / 5xx
+- streamed response bodies (iter_chunked), optional download to file
+- one event loop + session per engine, reused across fetch_all calls until close()
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import CRAWLING_CONFIG
+from crawlers.rate_limiter import host_of
+
+try:
+    import aiohttp
+except ImportError:  # requests 기반 순차 경로만 사용 가능
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(Exception):
+    """Body exceeded max_body_bytes (not retried: the same URL will be as large next time)"""
+
+
+class FetchResponse:
+    """Minimal requests.Response look-alike so existing parsers can be reused"""
+
+    def __init__(self, url, status_code=None, headers=None, content=b'', encoding=None,
+                 error=None, attempts=0, elapsed=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 300
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return f"<FetchResponse {self.status_code} {self.url}>"
+
+
+def is_available():
+    return aiohttp is not None
+
+
+class AsyncFetchEngine:
+    """Fetch many URLs concurrently over one pooled aiohttp session.
+
+    Requests are dicts with 'url' and optionally 'method', 'params', 'data',
+    'headers'; results are FetchResponse objects in request order. Failed
+    requests come back with .error set instead of raising.
+
+    The synchronous wrappers run on an event loop and session owned by the
+    engine, so consecutive fetch_all calls (e.g. page rounds) reuse the
+    pooled keep-alive connections; call close() when the run is finished.
+    """
+
+    def __init__(self, config=None, headers=None, cookies=None, rate_limiters=None):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncFetchEngine (pip install aiohttp)")
+
+        settings = dict(CRAWLING_CONFIG.get('fetch', {}))
+        settings.update(config or {})
+        self.max_connections = settings.get('max_connections', 20)
+        self.per_host_limit = settings.get('per_host_limit', 4)
+        self.keepalive_timeout = settings.get('keepalive_timeout', 30)
+        self.timeout = settings.get('timeout', 30)
+        self.max_retries = settings.get('max_retries', 3)
+        self.backoff_base = settings.get('backoff_base', 1.0)
+        self.backoff_max = settings.get('backoff_max', 30.0)
+        self.max_body_bytes = settings.get('max_body_bytes')
+
+        self.headers = dict(headers or {})
+        self.cookies = dict(cookies or {})
+        # host -> TokenBucket (crawlers.rate_limiter.get_host_limiter)
+        self.rate_limiters = dict(rate_limiters or {})
+
+        self._semaphores = {}
+        self._loop = None
+        self._session = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'bytes': 0, 'elapsed': 0.0}
+
+    # === 내부 도구 ===
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff (honours Retry-After when given)"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _semaphore(self, host):
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def _throttle(self, host):
+        limiter = self.rate_limiters.get(host)
+        if limiter is None:
+            return
+        while True:
+            wait = limiter.try_acquire()
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+    def _make_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookies=self.cookies,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    @staticmethod
+    def _encoding_of(response):
+        try:
+            return response.get_encoding()
+        except (RuntimeError, LookupError):
+            return 'utf-8'
+
+    async def _read_body(self, response, sink=None):
+        """Stream the body chunk by chunk into memory or an open file"""
+        body = bytearray()
+        size = 0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            if sink is not None:
+                sink.write(chunk)
+                continue
+            if self.max_body_bytes and size > self.max_body_bytes:
+                raise ResponseTooLarge(f"response body exceeds {self.max_body_bytes} bytes")
+            body.extend(chunk)
+        self.stats['bytes'] += size
+        return bytes(body)
+
+    async def _fetch_one(self, session, request, sink=None):
+        url = request['url']
+        method = request.get('method', 'GET')
+        host = host_of(url)
+        started = time.perf_counter()
+        last_error = None
+        status = None
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore(host):
+                    await self._throttle(host)
+                    self.stats['requests'] += 1
+                    async with session.request(
+                        method, url,
+                        params=request.get('params'),
+                        data=request.get('data'),
+                        headers=request.get('headers')
+                    ) as response:
+                        status = response.status
+                        if status in RETRY_STATUSES and attempt < self.max_retries:
+                            header = response.headers.get('Retry-After')
+                            retry_after = float(header) if header and header.isdigit() else None
+                            last_error = f"HTTP {status}"
+                        else:
+                            content = await self._read_body(response, sink)
+                            return FetchResponse(
+                                url, status, response.headers.copy(), content,
+                                encoding=self._encoding_of(response) if content else None,
+                                attempts=attempt + 1,
+                                elapsed=time.perf_counter() - started
+                            )
+            except ResponseTooLarge as e:
+                last_error = f"{type(e).__name__}: {e}"
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                if sink is not None:
+                    break  # 부분 기록된 파일은 재시도하지 않음
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                delay = self._backoff_delay(attempt, retry_after)
+                logger.warning(f"요청 실패 ({last_error}), {delay:.1f}초 후 재시도 "
+                               f"{attempt + 1}/{self.max_retries}: {url}")
+                await asyncio.sleep(delay)
+
+        self.stats['failures'] += 1
+        logger.error(f"요청 최종 실패: {url} ({last_error})")
+        return FetchResponse(url, status, error=last_error, attempts=attempt + 1,
+                             elapsed=time.perf_counter() - started)
+
+    # === 공개 API ===
+
+    async def fetch_all_async(self, requests_, session=None):
+        """Fetch a batch on `session` (default: a session opened for this batch only)"""
+        if session is None:
+            async with self._make_session() as session:
+                return await self.fetch_all_async(requests_, session)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._fetch_one(session, req) for req in requests_))
+        self.stats['elapsed'] += time.perf_counter() - started
+        return list(results)
+
+    async def download_async(self, url, path, params=None, session=None):
+        if session is None:
+            async with self._make_session() as session:
+                return await self.download_async(url, path, params, session)
+        with open(path, 'wb') as f:
+            return await self._fetch_one(session, {'url': url, 'params': params}, sink=f)
+
+    def _run(self, make_coro):
+        """Run make_coro(session) on the engine's own loop and shared session"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._semaphores = {}  # 세마포어는 이벤트 루프마다 새로 생성
+        if self._session is None or self._session.closed:
+            self._session = self._loop.run_until_complete(self._open_session())
+        return self._loop.run_until_complete(make_coro(self._session))
+
+    async def _open_session(self):
+        return self._make_session()
+
+    def fetch_all(self, requests_):
+        """Synchronous wrapper: run the batch on the engine's loop, reusing its session"""
+        requests_ = [req if isinstance(req, dict) else {'url': req} for req in requests_]
+        if not requests_:
+            return []
+        return self._run(lambda session: self.fetch_all_async(requests_, session))
+
+    def download(self, url, path, params=None):
+        """Stream a large response straight to disk"""
+        return self._run(lambda session: self.download_async(url, path, params, session))
+
+    def close(self):
+        """Close the shared session and event loop (the next fetch_all opens new ones)"""
+        if self._loop is None:
+            return
+        try:
+            if self._session is not None and not self._session.closed:
+                self._loop.run_until_complete(self._session.close())
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._session = None
+            self._semaphores = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['requests_per_sec'] = stats['requests'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+        return stats
+
+
+def build_engine(crawler_config, headers=None, cookies=None, rate_limiters=None):
+    """Engine for a crawler config (its 'fetch' overrides + max_retries/timeout), or None without aiohttp"""
+    if aiohttp is None:
+        logger.warning("aiohttp가 설치되지 않아 비동기 수집을 사용할 수 없습니다.")
+        return None
+    # 압축/연결 헤더는 aiohttp가 직접 관리
+    headers = {key: value for key, value in (headers or {}).items()
+               if key.lower() not in ('accept-encoding', 'connection')}
+    overrides = dict(crawler_config.get('fetch', {}))
+    for key in ('max_retries', 'timeout'):
+        if key in crawler_config:
+            overrides.setdefault(key, crawler_config[key])
+    return AsyncFetchEngine(overrides, headers=headers, cookies=cookies, rate_limiters=rate_limiters)
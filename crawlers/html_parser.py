@@ -0,0 +1,175 @@
+"""
+Pluggable HTML parsing layer for crawler result pages
+- backends: selectolax (locate nodes) -> lxml -> html.parser, picked automatically
+- SoupStrainer partial parsing limited to the result containers
+- selector sets compiled once and cached
+Returned elements are always BeautifulSoup tags so existing extractors keep working.
+"""
+import re
+import logging
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from bs4.filter import ElementFilter  # bs4 >= 4.13
+except ImportError:
+    ElementFilter = None
+
+try:
+    import lxml  # noqa: F401  (bs4 'lxml' tree builder)
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+logger = logging.getLogger(__name__)
+
+# tag.class1.class2[attr][attr=value] with an optional trailing :has(...)
+_SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)'
+    r'(?P<attrs>(?:\[[\w-]+(?:=["\']?[^\]"\']*["\']?)?\])*)(?P<pseudo>:has\(.+\))?$'
+)
+_ATTR_RE = re.compile(r'\[([\w-]+)(?:=["\']?([^\]"\']*)["\']?)?\]')
+
+
+def _parse_simple_selector(selector):
+    """'div.car-item[data-id]' -> (tag, {classes}, {attr: value|None}, has_pseudo) or None"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.group(key) for key in ('tag', 'classes', 'attrs')):
+        return None
+    classes = {cls for cls in match.group('classes').split('.') if cls}
+    attrs = {name: value or None for name, value in _ATTR_RE.findall(match.group('attrs') or '')}
+    return (match.group('tag') or '').lower() or None, classes, attrs, bool(match.group('pseudo'))
+
+
+def _make_strainer(matcher):
+    """parse_only filter calling matcher(name, attrs) for top-level tags"""
+    if ElementFilter is None:
+        # bs4 < 4.13: SoupStrainer가 callable(name, attrs)를 직접 지원
+        return SoupStrainer(matcher)
+
+    class _ContainerFilter(ElementFilter):
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return matcher(name, attrs)
+
+        def allow_string_creation(self, string):
+            return False
+
+    return _ContainerFilter()
+
+
+class CompiledSelectors:
+    """An ordered selector set plus a SoupStrainer covering all of its containers"""
+
+    def __init__(self, selectors):
+        self.selectors = tuple(selectors)
+        self.specs = []
+        self.has_pseudo = False
+        for selector in self.selectors:
+            for part in selector.split(','):
+                spec = _parse_simple_selector(part)
+                if spec is None:
+                    # 단순 선택자가 아니면 부분 파싱 불가 -> 전체 파싱
+                    self.specs = None
+                    break
+                self.specs.append(spec)
+                self.has_pseudo = self.has_pseudo or spec[3]
+            if self.specs is None:
+                break
+        self.strainer = _make_strainer(self._matches) if self.specs else None
+
+    def _matches(self, name, attrs):
+        """SoupStrainer callback: keep a tag (and its subtree) if any selector could match it"""
+        if not isinstance(attrs, dict):
+            attrs = dict(attrs or {})
+        tag_classes = attrs.get('class') or ''
+        if isinstance(tag_classes, str):
+            tag_classes = tag_classes.split()
+        for tag, classes, required, _ in self.specs:
+            if tag and tag != name:
+                continue
+            if classes and not classes.issubset(tag_classes):
+                continue
+            if any(attr not in attrs or (value is not None and attrs[attr] != value)
+                   for attr, value in required.items()):
+                continue
+            return True
+        return False
+
+
+@lru_cache(maxsize=64)
+def compile_selectors(*selectors):
+    """Compile (and cache) an ordered selector set"""
+    return CompiledSelectors(selectors)
+
+
+def available_backends():
+    backends = []
+    if SelectolaxParser is not None:
+        backends.append('selectolax')
+    if HAS_LXML:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+class HtmlParser:
+    """Parse result pages with the fastest available backend"""
+
+    def __init__(self, backend=None):
+        if backend in (None, 'auto'):
+            backend = available_backends()[0]
+        if backend not in available_backends():
+            logger.warning(f"HTML 파서 백엔드 '{backend}' 사용 불가, 기본 백엔드로 대체")
+            backend = available_backends()[0]
+        self.backend = backend
+        # bs4 트리 빌더 (selectolax는 노드 탐색만 담당)
+        self.tree_builder = 'lxml' if HAS_LXML and backend != 'html.parser' else 'html.parser'
+
+    def parse(self, html, strainer=None):
+        """Full (or strained) BeautifulSoup document"""
+        return BeautifulSoup(html, self.tree_builder, parse_only=strainer)
+
+    def _select_selectolax(self, html, compiled):
+        tree = SelectolaxParser(html)
+        for selector in compiled.selectors:
+            nodes = tree.css(selector)
+            if nodes:
+                # 찾은 노드만 bs4로 다시 파싱해 기존 추출 코드에 전달
+                fragment = self.parse('<div>' + ''.join(node.html for node in nodes) + '</div>')
+                wrapper = fragment.find('div')
+                return selector, [child for child in wrapper.children if getattr(child, 'name', None)]
+        return None, []
+
+    def select(self, html, compiled):
+        """Elements of the first selector (in order) that matches; returns (selector, elements)"""
+        if self.backend == 'selectolax' and compiled.specs and not compiled.has_pseudo:
+            return self._select_selectolax(html, compiled)
+
+        soup = self.parse(html, compiled.strainer)
+        for selector in compiled.selectors:
+            elements = soup.select(selector)
+            if elements:
+                return selector, elements
+        return None, []
+
+    def select_one(self, html, compiled):
+        selector, elements = self.select(html, compiled)
+        return elements[0] if elements else None
+
+
+_parsers = {}
+
+
+def get_parser(backend=None):
+    """Shared parser instance per backend name"""
+    key = backend or 'auto'
+    parser = _parsers.get(key)
+    if parser is None:
+        parser = _parsers[key] = HtmlParser(backend)
+    return parser
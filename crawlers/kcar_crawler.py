@@ -7,32 +7,178 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 import sys
 import os
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlencode
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import MILEAGE_BANDS, MILEAGE_BAND_UNKNOWN
 from database.db_helper import db_helper
+from crawlers.rate_limiter import get_host_limiter, host_of
+from crawlers.async_fetcher import build_engine
+from crawlers.html_parser import compile_selectors, get_parser
 
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+#  K카 차량 목록 아이템 선택자 (추정) - 앞에서부터 처음 매칭되는 선택자 사용
+RESULT_SELECTORS = compile_selectors(
+    'div.car-item',
+    'li.car-list-item',
+    'div.vehicle-card',
+    'div[data-car-id]',
+    'div.search-result-item'
+)
+PRICE_TEXT_RE = re.compile(r'\d+만원|\d+,\d+만원')
+
+
+def listing_key(car):
+    """매물 식별 키 (listing_id가 없으면 주요 속성 조합)"""
+    return car.get('listing_id') or (car.get('model_name'), car.get('year'), car.get('mileage'), car.get('price'))
+
+
+def fact_listing_id(car):
+    """UsedCarListing 키 (listing_id가 없으면 주요 속성 해시)"""
+    if car.get('listing_id'):
+        return str(car['listing_id'])
+    raw = f"{car.get('model_name')}|{car.get('year')}|{car.get('mileage')}|{car.get('price')}"
+    return 'h' + hashlib.md5(raw.encode('utf-8')).hexdigest()[:20]
+
+
+class ListingPager:
+    """페이지 단위 조기 종료 판단 (빈 페이지 / 이미 본 매물만 반복되는 페이지)"""
+
+    def __init__(self):
+        self.seen = set()
+        self.done = False
+
+    def feed(self, page_results):
+        """새 매물만 반환하고, 더 요청할 필요가 없으면 done 설정"""
+        if not page_results:
+            self.done = True
+            return []
+        
+        new_items = []
+        for car in page_results:
+            key = listing_key(car)
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            new_items.append(car)
+        
+        if not new_items:
+            self.done = True
+        return new_items
+
+
+class PriceAccumulator:
+    """가격 스트리밍 집계 (매물 목록을 메모리에 보관하지 않음)"""
+
+    __slots__ = ('count', 'total', 'min_price', 'max_price')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min_price = None
+        self.max_price = None
+
+    def add(self, price):
+        self.count += 1
+        self.total += price
+        self.min_price = price if self.min_price is None else min(self.min_price, price)
+        self.max_price = price if self.max_price is None else max(self.max_price, price)
+
+    @property
+    def avg_price(self):
+        return self.total / self.count if self.count else None
+
+
+def mileage_band(mileage, bands=None):
+    """주행거리(km) -> 구간 라벨 (MILEAGE_BANDS 기준)"""
+    if mileage is None:
+        return MILEAGE_BAND_UNKNOWN
+    for upper, label in (bands or MILEAGE_BANDS):
+        if upper is None or mileage < upper:
+            return label
+    return MILEAGE_BAND_UNKNOWN
+
+
+_BAND_ORDER = {label: index for index, (_, label) in enumerate(MILEAGE_BANDS)}
+
+
+class ListingCollector:
+    """매물을 연식(선택적으로 × 주행거리 구간)별 가격 집계로 스트리밍 누적"""
+
+    def __init__(self, years, max_items, by_mileage=False, keep_listings=False):
+        self.years = set(years)
+        self.max_items = max_items
+        self.by_mileage = by_mileage
+        self.buckets = {}
+        self.count = 0
+        # UsedCarListing 저장용 (listing_id, year, mileage, price)
+        self.listings = [] if keep_listings else None
+
+    @property
+    def full(self):
+        return self.count >= self.max_items
+
+    def add(self, car):
+        """가격/연식이 맞는 매물만 누적; 표본이 다 차면 True"""
+        price, year = car.get('price'), car.get('year')
+        if price and year in self.years:
+            band = mileage_band(car.get('mileage')) if self.by_mileage else None
+            accumulator = self.buckets.get((year, band))
+            if accumulator is None:
+                accumulator = self.buckets[(year, band)] = PriceAccumulator()
+            accumulator.add(price)
+            self.count += 1
+            if self.listings is not None:
+                self.listings.append((fact_listing_id(car), year, car.get('mileage'), price))
+        return self.full
+
+    def items(self):
+        """(year, band, accumulator)를 연식, 구간 순으로 반환"""
+        for (year, band), accumulator in sorted(
+                self.buckets.items(),
+                key=lambda item: (item[0][0], _BAND_ORDER.get(item[0][1], len(_BAND_ORDER)))):
+            yield year, band, accumulator
+
+
 class KCarCrawler:
     def __init__(self, config=None):
         self.config = config or {}
         
         # 실제 K카 사이트 정보
-        self.base_url = "https://www.kcar.com"
+        self.base_url = self.config.get('base_url', "https://www.kcar.com")
         self.search_url = f"{self.base_url}/bc/search"
         self.api_search_url = f"{self.base_url}/api/bc/search"  # API 엔드포인트 추정
         
         self.delay = self.config.get('delay', 2)
         self.max_retries = self.config.get('max_retries', 3)
         
+        # 페이지 설정 (scheduler_config.json은 max_pages_per_model, CRAWLING_CONFIG는 max_pages)
+        self.max_pages = self.config.get('max_pages_per_model', self.config.get('max_pages', 3))
+        self.page_size = self.config.get('page_size', 20)
+        # per_year: 모델×연식마다 검색 / model_range: 모델당 한 번 검색 후 연식×주행거리 구간으로 분류
+        self.search_mode = self.config.get('search_mode', 'per_year')
+        # 매물 단위 저장 후 SQL로 UsedCarPrice 집계 (최근 listing_window_days일 매물 기준)
+        self.store_listings = self.config.get('store_listings', False)
+        self.listing_window_days = self.config.get('listing_window_days', 7)
+        
+        # 동시 수집 설정 (호스트 단위 토큰 버킷으로 요청 속도 제한)
+        self.concurrent = self.config.get('concurrent', False)
+        self.max_workers = self.config.get('max_workers', 4)
+        self.fetch_backend = self.config.get('fetch_backend', 'threads')  # threads / async
+        requests_per_second = self.config.get('requests_per_second') or (1.0 / self.delay if self.delay else 1.0)
+        self.rate_limiter = get_host_limiter(self.base_url, requests_per_second, self.config.get('burst', 1))
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -41,40 +187,77 @@ class KCarCrawler:
             'Referer': self.base_url,
             'X-Requested-With': 'XMLHttpRequest'
         })
+        self._session_warmed = False
+        self._warm_lock = threading.Lock()
+        self._thread_local = threading.local()
+        self._fetch_engine = None
+        self.html_parser = get_parser(self.config.get('html_parser'))
+
+    def _warm_session(self):
+        """검색 페이지를 한 번만 방문해 세션 쿠키 확보"""
+        with self._warm_lock:
+            if self._session_warmed:
+                return
+            try:
+                self.rate_limiter.acquire()
+                self.session.get(self.search_url, timeout=30)
+            except Exception as e:
+                logger.warning(f"K카 세션 초기화 실패: {e}")
+            self._session_warmed = True
+
+    def _get_session(self):
+        """스레드별 세션 (초기화된 세션의 헤더/쿠키 복사)"""
+        if threading.current_thread() is threading.main_thread():
+            return self.session
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            session.cookies.update(self.session.cookies)
+            self._thread_local.session = session
+        return session
+
+    def _build_search_params(self, manufacturer=None, model=None, year_min=None, year_max=None,
+                             price_min=None, price_max=None, page=1):
+        """K카 검색 파라미터 구성"""
+        # K카 검색 파라미터 구조 (실제 사이트 기반)
+        search_params = {
+            'page': page,
+            'size': self.page_size,
+            'sort': 'registration_desc'  # 최신순
+        }
+        
+        # 필터 파라미터 추가
+        if manufacturer:
+            search_params['manufacturer'] = manufacturer
+        if model:
+            search_params['model'] = model
+        if year_min:
+            search_params['year_min'] = year_min
+        if year_max:
+            search_params['year_max'] = year_max
+        if price_min:
+            search_params['price_min'] = price_min * 10000  # 만원 -> 원
+        if price_max:
+            search_params['price_max'] = price_max * 10000
+        return search_params
 
     def search_cars(self, manufacturer=None, model=None, year_min=None, year_max=None, 
                    price_min=None, price_max=None, page=1):
         """K카에서 차량 검색"""
         try:
-            # K카 검색 파라미터 구조 (실제 사이트 기반)
-            search_params = {
-                'page': page,
-                'size': 20,
-                'sort': 'registration_desc'  # 최신순
-            }
-            
-            # 필터 파라미터 추가
-            if manufacturer:
-                search_params['manufacturer'] = manufacturer
-            if model:
-                search_params['model'] = model
-            if year_min:
-                search_params['year_min'] = year_min
-            if year_max:
-                search_params['year_max'] = year_max
-            if price_min:
-                search_params['price_min'] = price_min * 10000  # 만원 -> 원
-            if price_max:
-                search_params['price_max'] = price_max * 10000
+            search_params = self._build_search_params(
+                manufacturer, model, year_min, year_max, price_min, price_max, page
+            )
             
             logger.info(f"K카 검색: {manufacturer} {model}, 페이지 {page}")
             
-            # 먼저 메인 검색 페이지 방문 (세션 유지)
-            self.session.get(self.search_url)
-            time.sleep(1)
+            # 메인 검색 페이지는 세션당 한 번만 방문
+            self._warm_session()
             
             # 실제 검색 요청 (AJAX/API 방식일 가능성)
-            response = self.session.get(
+            self.rate_limiter.acquire()
+            response = self._get_session().get(
                 self.search_url,
                 params=search_params,
                 timeout=30
@@ -90,36 +273,73 @@ class KCarCrawler:
             logger.error(f"K카 검색 오류: {e}")
             return []
 
+    def iter_search_results(self, manufacturer=None, model=None, year_min=None, year_max=None,
+                            price_min=None, price_max=None, max_pages=None):
+        """검색 결과를 페이지를 넘기며 매물 단위로 지연 반환
+
+        빈 페이지나 이미 본 매물만 반복되는 페이지가 나오면 중단한다.
+        호출 측에서 반복을 멈추면 이후 페이지는 요청하지 않는다.
+        """
+        pager = ListingPager()
+        for page in range(1, (max_pages or self.max_pages) + 1):
+            page_results = self.search_cars(manufacturer, model, year_min, year_max,
+                                            price_min, price_max, page=page)
+            yield from pager.feed(page_results)
+            if pager.done:
+                logger.debug(f"K카 페이지 조기 종료: {manufacturer} {model}, 페이지 {page}")
+                return
+
+    def _get_fetch_engine(self):
+        """비동기 수집 엔진 (세션 초기화 후 헤더/쿠키를 넘겨받음)"""
+        if self._fetch_engine is None:
+            self._warm_session()
+            self._fetch_engine = build_engine(
+                self.config,
+                headers=dict(self.session.headers),
+                cookies=self.session.cookies.get_dict(),
+                rate_limiters={host_of(self.base_url): self.rate_limiter}
+            )
+        return self._fetch_engine
+
+    def search_many(self, searches):
+        """여러 검색 조건을 비동기 엔진으로 동시에 요청 (결과는 입력 순서 유지)
+
+        searches: _build_search_params 인자 dict 목록
+        """
+        engine = self._get_fetch_engine()
+        if engine is None:
+            return [self.search_cars(**search) for search in searches]
+        
+        responses = engine.fetch_all([
+            {'url': self.search_url, 'params': self._build_search_params(**search)}
+            for search in searches
+        ])
+        results = []
+        for search, response in zip(searches, responses):
+            if response.ok:
+                results.append(self._parse_search_results(response.text))
+            else:
+                logger.error(f"검색 요청 실패: {search.get('manufacturer')} {search.get('model')} "
+                             f"({response.error or f'HTTP {response.status_code}'})")
+                results.append([])
+        return results
+
     def _parse_search_results(self, html_content):
         """검색 결과 파싱"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
             car_items = []
             
-            #  K카 차량 목록 아이템 선택자 (추정)
-            car_selectors = [
-                'div.car-item',
-                'li.car-list-item', 
-                'div.vehicle-card',
-                'div[data-car-id]',
-                'div.search-result-item'
-            ]
-            
-            car_elements = []
-            for selector in car_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    car_elements = elements
-                    logger.info(f"차량 목록 찾음: {selector} ({len(elements)}개)")
-                    break
-            
-            if not car_elements:
-                # 대체 방법: 가격이 포함된 모든 요소 찾기
-                car_elements = soup.find_all(text=re.compile(r'\d+만원|\d+,\d+만원'))
+            # 결과 컨테이너만 부분 파싱
+            selector, car_elements = self.html_parser.select(html_content, RESULT_SELECTORS)
+            if car_elements:
+                logger.info(f"차량 목록 찾음: {selector} ({len(car_elements)}개)")
+            elif PRICE_TEXT_RE.search(html_content):
+                # 대체 방법: 가격이 포함된 모든 요소 찾기 (원문에 가격이 있을 때만 전체 파싱)
+                soup = self.html_parser.parse(html_content)
+                car_elements = soup.find_all(string=PRICE_TEXT_RE)
                 logger.info(f"대체 방법으로 {len(car_elements)}개 가격 요소 발견")
             
-            for element in car_elements[:20]:  # 최대 20개만 처리
+            for element in car_elements:
                 try:
                     car_info = self._extract_car_info(element)
                     if car_info:
@@ -155,6 +375,16 @@ class KCarCrawler:
                 'source': 'kcar.com'
             }
             
+            # 매물 ID 추출 (data-car-id 속성 또는 상세 링크)
+            if element_soup is not None and hasattr(element_soup, 'get'):
+                listing_id = element_soup.get('data-car-id')
+                if not listing_id:
+                    detail_link = element_soup.find('a', href=True)
+                    id_match = re.search(r'(\d{5,})', detail_link['href']) if detail_link else None
+                    listing_id = id_match.group(1) if id_match else None
+                if listing_id:
+                    car_info['listing_id'] = str(listing_id)
+            
             # 가격 추출
             price_match = re.search(r'(\d{1,4}(?:,\d{3})*)\s*만원', text_content)
             if price_match:
@@ -247,75 +477,158 @@ class KCarCrawler:
             logger.error(f"제조사/모델 목록 수집 오류: {e}")
             return {}
 
-    def crawl_used_car_prices(self, car_list, max_items_per_model=10):
-        """중고차 가격 정보 크롤링 (메인 함수)"""
+    def _collect(self, task):
+        """검색 하나의 매물을 페이지를 넘기며 수집 (표본이 차면 중단)"""
+        manufacturer, model_name, model_id, year_min, year_max, collector = task
+        for car in self.iter_search_results(manufacturer, model_name, year_min=year_min, year_max=year_max):
+            if collector.add(car):
+                break
+        return collector
+
+    def _collect_async(self, tasks):
+        """비동기 엔진으로 모든 검색의 같은 페이지를 한 번에 요청 (페이지 단위 진행)
+
+        페이지 라운드 사이에 엔진의 이벤트 루프와 세션을 유지해 keep-alive 연결을 재사용하고,
+        수집이 끝나면 닫는다.
+        """
+        pagers = [ListingPager() for _ in tasks]
+        active = list(range(len(tasks)))
+        
+        try:
+            for page in range(1, self.max_pages + 1):
+                if not active:
+                    break
+                page_results = self.search_many([
+                    {'manufacturer': tasks[i][0], 'model': tasks[i][1],
+                     'year_min': tasks[i][3], 'year_max': tasks[i][4], 'page': page}
+                    for i in active
+                ])
+                still_active = []
+                for i, results in zip(active, page_results):
+                    collector = tasks[i][5]
+                    for car in pagers[i].feed(results):
+                        if collector.add(car):
+                            break
+                    if not pagers[i].done and not collector.full:
+                        still_active.append(i)
+                active = still_active
+        finally:
+            if self._fetch_engine is not None:
+                self._fetch_engine.close()
+        
+        return [task[5] for task in tasks]
+
+    def _build_tasks(self, specs, model_ids, years, max_items_per_model):
+        """검색 작업 목록: (manufacturer, model_name, model_id, year_min, year_max, collector)"""
+        tasks = []
+        for spec in specs:
+            manufacturer, model_name = spec['manufacturer'], spec['model_name']
+            model_id = model_ids.get((manufacturer, model_name))
+            if not model_id:
+                logger.warning(f"모델 ID 생성 실패: {manufacturer} {model_name}")
+                continue
+            if self.search_mode == 'model_range':
+                # 모델당 한 번 검색, 연식별 표본 상한은 기존과 같은 총량
+                collector = ListingCollector(years, max_items_per_model * len(years), by_mileage=True,
+                                             keep_listings=self.store_listings)
+                tasks.append((manufacturer, model_name, model_id, years[0], years[-1], collector))
+            else:
+                for year in years:
+                    collector = ListingCollector([year], max_items_per_model,
+                                                 keep_listings=self.store_listings)
+                    tasks.append((manufacturer, model_name, model_id, year, year, collector))
+        return tasks
+
+    def _save_listings_and_aggregate(self, tasks):
+        """수집 매물을 UsedCarListing에 upsert하고 UsedCarPrice를 SQL로 재집계"""
+        today = datetime.now().date()
+        rows = []
+        for _, _, model_id, _, _, collector in tasks:
+            for listing_id, year, mileage, price in collector.listings:
+                rows.append((listing_id, model_id, year, mileage, price))
+        if not rows:
+            return 0
+        
+        listings = pd.DataFrame(rows, columns=['listing_id', 'model_id', 'year', 'mileage', 'price'])
+        # 같은 매물이 여러 검색에 걸린 경우 마지막 값 사용
+        listings = listings.drop_duplicates('listing_id', keep='last')
+        listings['source'] = 'kcar.com'
+        listings['first_seen'] = today
+        listings['last_seen'] = today
+        db_helper.upsert_used_car_listings(listings)
+        logger.info(f"UsedCarListing 저장: {len(listings)}건")
+        
+        return db_helper.aggregate_used_car_prices(
+            source='kcar.com',
+            since=today - timedelta(days=self.listing_window_days - 1),
+            model_ids=sorted(listings['model_id'].unique().tolist()),
+            by_mileage=self.search_mode == 'model_range',
+            collected_date=today
+        )
+
+    def crawl_used_car_prices(self, car_list, max_items_per_model=10, concurrent=None):
+        """중고차 가격 정보 크롤링 (메인 함수)
+
+        concurrent=True이면 검색을 스레드 풀(또는 비동기 엔진)에서 병렬로 수행하고,
+        요청 속도는 호스트 단위 토큰 버킷으로 제한한다. search_mode가
+        'model_range'이면 모델당 한 번만 검색해 연식 × 주행거리 구간으로 분류한다.
+        집계 결과는 마지막에 한 번의 다중 행 INSERT로 저장한다.
+        """
         db_helper.update_crawling_log('kcar', '시작')
         total_collected = 0
+        concurrent = self.concurrent if concurrent is None else concurrent
         
         try:
-            for car_spec in car_list:
-                manufacturer = car_spec.get('manufacturer')
-                model_name = car_spec.get('model_name')
-                
-                if not manufacturer or not model_name:
-                    continue
-                
-                logger.info(f"--- {manufacturer} {model_name} 가격 정보 수집 ---")
-                
-                # 모델 ID 조회/생성
-                model_id = db_helper.get_or_insert_car_model(manufacturer, model_name)
-                if not model_id:
-                    logger.warning(f"모델 ID 생성 실패: {manufacturer} {model_name}")
-                    continue
-                
-                # 연식별로 검색 (최근 5년)
-                current_year = datetime.now().year
-                for year in range(current_year - 4, current_year + 1):
-                    
-                    search_results = self.search_cars(
-                        manufacturer=manufacturer,
-                        model=model_name,
-                        year_min=year,
-                        year_max=year,
-                        page=1
-                    )
-                    
-                    collected_for_year = 0
-                    prices_for_year = []
-                    
-                    for car in search_results[:max_items_per_model]:
-                        if car.get('price') and car.get('year') == year:
-                            prices_for_year.append(car['price'])
-                            collected_for_year += 1
-                    
-                    # 연식별 평균 가격 계산 및 저장
-                    if prices_for_year:
-                        avg_price = sum(prices_for_year) / len(prices_for_year)
-                        min_price = min(prices_for_year)
-                        max_price = max(prices_for_year)
-                        
-                        # 주행거리 범위 추정 (실제로는 더 세분화 필요)
-                        mileage_range = f"{year}년식 평균"
-                        
-                        # DB에 저장
-                        db_helper.insert_used_car_price(
-                            model_id=model_id,
-                            year=year,
-                            mileage_range=mileage_range,
-                            avg_price=round(avg_price),
-                            min_price=round(min_price),
-                            max_price=round(max_price),
-                            sample_count=len(prices_for_year),
-                            data_source='kcar.com',
-                            collected_date=datetime.now().date()
-                        )
-                        
-                        total_collected += 1
-                        logger.info(f"   {year}년식: 평균 {avg_price:.0f}만원 ({len(prices_for_year)}건 기준)")
-                    
+            specs = [spec for spec in car_list if spec.get('manufacturer') and spec.get('model_name')]
+            
+            # 모델 ID 일괄 조회/생성
+            model_ids = db_helper.resolve_car_models(specs)
+            
+            # 최근 5년 연식
+            current_year = datetime.now().year
+            years = list(range(current_year - 4, current_year + 1))
+            tasks = self._build_tasks(specs, model_ids, years, max_items_per_model)
+            
+            if concurrent and self.fetch_backend == 'async':
+                logger.info(f"K카 비동기 수집: {len(tasks)}건 검색, 최대 {self.max_pages}페이지")
+                self._collect_async(tasks)
+            elif concurrent:
+                logger.info(f"K카 동시 수집: {len(tasks)}건 검색, 워커 {self.max_workers}개")
+                self._warm_session()
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    list(executor.map(self._collect, tasks))
+            else:
+                for task in tasks:
+                    self._collect(task)
                     time.sleep(self.delay)  # 요청 간 딜레이
-                
-                logger.info(f"--- {manufacturer} {model_name}: {collected_for_year}건 수집 완료 ---")
+            
+            if self.store_listings:
+                total_collected = self._save_listings_and_aggregate(tasks)
+                db_helper.update_crawling_log('kcar', '완료', total_collected)
+                logger.info(f" K카 크롤링 완료! 총 {total_collected}건 (매물 기반 SQL 집계)")
+                return total_collected
+            
+            collected_date = datetime.now().date()
+            rows = []
+            for manufacturer, model_name, model_id, _, _, collector in tasks:
+                for year, band, accumulator in collector.items():
+                    rows.append({
+                        'model_id': model_id,
+                        'year': year,
+                        'mileage_range': band or f"{year}년식 평균",
+                        'avg_price': round(accumulator.avg_price),
+                        'min_price': round(accumulator.min_price),
+                        'max_price': round(accumulator.max_price),
+                        'sample_count': accumulator.count,
+                        'data_source': 'kcar.com',
+                        'collected_date': collected_date
+                    })
+                    logger.info(f"   {manufacturer} {model_name} {year}년식 {band or ''}: "
+                                f"평균 {accumulator.avg_price:.0f}만원 ({accumulator.count}건 기준)")
+            
+            if rows:
+                db_helper.insert_used_car_prices_frame(pd.DataFrame(rows))
+                total_collected = len(rows)
             
             db_helper.update_crawling_log('kcar', '완료', total_collected)
             logger.info(f" K카 크롤링 완료! 총 {total_collected}건")
@@ -367,7 +680,7 @@ class KCarCrawler:
     # 기존 인터페이스 호환성
     def crawl_and_save(self, car_list):
         """기존 스케줄러와의 호환성을 위한 메인 함수"""
-        return self.crawl_used_car_prices(car_list)
+        return self.crawl_used_car_prices(car_list, self.config.get('max_items_per_model', 10))
 
     def get_source_name(self):
         return "kcar.com"
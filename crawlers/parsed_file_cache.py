@@ -0,0 +1,212 @@
+"""
+Content-hash keyed cache of parsed public-data files
+- key: SHA-256 of the raw file, so an unchanged download is never parsed again
+- storage: Arrow IPC files under DATA_FILES['cache']/<namespace>/, read back
+  zero-copy through a memory map
+- manifest.json keeps snapshot order, the last ingested snapshot and the
+  HTTP validators (ETag / Last-Modified) of the last download
+- delta_batches(): rows of a snapshot not present (identically) in the previous
+  one, streamed batch by batch against the previous snapshot's 64-bit row
+  hashes (<digest>.rowhash, 8 bytes per row) so memory stays flat
+"""
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = pc = ipc = None
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1 << 20
+DELTA_CHUNK_ROWS = 50000
+
+
+def file_digest(file_path):
+    """SHA-256 hex digest of a file, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def row_hashes(df):
+    """64-bit hash of every row's values (index ignored), as uint64"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+
+class ParsedFileCache:
+    """Arrow snapshots of parsed files keyed by the source file's content hash"""
+
+    def __init__(self, cache_dir, namespace, keep=3):
+        if pa is None:
+            raise ImportError("pyarrow is required for the parsed file cache (pip install pyarrow)")
+        self.directory = os.path.join(cache_dir, namespace)
+        self.keep = max(int(keep), 1)
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        os.makedirs(self.directory, exist_ok=True)
+
+    # === manifest ===
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'snapshots': [], 'ingested': None, 'download': {}}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def path_for(self, digest):
+        return os.path.join(self.directory, f'{digest}.arrow')
+
+    def hash_path_for(self, digest):
+        return os.path.join(self.directory, f'{digest}.rowhash')
+
+    def has(self, digest):
+        return os.path.exists(self.path_for(digest))
+
+    @property
+    def ingested_digest(self):
+        """Digest of the snapshot last handed to the DB writer"""
+        return self._load_manifest().get('ingested')
+
+    def mark_ingested(self, digest):
+        manifest = self._load_manifest()
+        manifest['ingested'] = digest
+        for snapshot in manifest['snapshots']:
+            if snapshot['digest'] == digest:
+                snapshot['ingested_at'] = datetime.now().isoformat(timespec='seconds')
+        self._save_manifest(manifest)
+
+    def download_validators(self, url):
+        """ETag / Last-Modified (and local path) stored for a download URL"""
+        return self._load_manifest().get('download', {}).get(url, {})
+
+    def save_download_validators(self, url, **validators):
+        manifest = self._load_manifest()
+        manifest.setdefault('download', {})[url] = validators
+        self._save_manifest(manifest)
+
+    # === snapshots ===
+
+    def put(self, digest, chunks, source=None):
+        """Write DataFrame chunks as the snapshot of `digest` (plus its row hashes) -> rows written"""
+        path = self.path_for(digest)
+        tmp_path, tmp_hash_path = path + '.tmp', self.hash_path_for(digest) + '.tmp'
+        rows, writer, schema = 0, None, None
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink, open(tmp_hash_path, 'wb') as hash_sink:
+                for df in chunks:
+                    if df.empty:
+                        continue
+                    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                    if writer is None:
+                        schema = table.schema
+                        writer = ipc.new_file(sink, schema)
+                    writer.write_table(table)
+                    # delta_batches와 같은 값으로 해시하도록 Arrow 왕복 후 계산
+                    hash_sink.write(row_hashes(table.to_pandas()).tobytes())
+                    rows += len(df)
+                if writer is not None:
+                    writer.close()
+        except Exception:
+            for leftover in (tmp_path, tmp_hash_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+        if writer is None:
+            # 빈 스냅샷은 저장하지 않음
+            os.remove(tmp_path)
+            os.remove(tmp_hash_path)
+            return 0
+        os.replace(tmp_hash_path, self.hash_path_for(digest))
+        os.replace(tmp_path, path)
+
+        manifest = self._load_manifest()
+        manifest['snapshots'] = [s for s in manifest['snapshots'] if s['digest'] != digest]
+        manifest['snapshots'].append({'digest': digest, 'source': source, 'rows': rows,
+                                      'created_at': datetime.now().isoformat(timespec='seconds')})
+        self._prune(manifest)
+        self._save_manifest(manifest)
+        logger.info(f"Parsed file cached: {os.path.basename(path)} ({rows} rows)")
+        return rows
+
+    def get(self, digest):
+        """Memory-mapped (zero-copy) Arrow table of a snapshot, or None"""
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            return None
+        return ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+    def _prune(self, manifest):
+        """Keep the newest `keep` snapshots plus the last ingested one"""
+        snapshots = manifest['snapshots']
+        keep = {s['digest'] for s in snapshots[-self.keep:]}
+        if manifest.get('ingested'):
+            keep.add(manifest['ingested'])
+        for snapshot in snapshots:
+            if snapshot['digest'] in keep:
+                continue
+            for path in (self.path_for(snapshot['digest']), self.hash_path_for(snapshot['digest'])):
+                if os.path.exists(path):
+                    os.remove(path)
+        manifest['snapshots'] = [s for s in snapshots if s['digest'] in keep]
+
+    def row_hash_set(self, digest, chunk_rows=DELTA_CHUNK_ROWS):
+        """Sorted unique row hashes of a snapshot (8 bytes per row), or None if it is gone.
+
+        Snapshots cached before row hashes existed are hashed once batch by batch
+        and the sidecar is written for next time.
+        """
+        hash_path = self.hash_path_for(digest)
+        if not os.path.exists(hash_path):
+            table = self.get(digest)
+            if table is None:
+                return None
+            tmp_path = hash_path + '.tmp'
+            with open(tmp_path, 'wb') as hash_sink:
+                for batch in table.to_batches(max_chunksize=chunk_rows):
+                    hash_sink.write(row_hashes(batch.to_pandas()).tobytes())
+            os.replace(tmp_path, hash_path)
+        return np.unique(np.fromfile(hash_path, dtype=np.uint64))
+
+    def delta_batches(self, current, previous_digest=None, chunk_rows=DELTA_CHUNK_ROWS, stats=None):
+        """Yield DataFrame chunks of `current` (Arrow table) whose rows are not in the previous snapshot.
+
+        Each batch is hashed and probed against the previous snapshot's sorted
+        row hashes, so memory is one batch plus 8 bytes per previous row. Rows
+        compare by value through a 64-bit hash. A missing previous snapshot or a
+        changed schema yields every row. `stats` (dict) receives 'rows' and 'changed'.
+        """
+        stats = stats if stats is not None else {}
+        stats.update(rows=0, changed=0)
+        previous = None
+        if previous_digest:
+            previous_table = self.get(previous_digest)
+            if previous_table is not None and previous_table.schema.names == current.schema.names:
+                previous = self.row_hash_set(previous_digest, chunk_rows)
+        for batch in current.to_batches(max_chunksize=chunk_rows):
+            df = batch.to_pandas()
+            stats['rows'] += len(df)
+            if previous is not None and len(previous):
+                hashes = row_hashes(df)
+                position = np.minimum(np.searchsorted(previous, hashes), len(previous) - 1)
+                df = df[previous[position] != hashes]
+            stats['changed'] += len(df)
+            if not df.empty:
+                yield df
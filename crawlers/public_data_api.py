@@ -0,0 +1,357 @@
+"""
+data.go.kr OpenAPI paging client
+- parse_envelope(): JSON / XML response envelope -> items, totalCount, resultCode
+  (item lists, single-item dicts, empty '' bodies and the OpenAPI_ServiceResponse
+  error envelope are all normalised)
+- QuotaLimiter: per-host token bucket + daily request quota of the service key
+- PagedApiClient: page 1 first, then the remaining ceil(totalCount / numOfRows)
+  pages concurrently (thread pool, or the aiohttp engine when one is given)
+
+    client = PagedApiClient(get_quota_limiter(url, rate=10, daily_quota=10000))
+    items = client.fetch_all(url, {'serviceKey': key, 'numOfRows': 1000, 'dataType': 'JSON'})
+"""
+import json
+import math
+import time
+import random
+import threading
+import logging
+import xml.etree.ElementTree as ET
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from crawlers.rate_limiter import get_host_limiter, host_of
+
+logger = logging.getLogger(__name__)
+
+SUCCESS_CODES = {'00', '0', '000', '0000', 'INFO-000'}
+# 22: LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR (일일 트래픽 초과)
+QUOTA_CODES = {'22'}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ApiError(Exception):
+    """Non-success resultCode in a data.go.kr envelope"""
+
+    def __init__(self, code, message=''):
+        super().__init__(f"resultCode {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+class QuotaExceededError(ApiError):
+    """Daily request quota of the service key is used up"""
+
+
+class ApiPage:
+    """One parsed response page"""
+
+    __slots__ = ('items', 'total_count', 'page_no', 'num_of_rows')
+
+    def __init__(self, items, total_count=None, page_no=None, num_of_rows=None):
+        self.items = items
+        self.total_count = total_count
+        self.page_no = page_no
+        self.num_of_rows = num_of_rows
+
+
+def _to_int(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _raise_for_code(code, message):
+    if code is None or str(code).strip() in SUCCESS_CODES:
+        return
+    code = str(code).strip()
+    if code in QUOTA_CODES:
+        raise QuotaExceededError(code, message)
+    raise ApiError(code, message)
+
+
+def _json_items(body):
+    items = body.get('items')
+    if isinstance(items, dict):
+        items = items.get('item', [])
+    if isinstance(items, dict):
+        # 결과가 1건이면 리스트가 아닌 객체로 내려옴
+        items = [items]
+    return items if isinstance(items, list) else []
+
+
+def _parse_json(data):
+    response = data.get('response', data)
+    header = response.get('header') or {}
+    _raise_for_code(header.get('resultCode'), header.get('resultMsg', ''))
+    body = response.get('body') or {}
+    return ApiPage(_json_items(body), _to_int(body.get('totalCount')),
+                   _to_int(body.get('pageNo')), _to_int(body.get('numOfRows')))
+
+
+def _parse_xml(text):
+    root = ET.fromstring(text)
+    # 인증키/트래픽 오류는 OpenAPI_ServiceResponse/cmmMsgHeader 봉투로 내려옴
+    reason = root.find('.//cmmMsgHeader')
+    if reason is not None:
+        _raise_for_code(reason.findtext('returnReasonCode'), reason.findtext('returnAuthMsg') or
+                        reason.findtext('errMsg') or '')
+    _raise_for_code(root.findtext('.//header/resultCode'), root.findtext('.//header/resultMsg') or '')
+    items = [{child.tag: child.text for child in item} for item in root.iter('item')]
+    return ApiPage(items, _to_int(root.findtext('.//body/totalCount')),
+                   _to_int(root.findtext('.//body/pageNo')), _to_int(root.findtext('.//body/numOfRows')))
+
+
+def parse_envelope(text, content_type=''):
+    """Response body -> ApiPage; raises ApiError / QuotaExceededError on error codes.
+
+    XML is detected from the body as well, because the gateway answers key and
+    quota errors in XML even when dataType=JSON was requested.
+    """
+    stripped = (text or '').lstrip()
+    if 'xml' in (content_type or '') or stripped.startswith('<'):
+        return _parse_xml(stripped)
+    return _parse_json(json.loads(stripped))
+
+
+class QuotaLimiter:
+    """Per-second token bucket plus a per-day request budget.
+
+    The daily count resets at local midnight (data.go.kr quotas are per
+    calendar day). exhaust() is called when the gateway itself reports the
+    quota as spent, so the remaining budget is never trusted over the server.
+    """
+
+    def __init__(self, bucket, daily_quota=None):
+        self.bucket = bucket
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._day = date.today()
+        self._used = 0
+
+    def _roll(self):
+        today = date.today()
+        if today != self._day:
+            self._day, self._used = today, 0
+
+    def remaining(self):
+        with self._lock:
+            self._roll()
+            return None if self.daily_quota is None else max(self.daily_quota - self._used, 0)
+
+    def reserve(self, count):
+        """Take up to `count` requests from today's budget -> number granted"""
+        with self._lock:
+            self._roll()
+            if self.daily_quota is None:
+                granted = count
+            else:
+                granted = max(min(count, self.daily_quota - self._used), 0)
+            self._used += granted
+            return granted
+
+    def acquire(self):
+        """One request: daily budget (raises when spent) then the rate bucket"""
+        if not self.reserve(1):
+            raise QuotaExceededError('22', 'daily request quota exhausted')
+        return self.bucket.acquire()
+
+    def exhaust(self):
+        with self._lock:
+            self._roll()
+            if self.daily_quota is not None:
+                self._used = self.daily_quota
+
+
+_quota_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def get_quota_limiter(url_or_host, rate, burst=1, daily_quota=None):
+    """Quota limiter shared per host (the rate bucket is the shared host limiter)"""
+    host = host_of(url_or_host)
+    with _registry_lock:
+        limiter = _quota_limiters.get(host)
+        if limiter is None:
+            limiter = QuotaLimiter(get_host_limiter(url_or_host, rate, burst), daily_quota)
+            _quota_limiters[host] = limiter
+        return limiter
+
+
+class PagedApiClient:
+    """Fetch every page of a data.go.kr list API under a QuotaLimiter"""
+
+    def __init__(self, limiter, max_workers=4, timeout=30, max_retries=2, max_pages=None,
+                 backoff_base=1.0, headers=None):
+        self.limiter = limiter
+        self.max_workers = max(int(max_workers), 1)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_pages = max_pages
+        self.backoff_base = backoff_base
+        self.headers = dict(headers or {})
+        self._thread_local = threading.local()
+        self.stats = {'requests': 0, 'pages': 0, 'failed_pages': 0, 'quota_skipped': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key, value=1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def _get_session(self):
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._thread_local.session = session
+        return session
+
+    def fetch_page(self, url, params, page_no=1):
+        """One page with retries on 429/5xx and connection errors -> ApiPage"""
+        params = {**params, 'pageNo': page_no}
+        error = None
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            self._count('requests')
+            try:
+                response = self._get_session().get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    page = parse_envelope(response.text, response.headers.get('content-type', ''))
+                    self._count('pages')
+                    return page
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except QuotaExceededError:
+                self.limiter.exhaust()
+                raise
+            if attempt < self.max_retries:
+                time.sleep(self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.0))
+        raise error
+
+    def _page_count(self, first, num_of_rows):
+        """Pages to fetch after page 1, capped by max_pages and today's quota"""
+        if not first.total_count or first.total_count <= len(first.items):
+            return 1
+        pages = math.ceil(first.total_count / max(num_of_rows, 1))
+        if self.max_pages:
+            pages = min(pages, self.max_pages)
+        return pages
+
+    def _reserve_pages(self, pages, url):
+        """Remaining budget decides how many of pages 2..N are requested"""
+        wanted = pages - 1
+        remaining = self.limiter.remaining()
+        if remaining is not None and remaining < wanted:
+            logger.warning(f"일일 호출 한도 부족: {wanted}페이지 중 {remaining}페이지만 조회 ({url})")
+            self._count('quota_skipped', wanted - remaining)
+            return list(range(2, 2 + remaining))
+        return list(range(2, pages + 1))
+
+    def fetch_all(self, url, params, num_of_rows=None):
+        """All items of a query in page order (pages 2..N fetched concurrently)"""
+        num_of_rows = num_of_rows or int(params.get('numOfRows', 1000))
+        params = {**params, 'numOfRows': num_of_rows}
+        first = self.fetch_page(url, params, 1)
+        pages = self._page_count(first, num_of_rows)
+        if pages <= 1:
+            return list(first.items)
+
+        page_numbers = self._reserve_pages(pages, url)
+        results = {1: first.items}
+
+        def fetch(page_no):
+            try:
+                return page_no, self.fetch_page(url, params, page_no).items
+            except QuotaExceededError:
+                self._count('quota_skipped')
+                return page_no, None
+            except Exception as e:
+                logger.error(f"페이지 조회 실패 (page {page_no}): {e}")
+                self._count('failed_pages')
+                return page_no, None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(page_numbers) or 1)) as pool:
+            for page_no, items in pool.map(fetch, page_numbers):
+                if items is not None:
+                    results[page_no] = items
+
+        missing = pages - len(results)
+        if missing:
+            logger.warning(f"누락 페이지 {missing}/{pages} (totalCount {first.total_count}): {url}")
+        return [item for page_no in sorted(results) for item in results[page_no]]
+
+    def fetch_all_many(self, url, param_list, engine=None, num_of_rows=None):
+        """fetch_all for several queries -> item lists in query order.
+
+        Without an engine each query runs fetch_all on a thread pool. With an
+        AsyncFetchEngine page 1 of every query goes out as one batch, then the
+        remaining pages of all queries as a second batch.
+        """
+        if engine is None:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(param_list) or 1)) as pool:
+                def fetch(params):
+                    try:
+                        return self.fetch_all(url, params, num_of_rows)
+                    except Exception as e:
+                        logger.error(f"API 조회 실패 {params}: {e}")
+                        return []
+                return list(pool.map(fetch, param_list))
+
+        param_list = [{**params, 'numOfRows': num_of_rows or int(params.get('numOfRows', 1000))}
+                      for params in param_list]
+        firsts = self._engine_pages(engine, url, [(params, 1) for params in param_list])
+        results = [{1: first.items} if first else {} for first in firsts]
+
+        follow_ups = []
+        for index, (params, first) in enumerate(zip(param_list, firsts)):
+            if first is not None:
+                page_total = self._page_count(first, params['numOfRows'])
+                follow_ups.extend((index, page_no) for page_no in range(2, page_total + 1))
+        granted = self.limiter.reserve(len(follow_ups))
+        if granted < len(follow_ups):
+            logger.warning(f"일일 호출 한도 부족: {len(follow_ups)}페이지 중 {granted}페이지만 조회 ({url})")
+            self._count('quota_skipped', len(follow_ups) - granted)
+            follow_ups = follow_ups[:granted]
+
+        pages = self._engine_pages(engine, url, [(param_list[index], page_no) for index, page_no in follow_ups],
+                                   reserved=True)
+        for (index, page_no), page in zip(follow_ups, pages):
+            if page is not None:
+                results[index][page_no] = page.items
+        return [[item for page_no in sorted(result) for item in result[page_no]] for result in results]
+
+    def _engine_pages(self, engine, url, requests_, reserved=False):
+        """(params, page_no) batch through the async engine -> ApiPage or None each"""
+        if not reserved:
+            granted = self.limiter.reserve(len(requests_))
+            if granted < len(requests_):
+                self._count('quota_skipped', len(requests_) - granted)
+                requests_ = requests_[:granted] + [None] * (len(requests_) - granted)
+        batch = [{'url': url, 'params': {**params, 'pageNo': page_no}} for params, page_no in filter(None, requests_)]
+        responses = iter(engine.fetch_all(batch))
+        pages = []
+        for request in requests_:
+            if request is None:
+                pages.append(None)
+                continue
+            response = next(responses)
+            self._count('requests')
+            try:
+                if not response.ok:
+                    raise ValueError(response.error or f"HTTP {response.status_code}")
+                pages.append(parse_envelope(response.text, response.headers.get('content-type', '')))
+                self._count('pages')
+            except QuotaExceededError:
+                self.limiter.exhaust()
+                self._count('quota_skipped')
+                pages.append(None)
+            except Exception as e:
+                logger.error(f"페이지 조회 실패 (page {request[1]}): {e}")
+                self._count('failed_pages')
+                pages.append(None)
+        return pages
@@ -5,26 +5,36 @@
 """
 import requests
 import pandas as pd
-import xml.etree.ElementTree as ET
-import json
 import logging
 from datetime import datetime, timedelta
 import sys
 import os
 import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db_helper import db_helper
+from crawlers.async_fetcher import build_engine
+from crawlers.registration_reader import iter_file_chunks, write_chunks, DEFAULT_CHUNK_ROWS
+from crawlers.parsed_file_cache import ParsedFileCache, file_digest
+from crawlers.public_data_api import PagedApiClient, get_quota_limiter, parse_envelope
+from crawlers.rate_limiter import host_of
+from config.config import DATA_FILES
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 정제 후 등록 데이터 표준 컬럼 (사전 변환 파일 / 청크 적재 공통)
+REGISTRATION_COLUMNS = ['manufacturer', 'model_name', 'region', 'registration_date',
+                        'registration_count', 'cumulative_count', 'fuel_type']
+
 class PublicDataCrawler:
     def __init__(self, config=None):
         self.config = config or {}
         
         #  실제 공공데이터포털 API 정보
-        self.base_url = "https://api.data.go.kr/openapi/service/rest"
+        self.base_url = self.config.get('base_url', "https://api.data.go.kr/openapi/service/rest")
         
         # API 키 설정 (환경변수 또는 설정에서 가져오기)
         self.api_key = self.config.get('api_key') or os.getenv('PUBLIC_DATA_API_KEY')
@@ -35,11 +45,33 @@ class PublicDataCrawler:
             logger.warning("   2. 환경변수 PUBLIC_DATA_API_KEY 설정")
             logger.warning("   3. 또는 config에 api_key 추가")
         
+        self.concurrent = self.config.get('concurrent', False)
+        self._fetch_engine = None
+        self.file_cache = self._build_file_cache()
+        self.num_of_rows = self.config.get('num_of_rows', 1000)
+        self.fuel_manufacturers = self.config.get('fuel_manufacturers', ['현대', '기아', '제네시스', 'BMW', '벤츠'])
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+        # 서비스 키의 초당 호출 수 + 일일 트래픽 한도 (같은 호스트 공유)
+        self.quota_limiter = get_quota_limiter(
+            self.base_url,
+            self.config.get('requests_per_second') or 10.0,
+            self.config.get('burst', 4),
+            self.config.get('daily_quota')
+        )
+        self.api_client = PagedApiClient(
+            self.quota_limiter,
+            max_workers=self.config.get('page_workers', 4),
+            timeout=self.config.get('timeout', 30),
+            max_retries=self.config.get('max_retries', 2),
+            max_pages=self.config.get('max_pages'),
+            headers=dict(self.session.headers)
+        )
+        
         #  실제 확인된 API 엔드포인트들
         self.endpoints = {
             'car_registration': f"{self.base_url}/CarRegistration",  # 자동차 등록 현황
@@ -47,132 +79,161 @@ class PublicDataCrawler:
             'fuel_efficiency': f"{self.base_url}/FuelEfficiency"    # 연비 정보
         }
 
+    def _build_file_cache(self):
+        """파싱 결과 캐시 (내용 해시 키, DATA_FILES['cache'] 아래 Arrow 스냅샷)"""
+        if not self.config.get('cache_enabled', True):
+            return None
+        try:
+            return ParsedFileCache(self.config.get('cache_dir', DATA_FILES['cache']), 'registration',
+                                   keep=self.config.get('cache_keep', 3))
+        except ImportError as e:
+            logger.warning(f"[WARNING] 파싱 캐시 비활성화: {e}")
+            return None
+
+    def _registration_params(self, year=None, month=None, region=None):
+        """등록 현황 API 요청 파라미터"""
+        #  실제 API 파라미터 구조
+        params = {
+            'serviceKey': self.api_key,
+            'pageNo': 1,
+            'numOfRows': self.num_of_rows,
+            'dataType': self.config.get('data_type', 'JSON')  # 또는 'XML'
+        }
+        
+        # 옵션 파라미터 추가
+        if year:
+            params['year'] = year
+        if month:
+            params['month'] = month  
+        if region:
+            params['region'] = region
+        return params
+
     def get_car_registration_stats(self, year=None, month=None, region=None):
-        """자동차 등록 현황 API 조회"""
+        """자동차 등록 현황 API 조회 (totalCount 기준 전체 페이지)"""
         if not self.api_key:
             logger.error("API 키가 필요합니다.")
             return []
         
         try:
-            #  실제 API 파라미터 구조
-            params = {
-                'serviceKey': self.api_key,
-                'pageNo': 1,
-                'numOfRows': 1000,
-                'dataType': 'JSON'  # 또는 'XML'
-            }
-            
-            # 옵션 파라미터 추가
-            if year:
-                params['year'] = year
-            if month:
-                params['month'] = month  
-            if region:
-                params['region'] = region
-            
             logger.info(f"자동차 등록 현황 API 호출: {year}-{month}, {region}")
-            
-            response = self.session.get(
-                self.endpoints['car_registration'],
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return self._parse_registration_response(response)
-            else:
-                logger.error(f"API 요청 실패: HTTP {response.status_code}")
-                logger.error(f"응답: {response.text[:200]}")
-                return []
+            items = self.api_client.fetch_all(self.endpoints['car_registration'],
+                                              self._registration_params(year, month, region))
+            registration_data = [self._registration_item(item) for item in items]
+            logger.info(f"파싱된 등록 데이터: {len(registration_data)}건")
+            return registration_data
                 
         except Exception as e:
             logger.error(f"등록 현황 API 오류: {e}")
             return []
 
+    def _get_fetch_engine(self):
+        if self._fetch_engine is None:
+            # 비동기 엔진도 서비스 키의 초당 호출 한도를 공유
+            self._fetch_engine = build_engine(self.config, headers=dict(self.session.headers),
+                                              rate_limiters={host_of(self.base_url): self.quota_limiter.bucket})
+        return self._fetch_engine
+
+    def _fetch_all_pages_many(self, endpoint, param_list):
+        """여러 쿼리의 전체 페이지 동시 조회 (concurrent면 비동기 엔진, 아니면 스레드 풀)"""
+        engine = self._get_fetch_engine() if self.concurrent else None
+        try:
+            return self.api_client.fetch_all_many(endpoint, param_list, engine=engine)
+        finally:
+            # 첫 페이지/후속 페이지 라운드가 같은 세션을 쓰고, 끝나면 연결 정리
+            if engine is not None:
+                engine.close()
+
+    def get_car_registration_stats_many(self, queries):
+        """등록 현황 API 동시 조회
+
+        queries: {'year', 'month', 'region'} dict 목록. 반환값은 쿼리별 결과 목록.
+        """
+        if not self.api_key:
+            logger.error("API 키가 필요합니다.")
+            return [[] for _ in queries]
+        
+        item_lists = self._fetch_all_pages_many(
+            self.endpoints['car_registration'],
+            [self._registration_params(**query) for query in queries]
+        )
+        return [[self._registration_item(item) for item in items] for items in item_lists]
+
+    @staticmethod
+    def _registration_item(item):
+        """등록 현황 API item (JSON/XML 공통 필드명) -> 등록 데이터 dict"""
+        return {
+            'region': item.get('region') or '전국',
+            'manufacturer': item.get('manufacturer') or '',
+            'model_name': item.get('modelName') or '',
+            'registration_count': int(item.get('registrationCount') or 0),
+            'cumulative_count': int(item.get('cumulativeCount') or 0),
+            'registration_date': item.get('registrationDate'),
+            'fuel_type': item.get('fuelType') or '가솔린'
+        }
+
     def _parse_registration_response(self, response):
-        """등록 현황 API 응답 파싱"""
+        """등록 현황 API 응답 파싱 (JSON / XML 봉투)"""
         try:
-            # JSON 응답 처리
-            if 'application/json' in response.headers.get('content-type', ''):
-                data = response.json()
-                
-                # 응답 구조 확인 (실제 API 응답에 따라 수정 필요)
-                if 'response' in data and 'body' in data['response']:
-                    items = data['response']['body'].get('items', [])
-                    
-                    registration_data = []
-                    for item in items:
-                        registration_data.append({
-                            'region': item.get('region', '전국'),
-                            'manufacturer': item.get('manufacturer', ''),
-                            'model_name': item.get('modelName', ''),
-                            'registration_count': int(item.get('registrationCount', 0)),
-                            'cumulative_count': int(item.get('cumulativeCount', 0)),
-                            'registration_date': item.get('registrationDate'),
-                            'fuel_type': item.get('fuelType', '가솔린')
-                        })
-                    
-                    logger.info(f"파싱된 등록 데이터: {len(registration_data)}건")
-                    return registration_data
-                    
-            # XML 응답 처리
-            elif 'application/xml' in response.headers.get('content-type', ''):
-                return self._parse_xml_response(response.text)
-            
-            else:
-                logger.error("지원되지 않는 응답 형식")
-                return []
+            page = parse_envelope(response.text, response.headers.get('content-type', ''))
+            registration_data = [self._registration_item(item) for item in page.items]
+            logger.info(f"파싱된 등록 데이터: {len(registration_data)}건")
+            return registration_data
                 
         except Exception as e:
             logger.error(f"응답 파싱 오류: {e}")
             logger.debug(f"응답 내용: {response.text[:500]}")
             return []
 
-    def _parse_xml_response(self, xml_text):
-        """XML 응답 파싱"""
-        try:
-            root = ET.fromstring(xml_text)
-            
-            registration_data = []
-            # XML 구조에 따라 수정 필요
-            for item in root.findall('.//item'):
-                registration_data.append({
-                    'region': item.find('region').text if item.find('region') is not None else '전국',
-                    'manufacturer': item.find('manufacturer').text if item.find('manufacturer') is not None else '',
-                    'model_name': item.find('modelName').text if item.find('modelName') is not None else '',
-                    'registration_count': int(item.find('registrationCount').text) if item.find('registrationCount') is not None else 0,
-                    'registration_date': item.find('registrationDate').text if item.find('registrationDate') is not None else str(datetime.now().date())
-                })
-            
-            return registration_data
-            
-        except ET.ParseError as e:
-            logger.error(f"XML 파싱 오류: {e}")
-            return []
-
     def download_registration_excel(self, save_path=None):
-        """자동차 등록 현황 엑셀 파일 다운로드 (파일 데이터 방식)"""
+        """자동차 등록 현황 엑셀 파일 다운로드 (파일 데이터 방식)
+
+        파일명은 내용 해시 기준이라 같은 파일은 한 번만 저장되고, 캐시가 있으면
+        ETag/Last-Modified 조건부 요청으로 변경이 없을 때 본문을 받지 않는다.
+        """
         try:
             #  실제 확인된 파일 다운로드 URL
             download_url = "https://www.data.go.kr/data/15024777/fileData.do"
             
             logger.info("자동차 등록 현황 엑셀 파일 다운로드 시작")
             
+            headers = {}
+            validators = self.file_cache.download_validators(download_url) if self.file_cache else {}
+            if validators.get('path') and os.path.exists(validators['path']):
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    headers['If-Modified-Since'] = validators['last_modified']
+            
             # 다운로드 요청 (실제로는 로그인이 필요할 수 있음)
-            response = self.session.get(download_url, timeout=60)
+            response = self.session.get(download_url, headers=headers, timeout=60)
+            
+            if response.status_code == 304:
+                logger.info(f" 변경 없음 (304), 기존 파일 사용: {validators['path']}")
+                return validators['path']
             
             if response.status_code == 200:
+                digest = hashlib.sha256(response.content).hexdigest()
                 if not save_path:
-                    save_path = f"data/cache/car_registration_{datetime.now().strftime('%Y%m%d')}.xlsx"
+                    save_path = os.path.join(DATA_FILES['cache'], f"car_registration_{digest[:16]}.xlsx")
                 
                 # 디렉토리 생성
                 os.makedirs(os.path.dirname(save_path), exist_ok=True)
                 
-                # 파일 저장
-                with open(save_path, 'wb') as f:
-                    f.write(response.content)
+                # 파일 저장 (같은 내용이면 생략)
+                if not os.path.exists(save_path) or file_digest(save_path) != digest:
+                    with open(save_path, 'wb') as f:
+                        f.write(response.content)
+                    logger.info(f" 파일 저장 완료: {save_path}")
+                else:
+                    logger.info(f" 동일한 파일이 이미 있음: {save_path}")
                 
-                logger.info(f" 파일 저장 완료: {save_path}")
+                if self.file_cache:
+                    self.file_cache.save_download_validators(
+                        download_url, path=save_path,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
                 return save_path
             else:
                 logger.error(f"파일 다운로드 실패: HTTP {response.status_code}")
@@ -182,30 +243,58 @@ class PublicDataCrawler:
             logger.error(f"엑셀 파일 다운로드 오류: {e}")
             return None
 
+    def _registration_file_path(self, file_path=None):
+        """등록 현황 파일 경로 (없으면 최신 파일 다운로드, 실패 시 설정 파일)"""
+        if not file_path:
+            # 먼저 최신 파일 다운로드 시도
+            file_path = self.download_registration_excel()
+            if not file_path:
+                # 기존 파일 사용
+                file_path = self.config.get('file_path', 'data/cache/car_registration_data.xlsx')
+        return file_path
+
+    def iter_registration_chunks(self, file_path, chunk_rows=None):
+        """등록 현황 파일(xlsx/csv/parquet)을 행 청크 단위로 읽어 정제된 DataFrame을 yield"""
+        chunk_rows = chunk_rows or self.config.get('read_chunk_rows', DEFAULT_CHUNK_ROWS)
+        max_sheets = self.config.get('max_sheets', 5)  # 최대 5개 시트만 처리
+        current_sheet = None
+        for sheet_name, chunk in iter_file_chunks(file_path, chunk_rows, max_sheets):
+            if sheet_name != current_sheet:
+                logger.info(f"시트 처리 중: {sheet_name}")
+                current_sheet = sheet_name
+            df = self._clean_registration_data(chunk, sheet_name)
+            if df.empty:
+                continue
+            # 청크마다 같은 컬럼/타입으로 맞춤
+            df = df.reindex(columns=REGISTRATION_COLUMNS)
+            for column in ('manufacturer', 'model_name', 'region', 'fuel_type'):
+                df[column] = df[column].astype('string')
+            df['registration_count'] = df['registration_count'].astype('int64')
+            df['cumulative_count'] = df['cumulative_count'].astype('int64')
+            yield df
+
     def load_registration_data(self, file_path=None):
-        """엑셀 파일에서 자동차 등록 현황 데이터 로드 (기존 기능 유지)"""
+        """엑셀/CSV/Parquet 파일에서 자동차 등록 현황 데이터 로드 (기존 기능 유지)
+
+        대용량 파일은 ingest_registration_file로 청크 단위 적재를 사용할 것
+        """
         try:
-            if not file_path:
-                # 먼저 최신 파일 다운로드 시도
-                file_path = self.download_registration_excel()
-                if not file_path:
-                    # 기존 파일 사용
-                    file_path = self.config.get('file_path', 'data/cache/car_registration_data.xlsx')
+            file_path = self._registration_file_path(file_path)
             
             if not os.path.exists(file_path):
                 logger.error(f"파일을 찾을 수 없습니다: {file_path}")
                 return pd.DataFrame()
 
             logger.info(f"📂 파일 로드 중: {file_path}")
-            excel_file = pd.ExcelFile(file_path)
-            all_data = []
-            
-            for sheet_name in excel_file.sheet_names[:5]:  # 최대 5개 시트만 처리
-                logger.info(f"시트 처리 중: {sheet_name}")
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                df = self._clean_registration_data(df, sheet_name)
-                if not df.empty:
-                    all_data.append(df)
+            if self.file_cache is not None:
+                table = self.cached_registration_table(file_path)
+                if table is None or table.num_rows == 0:
+                    logger.warning("유효한 데이터를 찾을 수 없습니다.")
+                    return pd.DataFrame()
+                combined_df = table.to_pandas()
+                logger.info(f" 총 {len(combined_df)}건의 등록 데이터 로드 완료 (캐시)")
+                return combined_df
+            all_data = list(self.iter_registration_chunks(file_path))
                     
             if all_data:
                 combined_df = pd.concat(all_data, ignore_index=True)
@@ -219,6 +308,87 @@ class PublicDataCrawler:
             logger.error(f"데이터 로드 실패: {e}")
             return pd.DataFrame()
 
+    def cached_registration_table(self, file_path, digest=None, chunk_rows=None):
+        """파일 내용 해시로 캐시된 정제 결과 (없으면 한 번 파싱해 저장) -> 메모리 매핑 Arrow 테이블"""
+        digest = digest or file_digest(file_path)
+        table = self.file_cache.get(digest)
+        if table is None:
+            logger.info(f"캐시 없음, 파일 파싱: {file_path}")
+            self.file_cache.put(digest, self.iter_registration_chunks(file_path, chunk_rows), source=file_path)
+            table = self.file_cache.get(digest)
+        else:
+            logger.info(f"캐시 사용 (파싱 생략): {digest[:16]}")
+        return table
+
+    def _write_registration_chunks(self, chunks, chunk_size=None, mode=None):
+        """정제된 청크를 model_id 매핑 후 bulk writer로 적재 -> 저장 건수"""
+        chunk_size = chunk_size or self.config.get('chunk_size')
+        mode = mode or self.config.get('ingest_mode', 'batch')
+        saved_count = 0
+        for df in chunks:
+            prepared = self.prepare_registration_frame(df)
+            stats = db_helper.upsert_registration_stats_frame(prepared, chunk_size=chunk_size, mode=mode)
+            saved_count += stats['rows']
+            logger.info(f"   청크 적재: {stats['rows']}건 (누적 {saved_count}건)")
+        return saved_count
+
+    def ingest_registration_file(self, file_path=None, chunk_rows=None, chunk_size=None, mode=None):
+        """등록 현황 파일을 청크 단위로 읽고 정제해 바로 DB에 적재 (메모리 사용량 일정)
+
+        파싱 캐시가 켜져 있으면 마지막으로 적재한 파일과 내용이 같을 때 아무것도 하지 않고,
+        다르면 이전 스냅샷 대비 새로 생기거나 바뀐 행만 적재한다.
+        """
+        db_helper.update_crawling_log('public_data', '시작')
+        saved_count = 0
+        
+        try:
+            file_path = self._registration_file_path(file_path)
+            if not os.path.exists(file_path):
+                logger.error(f"파일을 찾을 수 없습니다: {file_path}")
+                db_helper.update_crawling_log('public_data', '실패', 0, f"file not found: {file_path}")
+                return 0
+            
+            chunk_rows = chunk_rows or self.config.get('read_chunk_rows', DEFAULT_CHUNK_ROWS)
+            started = time.perf_counter()
+            logger.info(f"📂 파일 스트리밍 적재: {file_path}")
+            
+            if self.file_cache is None:
+                saved_count = self._write_registration_chunks(
+                    self.iter_registration_chunks(file_path, chunk_rows), chunk_size, mode)
+            else:
+                digest = file_digest(file_path)
+                ingested = self.file_cache.ingested_digest
+                if digest == ingested:
+                    logger.info(" 마지막 적재 이후 변경 없는 파일, 적재 생략")
+                    db_helper.update_crawling_log('public_data', '완료', 0)
+                    return 0
+                
+                table = self.cached_registration_table(file_path, digest, chunk_rows)
+                if table is not None:
+                    # 이전 스냅샷은 행 해시만 사용, 현재 스냅샷은 배치 단위로 비교하며 바로 적재
+                    delta_stats = {}
+                    saved_count = self._write_registration_chunks(
+                        self.file_cache.delta_batches(table, ingested, chunk_rows, stats=delta_stats),
+                        chunk_size, mode)
+                    logger.info(f" 이전 스냅샷 대비 변경 행: {delta_stats['changed']}/{delta_stats['rows']}건")
+                self.file_cache.mark_ingested(digest)
+            
+            elapsed = time.perf_counter() - started
+            db_helper.update_crawling_log('public_data', '완료', saved_count)
+            logger.info(f" {saved_count}건의 등록 데이터 적재 완료 ({elapsed:.1f}초)")
+            
+        except Exception as e:
+            db_helper.update_crawling_log('public_data', '실패', saved_count, str(e))
+            logger.error(f"등록 파일 적재 실패: {e}")
+        
+        return saved_count
+
+    def convert_registration_file(self, file_path, output_path, chunk_rows=None):
+        """등록 현황 파일을 정제된 Parquet/CSV로 한 번 변환 (이후 적재는 변환 파일 사용) -> 행 수"""
+        rows = write_chunks(self.iter_registration_chunks(file_path, chunk_rows), output_path)
+        logger.info(f" 등록 파일 변환 완료: {file_path} -> {output_path} ({rows}건)")
+        return rows
+
     def _clean_registration_data(self, df, sheet_name):
         """등록 데이터 정제 (기존 로직 유지)"""
         try:
@@ -260,129 +430,169 @@ class PublicDataCrawler:
             logger.error(f"데이터 정제 실패: {e}")
             return pd.DataFrame()
 
-    def save_registration_data_to_db(self, df):
-        """등록 데이터 DB 저장 (기존 로직 유지)"""
+    def prepare_registration_frame(self, df):
+        """정제된 등록 데이터에 model_id를 한 번에 매핑"""
+        name_columns = [c for c in ['manufacturer', 'model_name', 'fuel_type'] if c in df.columns]
+        names = df[name_columns].drop_duplicates(['manufacturer', 'model_name'])
+        model_ids = db_helper.resolve_car_models(names.to_dict('records'))
+        
+        id_frame = pd.DataFrame(
+            [(mf, mn, model_id) for (mf, mn), model_id in model_ids.items()],
+            columns=['manufacturer', 'model_name', 'model_id']
+        )
+        prepared = df.merge(id_frame, on=['manufacturer', 'model_name'], how='inner')
+        
+        prepared['registration_count'] = prepared['registration_count'].astype('int64')
+        if 'cumulative_count' in prepared.columns:
+            prepared['cumulative_count'] = prepared['cumulative_count'].fillna(prepared['registration_count']).astype('int64')
+        else:
+            prepared['cumulative_count'] = prepared['registration_count']
+        if 'region' not in prepared.columns:
+            prepared['region'] = '전국'
+        prepared['fuel_type'] = prepared['fuel_type'].fillna('') if 'fuel_type' in prepared.columns else ''
+        
+        dropped = len(df) - len(prepared)
+        if dropped:
+            logger.warning(f"모델 ID를 찾지 못한 {dropped}건 제외")
+        # 한 문장 안에서 같은 키의 행이 서로 덮어쓰지 않도록 키 단위로 합산
+        return prepared.groupby(['model_id', 'region', 'registration_date', 'fuel_type'], as_index=False,
+                                sort=False, dropna=False)[['registration_count', 'cumulative_count']].sum()
+
+    def save_registration_data_to_db(self, df, chunk_size=None, mode=None):
+        """등록 데이터 DB 저장 (청크 단위 다중 행 upsert 또는 LOAD DATA LOCAL INFILE)"""
         db_helper.update_crawling_log('public_data', '시작')
         saved_count = 0
         
         try:
-            for _, row in df.iterrows():
-                model_id = db_helper.get_or_insert_car_model(
-                    row['manufacturer'], 
-                    row['model_name'], 
-                    row.get('fuel_type')
-                )
-                
-                if model_id:
-                    db_helper.insert_registration_stats(
-                        model_id=model_id,
-                        region=row['region'],
-                        registration_date=row['registration_date'],
-                        registration_count=int(row['registration_count']),
-                        cumulative_count=int(row.get('cumulative_count', row['registration_count']))
-                    )
-                    saved_count += 1
+            chunk_size = chunk_size or self.config.get('chunk_size')
+            mode = mode or self.config.get('ingest_mode', 'batch')
+            prepared = self.prepare_registration_frame(df)
+            stats = db_helper.upsert_registration_stats_frame(prepared, chunk_size=chunk_size, mode=mode)
+            saved_count = stats['rows']
                     
             db_helper.update_crawling_log('public_data', '완료', saved_count)
-            logger.info(f" {saved_count}건의 등록 데이터 저장 완료")
+            logger.info(f" {saved_count}건의 등록 데이터 저장 완료 [{stats['mode']}] "
+                        f"({stats['elapsed']:.1f}초, {stats['rows_per_sec']:.0f}건/초)")
             
         except Exception as e:
             db_helper.update_crawling_log('public_data', '실패', saved_count, str(e))
             logger.error(f"데이터베이스 저장 실패: {e}")
+        
+        return saved_count
+
+    def _fuel_efficiency_params(self, manufacturer=None, year=None):
+        """연비 정보 API 요청 파라미터"""
+        params = {
+            'serviceKey': self.api_key,
+            'pageNo': 1,
+            'numOfRows': self.num_of_rows,
+            'dataType': self.config.get('data_type', 'JSON')
+        }
+        
+        if manufacturer:
+            params['manufacturer'] = manufacturer
+        if year:
+            params['year'] = year
+        return params
+
+    @staticmethod
+    def _fuel_efficiency_item(item, year=None):
+        """연비 정보 API item -> 연비 데이터 dict"""
+        return {
+            'manufacturer': item.get('manufacturer') or '',
+            'model_name': item.get('modelName') or '',
+            'year': int(item.get('year') or year) if (item.get('year') or year) else None,
+            'displacement': int(item.get('displacement') or 0),
+            'city_efficiency': float(item.get('cityEfficiency') or 0),
+            'highway_efficiency': float(item.get('highwayEfficiency') or 0),
+            'combined_efficiency': float(item.get('combinedEfficiency') or 0),
+            'fuel_type': item.get('fuelType') or '가솔린'
+        }
+
+    def _parse_fuel_efficiency_response(self, response, year=None):
+        """연비 정보 API 응답 파싱 (JSON / XML 봉투)"""
+        page = parse_envelope(response.text, response.headers.get('content-type', ''))
+        fuel_data = [self._fuel_efficiency_item(item, year) for item in page.items]
+        logger.info(f"수집된 연비 데이터: {len(fuel_data)}건")
+        return fuel_data
 
     def get_fuel_efficiency_data(self, manufacturer=None, year=None):
-        """한국에너지공단 연비 정보 API 조회"""
+        """한국에너지공단 연비 정보 API 조회 (totalCount 기준 전체 페이지)"""
         if not self.api_key:
             logger.error("API 키가 필요합니다.")
             return []
         
         try:
-            params = {
-                'serviceKey': self.api_key,
-                'pageNo': 1,
-                'numOfRows': 100,
-                'dataType': 'JSON'
-            }
-            
-            if manufacturer:
-                params['manufacturer'] = manufacturer
-            if year:
-                params['year'] = year
-            
             logger.info(f"연비 정보 API 호출: {manufacturer} {year}")
-            
-            response = self.session.get(
-                self.endpoints['fuel_efficiency'],
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'response' in data and 'body' in data['response']:
-                    items = data['response']['body'].get('items', [])
-                    
-                    fuel_data = []
-                    for item in items:
-                        fuel_data.append({
-                            'manufacturer': item.get('manufacturer', ''),
-                            'model_name': item.get('modelName', ''),
-                            'year': item.get('year', year),
-                            'city_efficiency': float(item.get('cityEfficiency', 0)),
-                            'highway_efficiency': float(item.get('highwayEfficiency', 0)),
-                            'combined_efficiency': float(item.get('combinedEfficiency', 0)),
-                            'fuel_type': item.get('fuelType', '가솔린')
-                        })
-                    
-                    logger.info(f"수집된 연비 데이터: {len(fuel_data)}건")
-                    return fuel_data
-            
-            return []
+            items = self.api_client.fetch_all(self.endpoints['fuel_efficiency'],
+                                              self._fuel_efficiency_params(manufacturer, year))
+            fuel_data = [self._fuel_efficiency_item(item, year) for item in items]
+            logger.info(f"수집된 연비 데이터: {len(fuel_data)}건")
+            return fuel_data
             
         except Exception as e:
             logger.error(f"연비 정보 API 오류: {e}")
             return []
 
+    def get_fuel_efficiency_many(self, manufacturers, year=None):
+        """제조사별 연비 정보 API 동시 조회 (제조사 순서대로 결과 반환)"""
+        if not self.api_key:
+            logger.error("API 키가 필요합니다.")
+            return [[] for _ in manufacturers]
+        
+        item_lists = self._fetch_all_pages_many(
+            self.endpoints['fuel_efficiency'],
+            [self._fuel_efficiency_params(manufacturer, year) for manufacturer in manufacturers]
+        )
+        return [[self._fuel_efficiency_item(item, year) for item in items] for items in item_lists]
+
+    def _collect_registration(self):
+        """등록 현황 수집 + 저장 -> 저장 건수"""
+        logger.info("=== 자동차 등록 현황 수집 ===")
+        if not self.api_key:
+            # 엑셀(또는 변환된 CSV/Parquet) 파일을 청크 단위로 적재
+            return self.ingest_registration_file()
+        
+        current_year = datetime.now().year
+        saved = 0
+        for year_data in self.get_car_registration_stats_many([{'year': current_year},
+                                                               {'year': current_year - 1}]):
+            if year_data:
+                saved += self.save_registration_data_to_db(pd.DataFrame(year_data))
+        return saved
+
+    def _collect_fuel_efficiency(self, year=None):
+        """제조사별 연비 정보 수집 + 일괄 저장 -> 저장 건수"""
+        logger.info("=== 연비 정보 수집 ===")
+        year = year or self.config.get('fuel_year') or datetime.now().year
+        fuel_data = [row for rows in self.get_fuel_efficiency_many(self.fuel_manufacturers, year=year)
+                     for row in rows]
+        return self._save_fuel_efficiency_to_db(fuel_data) if fuel_data else 0
+
     def crawl_and_save_all(self):
-        """모든 공공데이터 수집 및 저장"""
+        """모든 공공데이터 수집 및 저장 (등록 현황 / 연비 정보 병렬 수집)"""
         db_helper.update_crawling_log('public_data_comprehensive', '시작')
         total_saved = 0
         
         try:
-            # 1. 등록 현황 데이터 수집
-            logger.info("=== 자동차 등록 현황 수집 ===")
-            
+            jobs = [self._collect_registration]
             if self.api_key:
-                # API를 통한 수집 시도
-                current_year = datetime.now().year
-                for year in [current_year, current_year - 1]:
-                    year_data = self.get_car_registration_stats(year=year)
-                    if year_data:
-                        df = pd.DataFrame(year_data)
-                        self.save_registration_data_to_db(df)
-                        total_saved += len(df)
-            else:
-                # 엑셀 파일을 통한 수집
-                df = self.load_registration_data()
-                if not df.empty:
-                    self.save_registration_data_to_db(df)
-                    total_saved += len(df)
-            
-            # 2. 연비 정보 수집 (API 키가 있는 경우)
-            if self.api_key:
-                logger.info("=== 연비 정보 수집 ===")
-                manufacturers = ['현대', '기아', '제네시스', 'BMW', '벤츠']
-                
-                for manufacturer in manufacturers:
-                    fuel_data = self.get_fuel_efficiency_data(manufacturer=manufacturer, year=2024)
-                    if fuel_data:
-                        self._save_fuel_efficiency_to_db(fuel_data)
-                        total_saved += len(fuel_data)
-                    time.sleep(1)  # API 호출 간격
+                jobs.append(self._collect_fuel_efficiency)
+            
+            # 두 수집은 서로 독립적이므로 동시에 실행 (호출 속도는 공유 QuotaLimiter가 제한)
+            with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+                futures = [pool.submit(job) for job in jobs]
+                errors = []
+                for future in futures:
+                    try:
+                        total_saved += future.result()
+                    except Exception as e:
+                        errors.append(e)
+            if errors:
+                raise errors[0]
             
             db_helper.update_crawling_log('public_data_comprehensive', '완료', total_saved)
-            logger.info(f"🎉 공공데이터 수집 완료! 총 {total_saved}건")
+            logger.info(f"🎉 공공데이터 수집 완료! 총 {total_saved}건 (API 호출 {self.api_client.stats['requests']}회)")
             
         except Exception as e:
             db_helper.update_crawling_log('public_data_comprehensive', '실패', total_saved, str(e))
@@ -391,22 +601,35 @@ class PublicDataCrawler:
         return total_saved
 
     def _save_fuel_efficiency_to_db(self, fuel_data):
-        """연비 정보 DB 저장"""
+        """연비 정보 DB 저장 (모델 일괄 매핑 + FuelEfficiency 다중 행 upsert) -> 저장 건수"""
         try:
-            for data in fuel_data:
-                model_id = db_helper.get_or_insert_car_model(
-                    data['manufacturer'],
-                    data['model_name'],
-                    fuel_type=data.get('fuel_type')
-                )
-                
-                if model_id:
-                    # 연비 정보를 별도 테이블에 저장하거나 CarModel 테이블에 업데이트
-                    # 현재는 로그만 출력 (실제 DB 스키마에 연비 컬럼 추가 필요)
-                    logger.info(f"연비 정보: {data['manufacturer']} {data['model_name']} - 복합연비 {data['combined_efficiency']}km/L")
+            df = pd.DataFrame(fuel_data)
+            df = df[(df['manufacturer'] != '') & (df['model_name'] != '') & df['year'].notna()]
+            if df.empty:
+                return 0
+            
+            names = df[['manufacturer', 'model_name', 'fuel_type']].drop_duplicates(['manufacturer', 'model_name'])
+            model_ids = db_helper.resolve_car_models(names.to_dict('records'))
+            df['model_id'] = [model_ids.get(key) for key in zip(df['manufacturer'], df['model_name'])]
+            
+            prepared = df[df['model_id'].notna()].rename(columns={'year': 'model_year'})
+            prepared = prepared.astype({'model_id': 'int64', 'model_year': 'int64'})
+            prepared['source'] = 'data.go.kr'
+            prepared['collected_date'] = datetime.now().date()
+            # 같은 키 (모델/연식/연료/배기량)가 여러 번 오면 마지막 값만 저장
+            prepared = prepared.drop_duplicates(['model_id', 'model_year', 'fuel_type', 'displacement'], keep='last')
+            
+            dropped = len(df) - len(prepared)
+            if dropped:
+                logger.warning(f"모델 ID 미확인/중복 연비 데이터 {dropped}건 제외")
+            
+            stats = db_helper.upsert_fuel_efficiency_frame(prepared)
+            logger.info(f" 연비 정보 {stats['rows']}건 저장 ({stats['elapsed']:.1f}초)")
+            return stats['rows']
                     
         except Exception as e:
             logger.error(f"연비 정보 저장 오류: {e}")
+            return 0
 
     def test_api_connection(self):
         """API 연결 테스트"""
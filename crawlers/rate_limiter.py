@@ -0,0 +1,75 @@
+"""
+Token-bucket rate limiter shared per host
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket (rate tokens/sec, up to capacity tokens of burst)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        if not self.rate > 0 or self.rate == float('inf'):
+            raise ValueError(f"rate must be a positive finite number of tokens/sec, got {rate!r}")
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def _check_tokens(self, tokens):
+        if not 0 < tokens <= self.capacity:
+            raise ValueError(f"tokens must be in (0, {self.capacity}], got {tokens!r}")
+
+    def try_acquire(self, tokens=1):
+        """Take tokens without waiting; returns seconds to wait if not available (0 = acquired)"""
+        self._check_tokens(tokens)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available; returns the time spent waiting"""
+        self._check_tokens(tokens)
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+_host_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def host_of(url_or_host):
+    parsed = urlparse(url_or_host)
+    return parsed.netloc or parsed.path
+
+
+def get_host_limiter(url_or_host, rate, burst=1):
+    """Return the limiter shared by every crawler talking to the same host.
+
+    The first caller's rate/burst wins so that several crawler instances
+    cannot multiply the request budget for one site.
+    """
+    host = host_of(url_or_host)
+    with _registry_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _host_limiters[host] = limiter
+        return limiter
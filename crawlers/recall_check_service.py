@@ -0,0 +1,291 @@
+"""
+차량번호/차대번호 대량 리콜 확인 서비스
+- 스레드 풀 + 호스트 공유 토큰 버킷으로 동시 조회
+- 모델 + 생산일(또는 연식)이 주어지면 RecallApplicabilityIndex로 먼저 판정해
+  해당 리콜이 없는 차량은 네트워크 없이 응답 (생산 시점부터 리콜 목록이 빠짐없이 수집된 경우만)
+- TTL 이내에 확인한 식별자는 car_recall_history (식별자, check_date) 인덱스로 건너뜀
+- 결과는 배치 단위 bulk upsert, 진행 상황은 iter_check 제너레이터 / progress 콜백으로 전달
+
+    checker = BulkRecallChecker()
+    stats = checker.check_many(open('plates.txt', encoding='utf-8'), progress=print)
+    stats = checker.check_many([{'car_number': '12가3456', 'manufacturer': '현대',
+                                 'model_name': '아반떼', 'production_date': '2020-05-01'}])
+"""
+import re
+import sys
+import os
+import time
+import random
+import threading
+import logging
+from datetime import datetime, timedelta, date
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import CRAWLING_CONFIG
+from database.db_helper import db_helper
+from database.recall_applicability import RecallApplicabilityIndex
+from crawlers.recall_crawler import RecallCrawler
+from crawlers.rate_limiter import get_host_limiter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 차대번호: 17자리 (I, O, Q 제외)
+VIN_RE = re.compile(r'^[A-HJ-NPR-Z0-9]{17}$')
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def normalize_identifier(value):
+    """공백/하이픈 제거, 영문 대문자화 (빈 값이면 None)"""
+    identifier = re.sub(r'[\s-]+', '', str(value or '')).upper()
+    return identifier or None
+
+
+def identifier_kind(identifier):
+    """'vin' 또는 'car_number'"""
+    return 'vin' if VIN_RE.match(identifier) else 'car_number'
+
+
+class BulkRecallChecker:
+    """식별자 목록을 동시에 조회해 car_recall_history에 일괄 저장"""
+
+    def __init__(self, config=None, crawler=None):
+        self.config = {**CRAWLING_CONFIG.get('recall_check', {}), **(config or {})}
+        self.crawler = crawler or RecallCrawler({**CRAWLING_CONFIG.get('recall', {}), **(config or {})})
+
+        self.max_workers = max(int(self.config.get('max_workers', 4)), 1)
+        self.ttl_days = self.config.get('ttl_days', 7)
+        self.write_batch_size = self.config.get('write_batch_size', 500)
+        self.lookup_batch_size = self.config.get('lookup_batch_size', 1000)
+        self.progress_every = self.config.get('progress_every', 100)
+        self.max_retries = self.config.get('max_retries', 3)
+        self.timeout = self.config.get('timeout', 30)
+        self.use_index = self.config.get('use_index', True)
+        self.recall_index = RecallApplicabilityIndex(
+            db_helper, max_age=self.config.get('index_max_age', 3600),
+            coverage_max_age_days=self.config.get('coverage_max_age_days', 7)
+        )
+
+        # 같은 호스트를 쓰는 RecallCrawler와 토큰 버킷 공유
+        self.rate_limiter = get_host_limiter(
+            self.crawler.base_url,
+            self.config.get('requests_per_second') or 1.0,
+            self.config.get('burst', 1)
+        )
+        self._thread_local = threading.local()
+
+    def _get_session(self):
+        """스레드별 세션 (크롤러 세션의 헤더 복사)"""
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.crawler.session.headers)
+            self._thread_local.session = session
+        return session
+
+    def check_one(self, identifier, kind=None):
+        """식별자 하나 조회 -> 결과 목록 (요청 실패 시 예외)"""
+        kind = kind or identifier_kind(identifier)
+        form_data = (self.crawler._vin_form_data(vin=identifier) if kind == 'vin'
+                     else self.crawler._vin_form_data(car_number=identifier))
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self._get_session().post(self.crawler.vin_check_url, data=form_data,
+                                                    timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return self.crawler._parse_vin_check(response.text, identifier)
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < self.max_retries:
+                time.sleep(min(self.crawler.delay * (2 ** attempt), 30) * random.uniform(0.5, 1.0))
+        raise error
+
+    def _unique(self, identifiers):
+        """정규화 + 중복 제거 (입력 순서 유지, 스트리밍) -> (identifier, kind, vehicle)
+
+        항목은 식별자 문자열 또는 car_number/vin과 model_id(또는 manufacturer/model_name),
+        production_date/model_year를 담은 dict
+        """
+        seen = set()
+        for value in identifiers:
+            vehicle = value if isinstance(value, dict) else None
+            identifier = normalize_identifier(vehicle.get('car_number') or vehicle.get('vin') if vehicle else value)
+            if identifier and identifier not in seen:
+                seen.add(identifier)
+                yield identifier, identifier_kind(identifier), vehicle
+
+    def _from_index(self, vehicle):
+        """저장된 리콜 기준 해당 리콜 목록
+
+        모델/생산 시점 정보가 없거나, 해당 리콜이 없는데 그 생산 시점 이후 리콜이 저장소에
+        빠짐없이 수집돼 있지 않으면 None (실제 조회로 넘김)
+        """
+        if not self.use_index or not vehicle:
+            return None
+        production_date = vehicle.get('production_date')
+        if isinstance(production_date, str):
+            try:
+                production_date = datetime.strptime(production_date[:10], '%Y-%m-%d').date()
+            except ValueError:
+                production_date = None
+        elif isinstance(production_date, datetime):
+            production_date = production_date.date()
+        model_year = vehicle.get('model_year')
+        if not isinstance(production_date, date) and not model_year:
+            return None
+
+        model_id = vehicle.get('model_id')
+        if not model_id and vehicle.get('manufacturer') and vehicle.get('model_name'):
+            model_id = db_helper.model_resolver.lookup(vehicle['manufacturer'], vehicle['model_name'])
+        if not model_id:
+            return None
+        recalls = self.recall_index.applicable(model_id, production_date, model_year)
+        if not recalls and not self.recall_index.covers(production_date, model_year):
+            return None
+        return recalls
+
+    def _recently_checked(self, batch, ttl_days):
+        """배치 중 TTL 이내에 확인된 식별자"""
+        if not ttl_days:
+            return set()
+        since = datetime.now().date() - timedelta(days=ttl_days)
+        checked = set()
+        for kind in ('car_number', 'vin'):
+            identifiers = [identifier for identifier, k, _ in batch if k == kind]
+            if identifiers:
+                checked |= db_helper.get_recently_checked(identifiers, since, column=kind)
+        return checked
+
+    def _run(self, identifier, kind, applicable=None):
+        try:
+            return {'identifier': identifier, 'kind': kind, 'status': 'checked',
+                    'results': self.check_one(identifier, kind), 'applicable': applicable}
+        except Exception as e:
+            return {'identifier': identifier, 'kind': kind, 'status': 'failed', 'results': [],
+                    'applicable': applicable, 'error': str(e)}
+
+    def iter_check(self, identifiers, ttl_days=None):
+        """식별자를 동시에 조회하며 완료되는 순서대로 결과를 yield
+
+        결과 dict: identifier, kind, status ('checked' / 'cached' / 'skipped' / 'failed'),
+        results, applicable (인덱스 기준 해당 리콜, 판정 불가면 None)[, error]
+        인덱스상 해당 리콜이 없고 생산 시점 이후 리콜이 빠짐없이 수집된 차량은 'cached'(NotSubject)로
+        바로 응답하고, 나머지는 TTL이 지난 경우 실제 조회로 리콜 여부/조치 여부를 확인한다.
+        입력은 lookup_batch_size 단위로 읽고 동시 요청은 max_workers * 2개로 제한하므로
+        큰 파일/제너레이터도 메모리에 모두 올리지 않는다.
+        """
+        ttl_days = self.ttl_days if ttl_days is None else ttl_days
+        unique = self._unique(identifiers)
+        max_in_flight = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = set()
+            while True:
+                batch = list(islice(unique, self.lookup_batch_size))
+                if not batch:
+                    break
+                applicable = {identifier: self._from_index(vehicle) for identifier, _, vehicle in batch}
+                for identifier, kind, _ in batch:
+                    if applicable[identifier] == []:
+                        yield {'identifier': identifier, 'kind': kind, 'status': 'cached',
+                               'results': [{'status': 'NotSubject', 'car_identifier': identifier}],
+                               'applicable': []}
+                batch = [entry for entry in batch if applicable[entry[0]] != []]
+                recent = self._recently_checked(batch, ttl_days)
+                for identifier, kind, _ in batch:
+                    if identifier in recent:
+                        yield {'identifier': identifier, 'kind': kind, 'status': 'skipped', 'results': [],
+                               'applicable': applicable[identifier]}
+                        continue
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                    in_flight.add(executor.submit(self._run, identifier, kind, applicable[identifier]))
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    @staticmethod
+    def _history_rows(outcome, check_date):
+        """조회 결과 -> car_recall_history 행 (결과가 없어도 확인 이력 1행)"""
+        identifier_column = 'vin' if outcome['kind'] == 'vin' else 'car_number'
+        results = outcome['results'] or [{'status': 'NoResult'}]
+        return [{
+            identifier_column: outcome['identifier'],
+            'recall_status': result.get('status', 'Unknown'),
+            'check_date': check_date,
+            'notes': result.get('recall_reason') or result.get('recall_content', '')
+        } for result in results]
+
+    def _flush(self, rows, stats):
+        if rows:
+            db_helper.insert_car_recall_checks(rows, chunk_size=self.write_batch_size)
+            stats['saved'] += len(rows)
+            rows.clear()
+
+    def check_many(self, identifiers, ttl_days=None, save=True, progress=None):
+        """식별자 목록 일괄 확인 -> 통계 dict
+
+        progress: progress_every건마다 (그리고 마지막에) 통계 dict로 호출되는 콜백
+        save=False면 DB에 쓰지 않는다 (ttl_days=0과 함께 쓰면 DB 없이 동작).
+        """
+        stats = {'processed': 0, 'checked': 0, 'cached': 0, 'skipped': 0, 'failed': 0,
+                 'recalls': 0, 'outstanding': 0, 'saved': 0, 'elapsed': 0.0}
+        started = time.perf_counter()
+        check_date = datetime.now().date()
+        pending = []
+
+        for outcome in self.iter_check(identifiers, ttl_days):
+            stats['processed'] += 1
+            stats[outcome['status']] += 1
+            if outcome['status'] == 'failed':
+                logger.warning(f"리콜 확인 실패: {outcome['identifier']} - {outcome.get('error')}")
+            elif outcome['status'] == 'checked':
+                recalls = [r for r in outcome['results'] if r.get('status') != 'NotSubject']
+                stats['recalls'] += len(recalls)
+                stats['outstanding'] += sum(1 for r in recalls if r.get('status') == 'Outstanding')
+                if save:
+                    pending.extend(self._history_rows(outcome, check_date))
+                    if len(pending) >= self.write_batch_size:
+                        self._flush(pending, stats)
+
+            if stats['processed'] % self.progress_every == 0:
+                stats['elapsed'] = time.perf_counter() - started
+                logger.info(f"리콜 확인 진행: {stats['processed']}건 (조회 {stats['checked']}, "
+                            f"인덱스 {stats['cached']}, 건너뜀 {stats['skipped']}, 실패 {stats['failed']})")
+                if progress:
+                    progress(dict(stats))
+
+        if save:
+            self._flush(pending, stats)
+        stats['elapsed'] = time.perf_counter() - started
+        logger.info(f"리콜 확인 완료: {stats}")
+        if progress and stats['processed'] % self.progress_every:
+            progress(dict(stats))
+        return stats
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='차량번호/차대번호 대량 리콜 확인')
+    parser.add_argument('file', help='한 줄에 하나씩 차량번호 또는 차대번호가 적힌 파일')
+    parser.add_argument('--ttl-days', type=int, default=None, help='이 기간 내 확인한 식별자는 건너뜀')
+    parser.add_argument('--no-save', action='store_true', help='DB에 저장하지 않음')
+    parser.add_argument('--base-url', default=None, help='조회 대상 서버 (예: 로컬 스텁 서버)')
+    args = parser.parse_args()
+
+    checker = BulkRecallChecker({'base_url': args.base_url} if args.base_url else None)
+    with open(args.file, encoding='utf-8') as f:
+        checker.check_many(f, ttl_days=args.ttl_days, save=not args.no_save)
@@ -4,7 +4,6 @@
 - 리콜 현황 및 차대번호 조회 기능 구현
 """
 import requests
-from bs4 import BeautifulSoup
 import time
 import logging
 import pandas as pd
@@ -16,22 +15,38 @@ from urllib.parse import urljoin, urlencode
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db_helper import db_helper
+from crawlers.async_fetcher import build_engine
+from crawlers.html_parser import compile_selectors, get_parser
+from analyzers.severity_classifier import SeverityClassifier
+from crawlers.rate_limiter import get_host_limiter, host_of
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 리콜 목록 행 / 차량별 조회 결과 영역 선택자
+RECALL_ROW_SELECTORS = compile_selectors('tr:has(td), li.recall-item')
+VIN_RESULT_SELECTORS = compile_selectors('div.search-result, div.result-area, table.result-table')
+# 생산기간: 2019.03.15 ~ 2020.12.31 (셀 텍스트가 붙어 있어도 날짜 자릿수까지만 매칭)
+_PERIOD_DATE = r'(?:19|20)\d{2}\s*(?:[.\-/]|년)\s*\d{1,2}(?:\s*(?:[.\-/]|월)\s*\d{1,2}\s*일?|\s*월)?'
+PRODUCTION_PERIOD_RE = re.compile(
+    rf'생산기간\s*:?\s*({_PERIOD_DATE}\s*(?:~|～)\s*(?:{_PERIOD_DATE})?)'
+)
+
 class RecallCrawler:
     def __init__(self, config=None):
         self.config = config or {}
         
         #  실제 확인된 URL 구조
-        self.base_url = "https://www.car.go.kr"
+        self.base_url = self.config.get('base_url', "https://www.car.go.kr")
         self.recall_list_url = f"{self.base_url}/ri/stat/list.do"
         self.recall_detail_url = f"{self.base_url}/ri/stat/detail.do"
         self.vin_check_url = f"{self.base_url}/ri/recall/list.do"
         
         self.delay = self.config.get('delay', 2)
         self.max_retries = self.config.get('max_retries', 3)
+        self.concurrent = self.config.get('concurrent', False)
+        self._fetch_engine = None
+        self.html_parser = get_parser(self.config.get('html_parser'))
         
         self.session = requests.Session()
         self.session.headers.update({
@@ -43,55 +58,96 @@ class RecallCrawler:
             'Upgrade-Insecure-Requests': '1'
         })
         
-        #  실제 확인된 심각도 키워드
-        self.severity_keywords = {
-            '매우심각': ['화재', '폭발', '사망', '중상', '에어백', '브레이크', '조향장치', '급가속', '급정지'],
-            '심각': ['엔진', '변속기', '연료', '배출가스', '전기계통', '타이어', '서스펜션'],
-            '보통': ['누수', '소음', '진동', '센서', '램프', '계기판', '공조장치'],
-            '경미': ['도색', '내장재', '편의장치', '오디오', '네비게이션', 'USB']
+        # 심각도 분류기 (키워드는 CRAWLING_CONFIG['recall']['severity_keywords'] 공유)
+        self.severity_classifier = SeverityClassifier(self.config.get('severity_keywords'))
+
+    def _recall_list_params(self, page=1, manufacturer=None):
+        """리콜 현황 목록 요청 파라미터"""
+        #  실제 사이트에서 확인된 파라미터 구조
+        return {
+            'pageIndex': page,
+            'pageSize': 20,
+            'searchCondition': '1',  # 검색 조건 (제조사명)
+            'searchKeyword': manufacturer if manufacturer else '',
+            'orderBy': 'RECALL_DATE DESC'
         }
 
+    def _parse_recall_list(self, html_content):
+        """리콜 현황 목록 HTML 파싱"""
+        #  실제 사이트 구조 기반 파싱
+        recall_items = []
+        
+        # 리콜 목록이 있는 테이블 또는 목록 찾기 (해당 행만 부분 파싱)
+        _, recall_rows = self.html_parser.select(html_content, RECALL_ROW_SELECTORS)
+        
+        for row in recall_rows:
+            try:
+                recall_info = self._parse_recall_row(row)
+                if recall_info:
+                    recall_items.append(recall_info)
+            except Exception as e:
+                logger.debug(f"개별 리콜 항목 파싱 오류: {e}")
+                continue
+        
+        logger.info(f"수집된 리콜 정보: {len(recall_items)}건")
+        return recall_items
+
     def get_recall_list(self, page=1, manufacturer=None, model_name=None):
-        """리콜 현황 목록 조회 (실제 작동 버전)"""
+        """리콜 현황 목록 조회 (실제 작동 버전)
+
+        빈 페이지는 [], 요청/파싱 실패는 None (증분 수집이 실패를 목록 끝으로 오인하지 않도록)
+        """
         try:
-            #  실제 사이트에서 확인된 파라미터 구조
-            params = {
-                'pageIndex': page,
-                'pageSize': 20,
-                'searchCondition': '1',  # 검색 조건 (제조사명)
-                'searchKeyword': manufacturer if manufacturer else '',
-                'orderBy': 'RECALL_DATE DESC'
-            }
+            params = self._recall_list_params(page, manufacturer)
             
             logger.info(f"리콜 현황 조회: 페이지 {page}, 제조사: {manufacturer}")
             
             response = self._make_request(self.recall_list_url, params=params)
             if not response:
-                return []
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            #  실제 사이트 구조 기반 파싱
-            recall_items = []
-            
-            # 리콜 목록이 있는 테이블 또는 목록 찾기
-            recall_rows = soup.select('tr:has(td), li.recall-item')
-            
-            for row in recall_rows:
-                try:
-                    recall_info = self._parse_recall_row(row)
-                    if recall_info:
-                        recall_items.append(recall_info)
-                except Exception as e:
-                    logger.debug(f"개별 리콜 항목 파싱 오류: {e}")
-                    continue
+                return None
             
-            logger.info(f"수집된 리콜 정보: {len(recall_items)}건")
-            return recall_items
+            return self._parse_recall_list(response.text)
             
         except Exception as e:
             logger.error(f"리콜 목록 조회 오류: {e}")
-            return []
+            return None
+
+    def get_recall_lists(self, pages, manufacturer=None):
+        """여러 페이지를 비동기 엔진으로 동시에 조회 (결과는 페이지 순서, 실패한 페이지는 None)"""
+        if self._fetch_engine is None:
+            limiter = get_host_limiter(
+                self.base_url,
+                self.config.get('requests_per_second') or (1.0 / self.delay if self.delay else 1.0),
+                self.config.get('burst', 1)
+            )
+            self._fetch_engine = build_engine(
+                self.config,
+                headers=dict(self.session.headers),
+                rate_limiters={host_of(self.base_url): limiter}
+            )
+        if self._fetch_engine is None:
+            return [self.get_recall_list(page=page, manufacturer=manufacturer) for page in pages]
+        
+        logger.info(f"리콜 현황 동시 조회: {len(pages)}페이지, 제조사: {manufacturer}")
+        try:
+            responses = self._fetch_engine.fetch_all([
+                {'url': self.recall_list_url, 'params': self._recall_list_params(page, manufacturer)}
+                for page in pages
+            ])
+        finally:
+            self._fetch_engine.close()
+        results = []
+        for page, response in zip(pages, responses):
+            if not response.ok:
+                logger.error(f"리콜 현황 페이지 {page} 조회 실패: {response.error or f'HTTP {response.status_code}'}")
+                results.append(None)
+                continue
+            try:
+                results.append(self._parse_recall_list(response.text))
+            except Exception as e:
+                logger.error(f"리콜 목록 파싱 오류 (페이지 {page}): {e}")
+                results.append(None)
+        return results
 
     def _parse_recall_row(self, row_element):
         """개별 리콜 행 파싱 (실제 HTML 구조 기반)"""
@@ -130,6 +186,16 @@ class RecallCrawler:
             if date_match:
                 recall_info['recall_date'] = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}"
             
+            # 리콜 번호 (표시된 경우)
+            number_match = re.search(r'리콜번호\s*:?\s*([A-Za-z0-9-]+)', text_content)
+            if number_match:
+                recall_info['recall_number'] = number_match.group(1)
+            
+            # 생산 기간 (표시된 경우, RecallInfo.production_start/end로 파싱 저장)
+            period_match = PRODUCTION_PERIOD_RE.search(text_content)
+            if period_match:
+                recall_info['production_period'] = period_match.group(1).strip()
+            
             # 심각도 분류
             recall_info['severity_level'] = self._classify_severity(recall_info.get('recall_title', ''))
             
@@ -146,13 +212,41 @@ class RecallCrawler:
 
     def _classify_severity(self, recall_title):
         """리콜 제목 기반 심각도 분류"""
-        title_lower = recall_title.lower()
+        return self.severity_classifier.classify(recall_title)
+
+    @staticmethod
+    def _vin_form_data(car_number=None, vin=None):
+        """차량번호/차대번호 조회 폼 데이터"""
+        #  실제 폼 데이터 구조 (사이트에서 확인된 구조)
+        if car_number:
+            return {'carNo': car_number}
+        return {'vinNo': vin}
+
+    def _parse_vin_check(self, html_content, car_identifier):
+        """차량번호/차대번호 조회 결과 페이지 파싱"""
+        # 결과 파싱 (결과 영역만 부분 파싱)
+        result_area = self.html_parser.select_one(html_content, VIN_RESULT_SELECTORS)
+        
+        if not result_area:
+            logger.info("검색 결과 영역을 찾을 수 없습니다.")
+            return []
+        
+        # "리콜 대상이 아닙니다" 또는 유사한 메시지 확인
+        if any(phrase in result_area.get_text() for phrase in ['대상이 아닙니다', '해당 없음', '조회된 결과가 없습니다']):
+            logger.info(f"해당 차량은 리콜 대상이 아닙니다: {car_identifier}")
+            return [{'status': 'NotSubject', 'car_identifier': car_identifier}]
         
-        for level, keywords in self.severity_keywords.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return level
+        # 리콜 정보 추출
+        recall_results = []
+        recall_rows = result_area.select('tr:has(td), div.recall-item')
         
-        return '보통'  # 기본값
+        for row in recall_rows:
+            recall_data = self._parse_vin_recall_result(row, car_identifier)
+            if recall_data:
+                recall_results.append(recall_data)
+        
+        logger.info(f"발견된 리콜: {len(recall_results)}건")
+        return recall_results
 
     def check_vin_recall_status(self, car_number=None, vin=None):
         """차량번호 또는 차대번호로 리콜 대상 확인"""
@@ -161,15 +255,8 @@ class RecallCrawler:
             return []
         
         try:
-            #  실제 폼 데이터 구조 (사이트에서 확인된 구조)
-            form_data = {}
-            
-            if car_number:
-                form_data['carNo'] = car_number
-                search_type = '차량번호'
-            else:
-                form_data['vinNo'] = vin  
-                search_type = '차대번호'
+            form_data = self._vin_form_data(car_number, vin)
+            search_type = '차량번호' if car_number else '차대번호'
             
             logger.info(f"리콜 대상 확인: {search_type} - {car_number or vin}")
             
@@ -184,31 +271,7 @@ class RecallCrawler:
                 logger.error(f"요청 실패: HTTP {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 결과 파싱
-            result_area = soup.select_one('div.search-result, div.result-area, table.result-table')
-            
-            if not result_area:
-                logger.info("검색 결과 영역을 찾을 수 없습니다.")
-                return []
-            
-            # "리콜 대상이 아닙니다" 또는 유사한 메시지 확인
-            if any(phrase in result_area.get_text() for phrase in ['대상이 아닙니다', '해당 없음', '조회된 결과가 없습니다']):
-                logger.info(f"해당 차량은 리콜 대상이 아닙니다: {car_number or vin}")
-                return [{'status': 'NotSubject', 'car_identifier': car_number or vin}]
-            
-            # 리콜 정보 추출
-            recall_results = []
-            recall_rows = result_area.select('tr:has(td), div.recall-item')
-            
-            for row in recall_rows:
-                recall_data = self._parse_vin_recall_result(row, car_number or vin)
-                if recall_data:
-                    recall_results.append(recall_data)
-            
-            logger.info(f"발견된 리콜: {len(recall_results)}건")
-            return recall_results
+            return self._parse_vin_check(response.text, car_number or vin)
             
         except Exception as e:
             logger.error(f"차량 리콜 확인 오류: {e}")
@@ -269,54 +332,191 @@ class RecallCrawler:
                 logger.error(f"요청 최종 실패: {e}")
                 return None
 
-    def crawl_recent_recalls(self, days=30, max_pages=5):
-        """최근 리콜 정보 수집 (메인 크롤링 함수)"""
+    @staticmethod
+    def _recall_date(recall):
+        """recall_date 문자열 -> date (없거나 형식 오류면 None)"""
+        value = recall.get('recall_date')
+        if not value:
+            return None
+        try:
+            return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _is_known(recall, recall_date, checkpoint, boundary_keys):
+        """high-water mark 이전(또는 같은 날 이미 저장된) 리콜인지 여부"""
+        if not checkpoint or not checkpoint.get('high_water_date') or recall_date is None:
+            return False
+        high_water_date = checkpoint['high_water_date']
+        if recall_date < high_water_date:
+            return True
+        if recall_date == high_water_date:
+            # 리콜 번호 하나가 여러 모델에 걸리므로 모델까지 비교
+            key = recall.get('recall_number') or recall.get('recall_title')
+            return (key, recall.get('manufacturer') or '확인필요', recall.get('model_name') or '확인필요') in boundary_keys
+        return False
+
+    def _save_recall_page(self, recall_list):
+        """한 페이지 분량의 리콜을 한 번에 저장 -> 저장 건수 (행 단위 오류는 로그)"""
+        if not recall_list:
+            return 0
+        records = [{
+            'manufacturer': recall.get('manufacturer', '확인필요'),
+            'model_name': recall.get('model_name', '확인필요'),
+            'recall_number': recall.get('recall_number'),
+            'recall_date': recall.get('recall_date'),
+            'recall_title': recall.get('recall_title', ''),
+            'recall_reason': recall.get('recall_title', ''),
+            'production_period': recall.get('production_period', ''),
+            'severity_level': recall.get('severity_level', '보통'),
+            'source': 'car.go.kr',
+            'collected_date': recall.get('collected_date')
+        } for recall in recall_list]
+        
+        try:
+            result = db_helper.insert_recall_info_many(records)
+        except Exception as e:
+            logger.error(f"리콜 페이지 저장 오류: {e}")
+            return 0
+        
+        for error in result['errors']:
+            recall = recall_list[error['index']]
+            logger.error(f"개별 리콜 저장 오류: {recall.get('manufacturer')} {recall.get('model_name')} "
+                         f"- {recall.get('recall_title')}: {error['error']}")
+        logger.info(f"   페이지 저장: {result['saved']}/{len(records)}건")
+        return result['saved']
+
+    @staticmethod
+    def _save_coverage(source, reached, today):
+        """수집 완료 기간 갱신 (이전 기간과 이어지면 시작일을 유지)"""
+        coverage_start, covered_until = db_helper.get_recall_coverage(source)
+        if coverage_start is None or covered_until is None or covered_until < reached:
+            coverage_start = reached
+        else:
+            coverage_start = min(coverage_start, reached)
+        db_helper.save_crawl_checkpoint(source, coverage_start=coverage_start, covered_until=today)
+        logger.info(f"리콜 수집 완료 기간: {coverage_start} ~ {today}")
+
+    def crawl_recent_recalls(self, days=30, max_pages=5, incremental=None):
+        """최근 리콜 정보 수집 (메인 크롤링 함수)
+
+        목록은 최신순이므로 페이지 전체가 `days` 이전이면 중단한다.
+        incremental 모드에서는 CrawlCheckpoint의 high-water mark보다 새 리콜만 저장하고,
+        페이지 전체가 이미 수집된 리콜이면 중단한다. 진행 페이지를 매 페이지 기록하므로
+        중간에 끊기면 (또는 max_pages에 걸리면) 다음 실행이 그 다음 페이지부터 이어간다.
+        페이지 조회가 실패하면 high-water mark를 올리지 않고 그 페이지부터 다시 시도한다.
+        끝까지 수집한 실행은 빠짐없이 저장된 리콜 기간(coverage_start ~ covered_until)을 기록한다.
+        """
+        source = self.get_source_name()
+        incremental = self.config.get('incremental', False) if incremental is None else incremental
         db_helper.update_crawling_log('recall', '시작')
         total_collected = 0
+        cutoff = datetime.now().date() - timedelta(days=days)
         
         try:
-            logger.info(f"최근 {days}일간 리콜 정보 수집 시작")
-            
-            for page in range(1, max_pages + 1):
+            logger.info(f"최근 {days}일간 리콜 정보 수집 시작" + (" (증분)" if incremental else ""))
+            
+            checkpoint, boundary_keys = None, set()
+            start_page, run_high_water = 1, None
+            if incremental:
+                checkpoint = db_helper.get_crawl_checkpoint(source) or {}
+                if checkpoint.get('high_water_date'):
+                    boundary_keys = db_helper.get_recall_keys_on(checkpoint['high_water_date'], source)
+                    logger.info(f"high-water mark: {checkpoint['high_water_date']} {checkpoint.get('high_water_number') or ''}")
+                if checkpoint.get('status') == 'running' and checkpoint.get('resume_page'):
+                    # 중단된 실행 이어가기 (그 실행에서 본 최신 리콜을 high-water 후보로 유지)
+                    start_page = checkpoint['resume_page'] + 1
+                    if checkpoint.get('run_high_water_date'):
+                        run_high_water = (checkpoint['run_high_water_date'], checkpoint.get('run_high_water_number'))
+                    logger.info(f"이전 실행 재개: 페이지 {start_page}부터")
+            
+            pages = list(range(start_page, start_page + max_pages))
+            # 동시 모드에서는 모든 페이지를 한 번에 요청 (증분 모드는 조기 중단이 목적이므로 순차 조회)
+            prefetched = self.get_recall_lists(pages) if self.concurrent and not incremental else None
+            
+            finished, failed_page = False, None
+            reached = None  # 빠짐없이 저장한 가장 이른 리콜 날짜 (끝까지 수집한 경우)
+            for index, page in enumerate(pages):
                 logger.info(f"페이지 {page} 처리 중...")
                 
-                recall_list = self.get_recall_list(page=page)
+                recall_list = prefetched[index] if prefetched is not None else self.get_recall_list(page=page)
                 
+                if recall_list is None:
+                    # 조회 실패는 목록 끝이 아님 -> 중단하고 체크포인트는 실행 중 상태로 유지
+                    logger.error(f"페이지 {page} 조회 실패, 수집 중단")
+                    failed_page = page
+                    break
                 if not recall_list:
                     logger.info(f"페이지 {page}에서 더 이상 데이터가 없습니다.")
+                    finished, reached = True, cutoff
                     break
                 
+                new_recalls, in_window = [], 0
                 for recall in recall_list:
-                    try:
-                        # 모델 ID 조회 또는 생성
-                        model_id = db_helper.get_or_insert_car_model(
-                            recall.get('manufacturer', '확인필요'),
-                            recall.get('model_name', '확인필요')
-                        )
-                        
-                        if model_id:
-                            # DB에 리콜 정보 저장
-                            db_helper.insert_recall_info(
-                                model_id=model_id,
-                                recall_date=recall.get('recall_date'),
-                                recall_title=recall.get('recall_title', ''),
-                                recall_reason=recall.get('recall_title', ''),
-                                severity_level=recall.get('severity_level', '보통'),
-                                source='car.go.kr',
-                                collected_date=recall.get('collected_date')
-                            )
-                            total_collected += 1
-                            logger.info(f"   저장: {recall.get('manufacturer')} {recall.get('model_name')} - {recall.get('severity_level')}")
-                        
-                    except Exception as e:
-                        logger.error(f"개별 리콜 저장 오류: {e}")
+                    recall_date = self._recall_date(recall)
+                    if recall_date is not None and recall_date < cutoff:
+                        continue
+                    in_window += 1
+                    if self._is_known(recall, recall_date, checkpoint, boundary_keys):
                         continue
+                    new_recalls.append(recall)
+                    if recall_date is not None and (run_high_water is None or recall_date > run_high_water[0]):
+                        run_high_water = (recall_date, recall.get('recall_number'))
+                
+                total_collected += self._save_recall_page(new_recalls)
+                
+                if incremental:
+                    db_helper.save_crawl_checkpoint(
+                        source, status='running', resume_page=page,
+                        run_high_water_date=run_high_water[0] if run_high_water else None,
+                        run_high_water_number=run_high_water[1] if run_high_water else None
+                    )
+                
+                if not in_window:
+                    logger.info(f"페이지 {page}: 모두 {days}일 이전 리콜, 수집 종료")
+                    finished, reached = True, cutoff
+                    break
+                if incremental and not new_recalls:
+                    logger.info(f"페이지 {page}: 모두 수집된 리콜, 증분 수집 종료")
+                    # 그 이전 리콜은 high-water mark를 기록한 실행에서 저장됨
+                    high_water_date = checkpoint.get('high_water_date')
+                    finished, reached = True, max(high_water_date, cutoff) if high_water_date else cutoff
+                    break
                 
                 # 페이지 간 딜레이
-                time.sleep(self.delay)
-            
-            db_helper.update_crawling_log('recall', '완료', total_collected)
-            logger.info(f"🎉 리콜 정보 수집 완료! 총 {total_collected}건")
+                if prefetched is None:
+                    time.sleep(self.delay)
+            
+            if incremental:
+                if failed_page is not None:
+                    db_helper.save_crawl_checkpoint(
+                        source, status='running', resume_page=failed_page - 1,
+                        run_high_water_date=run_high_water[0] if run_high_water else None,
+                        run_high_water_number=run_high_water[1] if run_high_water else None
+                    )
+                    logger.info(f"다음 실행에서 페이지 {failed_page}부터 재개 (high-water mark 유지)")
+                elif finished:
+                    high_water_date = checkpoint.get('high_water_date')
+                    high_water_number = checkpoint.get('high_water_number')
+                    if run_high_water and (high_water_date is None or run_high_water[0] >= high_water_date):
+                        high_water_date, high_water_number = run_high_water
+                    db_helper.save_crawl_checkpoint(
+                        source, status='idle', resume_page=None,
+                        high_water_date=high_water_date, high_water_number=high_water_number,
+                        run_high_water_date=None, run_high_water_number=None
+                    )
+                else:
+                    logger.info(f"max_pages({max_pages}) 도달, 다음 실행에서 페이지 {pages[-1] + 1}부터 재개")
+            
+            if reached is not None:
+                self._save_coverage(source, reached, datetime.now().date())
+            
+            if failed_page is not None:
+                db_helper.update_crawling_log('recall', '실패', total_collected, f"페이지 {failed_page} 조회 실패")
+            else:
+                db_helper.update_crawling_log('recall', '완료', total_collected)
+                logger.info(f"🎉 리콜 정보 수집 완료! 총 {total_collected}건")
             
         except Exception as e:
             db_helper.update_crawling_log('recall', '실패', total_collected, str(e))
@@ -344,7 +544,10 @@ class RecallCrawler:
 
     def crawl_and_save(self, car_list=None):
         """기존 인터페이스 호환성을 위한 래퍼 함수"""
-        return self.crawl_recent_recalls(days=30, max_pages=3)
+        return self.crawl_recent_recalls(
+            days=self.config.get('check_last_days', 30),
+            max_pages=self.config.get('max_pages', 3)
+        )
 
     def get_source_name(self):
         return "car.go.kr"
@@ -371,7 +574,7 @@ if __name__ == '__main__':
     
     print("\n2. 리콜 목록 조회 테스트")
     test_recalls = crawler.get_recall_list(page=1, manufacturer="현대")
-    print(f"조회된 리콜: {len(test_recalls)}건")
+    print(f"조회된 리콜: {len(test_recalls or [])}건")
     
     if test_recalls:
         print("샘플 리콜 정보:")
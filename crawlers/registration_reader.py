@@ -0,0 +1,156 @@
+"""
+Streaming readers for registration files (Excel / CSV / Parquet)
+- Excel: openpyxl read_only=True iter_rows, sheet by sheet, row chunks as DataFrames
+- CSV: pandas chunked reader (utf-8, cp949 fallback)
+- Parquet: pyarrow iter_batches
+Memory stays bounded by chunk_rows regardless of file size.
+"""
+import os
+import logging
+from itertools import islice
+
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 50000
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+CSV_EXTENSIONS = ('.csv', '.txt')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def _header(values):
+    """Header row -> unique column names (blank cells become col_<n>)"""
+    columns, seen = [], {}
+    for index, value in enumerate(values):
+        name = str(value).strip() if value is not None and str(value).strip() else f'col_{index}'
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}_{seen[name]}'
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def iter_excel_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS, max_sheets=None):
+    """Yield (sheet_name, DataFrame) row chunks from an .xlsx workbook.
+
+    The first row with at least two non-empty cells is taken as the header of
+    each sheet; completely empty rows are skipped.
+    """
+    if openpyxl is None:
+        raise ImportError("openpyxl is required to stream Excel files (pip install openpyxl)")
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames[:max_sheets]:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            columns = None
+            for values in rows:
+                if sum(value is not None and str(value).strip() != '' for value in values) >= 2:
+                    columns = _header(values)
+                    break
+            if columns is None:
+                logger.info(f"Sheet without header skipped: {sheet_name}")
+                continue
+
+            width = len(columns)
+            while True:
+                chunk = [values[:width] for values in islice(rows, chunk_rows)]
+                if not chunk:
+                    break
+                chunk = [values for values in chunk if any(value is not None for value in values)]
+                if chunk:
+                    yield sheet_name, pd.DataFrame.from_records(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield (file name, DataFrame) chunks; cp949 is used when the file is not UTF-8"""
+    name = os.path.basename(file_path)
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunk_rows, encoding='utf-8-sig')
+        first = next(reader, None)
+    except UnicodeDecodeError:
+        # 공공데이터 CSV는 cp949(EUC-KR)로 배포되는 경우가 많음
+        reader = pd.read_csv(file_path, chunksize=chunk_rows, encoding='cp949')
+        first = next(reader, None)
+    if first is None:
+        return
+    yield name, first
+    for chunk in reader:
+        yield name, chunk
+
+
+def iter_parquet_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield (file name, DataFrame) chunks from a Parquet file (row-group batches)"""
+    if pq is None:
+        raise ImportError("pyarrow is required to read Parquet files (pip install pyarrow)")
+    name = os.path.basename(file_path)
+    for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows):
+        yield name, batch.to_pandas()
+
+
+def iter_file_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS, max_sheets=None):
+    """Dispatch on the file extension; yields (sheet or file name, DataFrame)"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        return iter_excel_chunks(file_path, chunk_rows, max_sheets)
+    if extension in CSV_EXTENSIONS:
+        return iter_csv_chunks(file_path, chunk_rows)
+    if extension in PARQUET_EXTENSIONS:
+        return iter_parquet_chunks(file_path, chunk_rows)
+    if extension == '.xls':
+        # openpyxl은 구형 .xls를 읽지 못하므로 시트 단위 pandas 로드로 대체
+        logger.warning(f".xls is not streamable, loading sheet by sheet: {file_path}")
+        return _iter_xls_sheets(file_path, chunk_rows, max_sheets)
+    raise ValueError(f"Unsupported registration file type: {file_path}")
+
+
+def _iter_xls_sheets(file_path, chunk_rows, max_sheets):
+    excel_file = pd.ExcelFile(file_path)
+    for sheet_name in excel_file.sheet_names[:max_sheets]:
+        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        for start in range(0, len(df), chunk_rows):
+            yield sheet_name, df.iloc[start:start + chunk_rows]
+
+
+def write_chunks(chunks, output_path):
+    """Write DataFrame chunks to one .parquet or .csv file incrementally -> rows written"""
+    extension = os.path.splitext(output_path)[1].lower()
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    rows, writer, schema = 0, None, None
+    try:
+        for df in chunks:
+            if df.empty:
+                continue
+            if extension in PARQUET_EXTENSIONS:
+                if pq is None:
+                    raise ImportError("pyarrow is required to write Parquet files (pip install pyarrow)")
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = pq.ParquetWriter(output_path, schema)
+                writer.write_table(table)
+            elif extension in CSV_EXTENSIONS:
+                df.to_csv(output_path, mode='a' if rows else 'w', header=not rows, index=False,
+                          encoding='utf-8')
+            else:
+                raise ValueError(f"Unsupported output type: {output_path}")
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,227 @@
+"""
+Chunked multi-row INSERT ... ON DUPLICATE KEY UPDATE writer
+and LOAD DATA LOCAL INFILE fast path for very large frames
+"""
+import os
+import tempfile
+import time
+import logging
+
+import pandas as pd
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+TSV_WRITE_CHUNK = 100000
+
+# 서버/클라이언트가 LOCAL INFILE을 허용하지 않을 때의 오류 코드
+LOCAL_INFILE_DISABLED_ERRNOS = {
+    1148,  # ER_NOT_ALLOWED_COMMAND
+    2068,  # CR_LOAD_DATA_LOCAL_INFILE_REJECTED
+    3948,  # ER_CLIENT_LOCAL_FILES_DISABLED
+    3950,  # ER_LOAD_DATA_INFILE_DISABLED
+}
+
+INGEST_MODES = ('batch', 'infile', 'auto')
+
+
+class LocalInfileUnavailable(Error):
+    """Raised when LOAD DATA LOCAL INFILE is disabled on the server or client"""
+
+
+class BulkWriter:
+    """Write many rows with one multi-row statement and one transaction per chunk"""
+
+    def __init__(self, db, chunk_size=None):
+        self.db = db
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+
+    @staticmethod
+    def build_upsert_query(table, columns, row_count, update_columns=None):
+        """Build INSERT INTO table (...) VALUES (...), (...) [ON DUPLICATE KEY UPDATE ...]"""
+        placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ', '.join([placeholders] * row_count)
+        )
+        if update_columns:
+            query += " ON DUPLICATE KEY UPDATE " + ', '.join(
+                f"{col}=VALUES({col})" for col in update_columns
+            )
+        return query
+
+    def upsert(self, table, columns, rows, update_columns=None, chunk_size=None):
+        """Insert rows (sequence of tuples) chunk by chunk.
+
+        Returns stats dict: rows, chunks, affected, elapsed, rows_per_sec.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        rows = rows if isinstance(rows, list) else list(rows)
+        stats = {'rows': 0, 'chunks': 0, 'affected': 0, 'elapsed': 0.0, 'rows_per_sec': 0.0}
+        if not rows:
+            return stats
+
+        started = time.perf_counter()
+        full_query = None
+
+        with self.db.get_db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    if len(chunk) == chunk_size:
+                        # 전체 크기 청크는 같은 SQL 문자열을 재사용
+                        if full_query is None:
+                            full_query = self.build_upsert_query(table, columns, chunk_size, update_columns)
+                        query = full_query
+                    else:
+                        query = self.build_upsert_query(table, columns, len(chunk), update_columns)
+
+                    params = [value for row in chunk for value in row]
+                    connection.start_transaction()
+                    try:
+                        cursor.execute(query, params)
+                        connection.commit()
+                    except Error:
+                        connection.rollback()
+                        raise
+
+                    stats['rows'] += len(chunk)
+                    stats['chunks'] += 1
+                    stats['affected'] += max(cursor.rowcount, 0)
+            except Error as e:
+                logger.error(f"Bulk upsert error ({table}, {stats['rows']} rows written): {e}")
+                raise
+            finally:
+                cursor.close()
+
+        stats['elapsed'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+        logger.info(f"Bulk upsert {table}: {stats['rows']} rows in {stats['chunks']} chunks, "
+                    f"{stats['elapsed']:.2f}s ({stats['rows_per_sec']:.0f} rows/s)")
+        return stats
+
+    def upsert_frame(self, table, df, columns, update_columns=None, chunk_size=None):
+        """Upsert the given DataFrame columns (NaN/NaT are written as NULL)"""
+        frame = df[columns].astype(object).where(df[columns].notna(), None)
+        rows = list(frame.itertuples(index=False, name=None))
+        return self.upsert(table, columns, rows, update_columns=update_columns, chunk_size=chunk_size)
+
+    # === LOAD DATA LOCAL INFILE 경로 ===
+
+    @staticmethod
+    def _tsv_column(series):
+        """Render one column in LOAD DATA's default escaping (\\N = NULL)"""
+        nulls = series.isna()
+        if pd.api.types.is_float_dtype(series) or pd.api.types.is_integer_dtype(series) \
+                or pd.api.types.is_bool_dtype(series):
+            text = series.astype(str)
+        else:
+            text = series.astype(str).str.replace('\\', '\\\\', regex=False) \
+                .str.replace('\t', '\\t', regex=False) \
+                .str.replace('\n', '\\n', regex=False) \
+                .str.replace('\r', '\\r', regex=False)
+        return text.mask(nulls, '\\N')
+
+    def write_tsv(self, df, columns, path):
+        """Stream df[columns] to a TSV file chunk by chunk"""
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            for start in range(0, len(df), TSV_WRITE_CHUNK):
+                chunk = df.iloc[start:start + TSV_WRITE_CHUNK]
+                rendered = [self._tsv_column(chunk[col]) for col in columns]
+                lines = rendered[0].str.cat(rendered[1:], sep='\t') if len(rendered) > 1 else rendered[0]
+                f.write('\n'.join(lines.tolist()))
+                f.write('\n')
+
+    def load_infile(self, table, df, columns, update_columns=None):
+        """TSV -> staging table via LOAD DATA LOCAL INFILE -> one INSERT ... SELECT merge"""
+        stats = {'rows': len(df), 'chunks': 1, 'affected': 0, 'elapsed': 0.0,
+                 'rows_per_sec': 0.0, 'mode': 'infile'}
+        if df.empty:
+            return stats
+
+        started = time.perf_counter()
+        staging = f"stg_{table}"
+        column_list = ', '.join(columns)
+
+        fd, tsv_path = tempfile.mkstemp(prefix=f"{table}_", suffix='.tsv')
+        os.close(fd)
+        connection = None
+        try:
+            self.write_tsv(df, columns, tsv_path)
+
+            # LOCAL INFILE은 연결 단위 옵션이므로 풀 밖의 전용 연결 사용
+            connection = self.db.pool.create_connection(allow_local_infile=True)
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT @@GLOBAL.local_infile")
+                if not cursor.fetchone()[0]:
+                    raise LocalInfileUnavailable(msg="local_infile is disabled on the server", errno=3948)
+
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {staging} SELECT {column_list} FROM {table} LIMIT 0"
+                )
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {staging} CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                    f"LINES TERMINATED BY '\\n' ({column_list})",
+                    (tsv_path.replace(os.sep, '/'),)
+                )
+
+                merge_query = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"
+                if update_columns:
+                    merge_query += " ON DUPLICATE KEY UPDATE " + ', '.join(
+                        f"{col}=VALUES({col})" for col in update_columns
+                    )
+                connection.start_transaction()
+                try:
+                    cursor.execute(merge_query)
+                    stats['affected'] = max(cursor.rowcount, 0)
+                    connection.commit()
+                except Error:
+                    connection.rollback()
+                    raise
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+            finally:
+                cursor.close()
+        except Error as e:
+            if isinstance(e, LocalInfileUnavailable) or e.errno in LOCAL_INFILE_DISABLED_ERRNOS:
+                raise LocalInfileUnavailable(msg=str(e), errno=e.errno)
+            logger.error(f"LOAD DATA ingest error ({table}): {e}")
+            raise
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            if os.path.exists(tsv_path):
+                os.remove(tsv_path)
+
+        stats['elapsed'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+        logger.info(f"LOAD DATA {table}: {stats['rows']} rows in {stats['elapsed']:.2f}s "
+                    f"({stats['rows_per_sec']:.0f} rows/s)")
+        return stats
+
+    def write_frame(self, table, df, columns, update_columns=None, chunk_size=None, mode='batch'):
+        """Write a frame with the requested ingest mode.
+
+        mode: 'batch' (chunked multi-row INSERT), 'infile' (LOAD DATA LOCAL INFILE
+        + INSERT ... SELECT) or 'auto' (infile, falling back to batch when the
+        server or client disallows local infile).
+        """
+        if mode not in INGEST_MODES:
+            raise ValueError(f"Unknown ingest mode: {mode} (expected one of {INGEST_MODES})")
+
+        if mode in ('infile', 'auto'):
+            try:
+                return self.load_infile(table, df, columns, update_columns=update_columns)
+            except LocalInfileUnavailable as e:
+                logger.warning(f"LOAD DATA LOCAL INFILE unavailable, falling back to batched INSERT: {e}")
+
+        stats = self.upsert_frame(table, df, columns, update_columns=update_columns, chunk_size=chunk_size)
+        stats['mode'] = 'batch'
+        return stats
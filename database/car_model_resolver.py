@@ -0,0 +1,180 @@
+"""
+In-process CarModel identity cache with batched model-ID resolution
+"""
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 보내는 VALUES / IN 튜플 수 (max_allowed_packet 대비 여유)
+RESOLVE_BATCH_SIZE = 1000
+
+
+class CarModelResolver:
+    """Resolve (manufacturer, model_name) pairs to model_id with few round trips"""
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._by_key = {}    # (manufacturer, model_name, release_year) -> model_id
+        self._by_name = {}   # (manufacturer, model_name) -> model_id
+        self._loaded = False
+
+    # === 캐시 관리 ===
+
+    def _remember(self, manufacturer, model_name, release_year, model_id):
+        self._by_key[(manufacturer, model_name, release_year)] = model_id
+        name_key = (manufacturer, model_name)
+        # get_or_insert_car_model의 기존 동작처럼 이름당 가장 먼저 생성된 ID를 사용
+        current = self._by_name.get(name_key)
+        if current is None or model_id < current:
+            self._by_name[name_key] = model_id
+
+    def preload(self):
+        """Load the whole CarModel table into the identity map"""
+        rows = self.db.execute_query(
+            "SELECT model_id, manufacturer, model_name, release_year FROM CarModel"
+        )
+        with self._lock:
+            self._by_key.clear()
+            self._by_name.clear()
+            for row in rows:
+                self._remember(row['manufacturer'], row['model_name'],
+                               row['release_year'], row['model_id'])
+            self._loaded = True
+        logger.info(f"CarModel cache loaded: {len(self._by_key)} models")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.preload()
+
+    def invalidate(self, manufacturer=None, model_name=None):
+        """Drop cached entries after CarModel rows change.
+
+        Without arguments the whole map is dropped and lazily reloaded; with a
+        model name only that name is dropped and re-read from the database.
+        """
+        with self._lock:
+            if manufacturer is None and model_name is None:
+                self._by_key.clear()
+                self._by_name.clear()
+                self._loaded = False
+                return
+            if not self._loaded:
+                return
+            self._by_name.pop((manufacturer, model_name), None)
+            for key in [k for k in self._by_key if k[0] == manufacturer and k[1] == model_name]:
+                del self._by_key[key]
+
+        rows = self.db.execute_query(
+            "SELECT model_id, manufacturer, model_name, release_year FROM CarModel "
+            "WHERE manufacturer = %s AND model_name = %s",
+            (manufacturer, model_name)
+        )
+        with self._lock:
+            for row in rows:
+                self._remember(row['manufacturer'], row['model_name'],
+                               row['release_year'], row['model_id'])
+
+    # === 조회 ===
+
+    def lookup(self, manufacturer, model_name, release_year=None):
+        """Cached lookup only (no database access besides the initial preload)"""
+        self._ensure_loaded()
+        with self._lock:
+            if release_year is not None:
+                return self._by_key.get((manufacturer, model_name, release_year))
+            return self._by_name.get((manufacturer, model_name))
+
+    def resolve(self, manufacturer, model_name, fuel_type=None, **kwargs):
+        """Resolve one model, inserting it when missing"""
+        result = self.resolve_many([{
+            'manufacturer': manufacturer,
+            'model_name': model_name,
+            'fuel_type': fuel_type,
+            **kwargs
+        }])
+        return result.get((manufacturer, model_name))
+
+    def resolve_many(self, records):
+        """Resolve many models at once.
+
+        records: iterable of dicts with manufacturer/model_name and optional
+        release_year, segment, fuel_type. Returns {(manufacturer, model_name): model_id}.
+        Names missing from the cache are checked with one
+        SELECT ... WHERE (manufacturer, model_name) IN (...) per batch; the ones
+        still missing are created with one multi-row INSERT IGNORE and read back.
+        """
+        self._ensure_loaded()
+
+        resolved = {}
+        missing = {}
+        with self._lock:
+            for record in records:
+                name_key = (record.get('manufacturer'), record.get('model_name'))
+                if not name_key[0] or not name_key[1] or name_key in resolved or name_key in missing:
+                    continue
+                model_id = self._by_name.get(name_key)
+                if model_id:
+                    resolved[name_key] = model_id
+                else:
+                    missing[name_key] = record
+
+        if missing:
+            resolved.update(self._insert_and_fetch(list(missing.values())))
+
+        return resolved
+
+    def _select_names(self, name_keys):
+        params = []
+        for manufacturer, model_name in name_keys:
+            params.extend([manufacturer, model_name])
+        query = (
+            "SELECT model_id, manufacturer, model_name, release_year FROM CarModel "
+            "WHERE (manufacturer, model_name) IN ("
+            + ', '.join(['(%s, %s)'] * len(name_keys)) + ")"
+        )
+        rows = self.db.execute_query(query, params)
+        with self._lock:
+            for row in rows:
+                self._remember(row['manufacturer'], row['model_name'],
+                               row['release_year'], row['model_id'])
+
+    def _insert_and_fetch(self, records):
+        resolved = {}
+        for start in range(0, len(records), RESOLVE_BATCH_SIZE):
+            batch = records[start:start + RESOLVE_BATCH_SIZE]
+            name_keys = [(record['manufacturer'], record['model_name']) for record in batch]
+
+            with self.db.get_db_connection():
+                # 다른 프로세스가 먼저 만든 모델이 있을 수 있으므로 먼저 조회
+                self._select_names(name_keys)
+                with self._lock:
+                    to_insert = [record for record in batch
+                                 if (record['manufacturer'], record['model_name']) not in self._by_name]
+
+                if to_insert:
+                    insert_params = []
+                    for record in to_insert:
+                        insert_params.extend([
+                            record['manufacturer'],
+                            record['model_name'],
+                            record.get('release_year', 2024),
+                            record.get('segment', 'General'),
+                            record.get('fuel_type', 'Gasoline'),
+                        ])
+                    insert_query = (
+                        "INSERT IGNORE INTO CarModel (manufacturer, model_name, release_year, segment, fuel_type) VALUES "
+                        + ', '.join(['(%s, %s, %s, %s, %s)'] * len(to_insert))
+                    )
+                    self.db.execute_query(insert_query, insert_params, fetch=False)
+                    self._select_names([(r['manufacturer'], r['model_name']) for r in to_insert])
+
+            with self._lock:
+                for name_key in name_keys:
+                    model_id = self._by_name.get(name_key)
+                    if model_id:
+                        resolved[name_key] = model_id
+
+        logger.info(f"CarModel resolve: {len(resolved)}/{len(records)} uncached names resolved")
+        return resolved
@@ -0,0 +1,231 @@
+"""
+Bounded, thread-safe MySQL connection pool used by DBHelper
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import logging
+
+import mysql.connector
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+# DATABASE_CONFIG 중 풀 동작에만 쓰이고 mysql.connector.connect()에는 넘기지 않는 키
+POOL_OPTION_KEYS = (
+    'pool_name',
+    'pool_size',
+    'pool_reset_session',
+    'pool_max_idle_seconds',
+    'pool_checkout_timeout',
+    'pool_health_check',
+)
+
+POOL_DEFAULTS = {
+    'pool_size': 5,
+    'pool_max_idle_seconds': 300,
+    'pool_checkout_timeout': 30,
+    'pool_health_check': True,
+}
+
+
+def split_pool_config(config):
+    """Split DATABASE_CONFIG into (connect kwargs, pool options)"""
+    connect_kwargs = {k: v for k, v in config.items() if k not in POOL_OPTION_KEYS}
+    pool_options = dict(POOL_DEFAULTS)
+    pool_options.update({k: v for k, v in config.items() if k in POOL_OPTION_KEYS})
+    return connect_kwargs, pool_options
+
+
+class PoolExhaustedError(Error):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Bounded connection pool with per-thread checkout and borrow-time health checks"""
+
+    def __init__(self, config):
+        self.connect_kwargs, options = split_pool_config(config)
+        self.pool_size = max(int(options['pool_size']), 1)
+        self.max_idle_seconds = options['pool_max_idle_seconds']
+        self.checkout_timeout = options['pool_checkout_timeout']
+        self.health_check = options['pool_health_check']
+
+        self._idle = deque()  # (connection, returned_at)
+        self._opened = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+        # 풀 지표
+        self._metrics = {
+            'borrows': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'borrow_time_total': 0.0,
+            'borrow_time_max': 0.0,
+            'created': 0,
+            'evicted_idle': 0,
+            'health_check_failures': 0,
+            'timeouts': 0,
+        }
+
+    # === 연결 생성/폐기 ===
+
+    def create_connection(self, **overrides):
+        """Open a connection outside the pool (e.g. with special session options)"""
+        kwargs = dict(self.connect_kwargs)
+        kwargs.update(overrides)
+        return mysql.connector.connect(**kwargs)
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    # === 대여/반납 ===
+
+    def _acquire(self):
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout if self.checkout_timeout else None
+        waited = False
+
+        while True:
+            connection = None
+            create_new = False
+
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    # 오래 놀고 있는 연결은 대여 전에 정리
+                    while self._idle and self.max_idle_seconds and \
+                            now - self._idle[0][1] > self.max_idle_seconds:
+                        stale, _ = self._idle.popleft()
+                        self._opened -= 1
+                        self._metrics['evicted_idle'] += 1
+                        self._discard(stale)
+
+                    if self._idle:
+                        connection, _ = self._idle.pop()
+                        break
+                    if self._opened < self.pool_size:
+                        self._opened += 1
+                        create_new = True
+                        break
+
+                    if not waited:
+                        waited = True
+                        self._metrics['waits'] += 1
+                    remaining = None if deadline is None else deadline - now
+                    if remaining is not None and remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolExhaustedError(
+                            msg=f"No pooled connection available within {self.checkout_timeout}s "
+                                f"(pool_size={self.pool_size})")
+                    self._cond.wait(remaining)
+
+            if create_new:
+                try:
+                    connection = self.create_connection()
+                except Exception:
+                    with self._cond:
+                        self._opened -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._metrics['created'] += 1
+            elif self.health_check and not self._is_healthy(connection):
+                # 끊어진 연결은 버리고 다시 시도
+                with self._cond:
+                    self._opened -= 1
+                    self._metrics['health_check_failures'] += 1
+                self._discard(connection)
+                continue
+
+            elapsed = time.monotonic() - started
+            with self._cond:
+                self._metrics['borrows'] += 1
+                self._metrics['borrow_time_total'] += elapsed
+                self._metrics['borrow_time_max'] = max(self._metrics['borrow_time_max'], elapsed)
+                if waited:
+                    self._metrics['wait_time_total'] += elapsed
+            return connection
+
+    def _release(self, connection, broken=False):
+        if not broken:
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+            except Exception:
+                broken = True
+
+        with self._cond:
+            if broken:
+                self._opened -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+        if broken:
+            self._discard(connection)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; nested use in the same thread reuses the same connection"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None:
+            holder['depth'] += 1
+            try:
+                yield holder['connection']
+            finally:
+                holder['depth'] -= 1
+            return
+
+        connection = self._acquire()
+        self._local.holder = {'connection': connection, 'depth': 1}
+        broken = False
+        try:
+            yield connection
+        except Error:
+            broken = not self._is_healthy(connection)
+            raise
+        finally:
+            self._local.holder = None
+            self._release(connection, broken=broken)
+
+    # === 관리 ===
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones are closed on return)"""
+        with self._cond:
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                self._opened -= 1
+                self._discard(connection)
+
+    def stats(self):
+        """Pool metrics snapshot: waits, borrow latency and in-use count"""
+        with self._cond:
+            metrics = dict(self._metrics)
+            idle = len(self._idle)
+            opened = self._opened
+
+        borrows = metrics['borrows']
+        metrics.update({
+            'pool_size': self.pool_size,
+            'opened': opened,
+            'idle': idle,
+            'in_use': opened - idle,
+            'avg_borrow_ms': (metrics['borrow_time_total'] / borrows * 1000) if borrows else 0.0,
+            'max_borrow_ms': metrics['borrow_time_max'] * 1000,
+            'avg_wait_ms': (metrics['wait_time_total'] / metrics['waits'] * 1000) if metrics['waits'] else 0.0,
+        })
+        return metrics
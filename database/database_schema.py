@@ -7,10 +7,11 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config import DATABASE_CONFIG
+from database.connection_pool import split_pool_config
 
 class DatabaseManager:
     def __init__(self):
-        self.config = DATABASE_CONFIG.copy()
+        self.config, _ = split_pool_config(DATABASE_CONFIG)
         self.database_name = self.config.pop('database')
         
     def create_database(self):
@@ -32,7 +33,7 @@ class DatabaseManager:
         """데이터베이스 연결 반환"""
         try:
             self.config['database'] = self.database_name
-            return mysql.connector.connect(**DATABASE_CONFIG)
+            return mysql.connector.connect(**self.config)
         except Error as e:
             print(f"ERROR: 연결 오류: {e}")
             return None
@@ -68,13 +69,17 @@ class DatabaseManager:
             stat_id INT AUTO_INCREMENT PRIMARY KEY,
             model_id INT,
             region VARCHAR(50),
+            fuel_type VARCHAR(30) NOT NULL DEFAULT '',
             registration_date DATE,
             registration_count INT DEFAULT 0,
             cumulative_count INT DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
+            UNIQUE KEY unique_registration_fuel (model_id, region, registration_date, fuel_type),
             INDEX idx_date (registration_date),
-            INDEX idx_region (region)
+            INDEX idx_region (region),
+            INDEX idx_updated_at (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
         
@@ -88,13 +93,17 @@ class DatabaseManager:
             avg_price DECIMAL(12, 2),
             min_price DECIMAL(12, 2),
             max_price DECIMAL(12, 2),
+            p25_price DECIMAL(12, 2) NULL,
+            median_price DECIMAL(12, 2) NULL,
+            p75_price DECIMAL(12, 2) NULL,
             sample_count INT DEFAULT 0,
             data_source VARCHAR(50),
             collected_date DATE,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
             INDEX idx_year (year),
-            INDEX idx_collected_date (collected_date)
+            INDEX idx_collected_date (collected_date),
+            INDEX idx_created_at (created_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
         
@@ -113,7 +122,8 @@ class DatabaseManager:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
             INDEX idx_trim (trim_name),
-            INDEX idx_valid_date (valid_from, valid_until)
+            INDEX idx_valid_date (valid_from, valid_until),
+            INDEX idx_created_at (created_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
         
@@ -212,6 +222,8 @@ class DatabaseManager:
             defect_content TEXT,
             correction_method TEXT,
             production_period VARCHAR(100),
+            production_start DATE NULL,
+            production_end DATE NULL,
             affected_units INT DEFAULT 0,
             target_quantity INT DEFAULT 0,
             corrected_quantity INT DEFAULT 0,
@@ -226,9 +238,12 @@ class DatabaseManager:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES CarModel(model_id),
+            UNIQUE KEY unique_recall_model (recall_number, model_id),
             INDEX idx_recall_date (recall_date),
             INDEX idx_model_severity (model_id, severity_level),
-            INDEX idx_collected_date (collected_date)
+            INDEX idx_model_production (model_id, production_start, production_end),
+            INDEX idx_collected_date (collected_date),
+            INDEX idx_updated_at (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
 
@@ -238,6 +253,7 @@ class DatabaseManager:
             id INT PRIMARY KEY AUTO_INCREMENT,
             car_number VARCHAR(20),
             vin VARCHAR(50),
+            identifier VARCHAR(50) NOT NULL DEFAULT '',
             model_id INT,
             recall_id INT,
             check_date DATE,
@@ -245,12 +261,16 @@ class DatabaseManager:
             correction_completed BOOLEAN DEFAULT FALSE,
             correction_date DATE,
             notes TEXT,
+            result_key CHAR(32) NOT NULL DEFAULT '',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES CarModel(model_id),
             FOREIGN KEY (recall_id) REFERENCES RecallInfo(id),
             INDEX idx_car_number (car_number),
             INDEX idx_check_date (check_date),
-            UNIQUE KEY unique_car_recall (car_number, recall_id)
+            INDEX idx_car_number_check_date (car_number, check_date),
+            INDEX idx_vin_check_date (vin, check_date),
+            UNIQUE KEY unique_car_recall (car_number, recall_id),
+            UNIQUE KEY unique_recall_check (identifier, check_date, result_key)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
 
@@ -277,12 +297,269 @@ class DatabaseManager:
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """)
         
+        # 14. 모델별 가성비 점수 (스케줄러가 증분 갱신)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ModelScore (
+            model_id INT NOT NULL,
+            score_version INT NOT NULL,
+            price_score DECIMAL(6, 2),
+            reliability_score DECIMAL(6, 2),
+            popularity_score DECIMAL(6, 2),
+            total_score DECIMAL(6, 2),
+            used_price_watermark TIMESTAMP NULL,
+            new_price_watermark TIMESTAMP NULL,
+            recall_watermark TIMESTAMP NULL,
+            registration_watermark TIMESTAMP NULL,
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (model_id, score_version),
+            FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
+            INDEX idx_version_total (score_version, total_score)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        
+        # 15. 중고차 매물 팩트 테이블 (UsedCarPrice 집계의 원천)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS UsedCarListing (
+            source VARCHAR(50) NOT NULL,
+            listing_id VARCHAR(64) NOT NULL,
+            model_id INT NOT NULL,
+            year SMALLINT,
+            mileage INT NULL,
+            price DECIMAL(12, 2) NOT NULL,
+            first_seen DATE NOT NULL,
+            last_seen DATE NOT NULL,
+            PRIMARY KEY (source, listing_id),
+            FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
+            INDEX idx_model_year (model_id, year),
+            INDEX idx_source_last_seen (source, last_seen)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        
+        # 16. 증분 크롤링 체크포인트 (소스별 high-water mark / 재개 페이지)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS CrawlCheckpoint (
+            source VARCHAR(50) PRIMARY KEY,
+            high_water_date DATE NULL,
+            high_water_number VARCHAR(50) NULL,
+            run_high_water_date DATE NULL,
+            run_high_water_number VARCHAR(50) NULL,
+            resume_page INT NULL,
+            status VARCHAR(20) DEFAULT 'idle',
+            coverage_start DATE NULL,
+            covered_until DATE NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        
+        # 17. 연비 정보 (한국에너지공단 API, 모델/연식/연료/배기량 단위)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS FuelEfficiency (
+            model_id INT NOT NULL,
+            model_year SMALLINT NOT NULL,
+            fuel_type VARCHAR(30) NOT NULL,
+            displacement INT NOT NULL DEFAULT 0,
+            city_efficiency DECIMAL(6, 2),
+            highway_efficiency DECIMAL(6, 2),
+            combined_efficiency DECIMAL(6, 2),
+            source VARCHAR(50) DEFAULT 'data.go.kr',
+            collected_date DATE,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (model_id, model_year, fuel_type, displacement),
+            FOREIGN KEY (model_id) REFERENCES CarModel(model_id) ON DELETE CASCADE,
+            INDEX idx_updated_at (updated_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+
+        # 18. 감가 모델 계수 (log 가격 회귀, 모델/세그먼트/전체 단위 + 증분 재적합용 충분통계량)
+        #     워터마크: UsedCarPrice.price_id / UsedCarListing.first_seen 까지 반영
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS DepreciationModel (
+            scope VARCHAR(10) NOT NULL,
+            scope_key VARCHAR(100) NOT NULL,
+            model_version INT NOT NULL,
+            segment VARCHAR(50) NULL,
+            coefficients TEXT NOT NULL,
+            xtx TEXT NOT NULL,
+            xty TEXT NOT NULL,
+            yty DOUBLE NOT NULL,
+            weight_sum DOUBLE NOT NULL,
+            n_obs INT NOT NULL,
+            rmse DOUBLE NULL,
+            annual_depreciation DECIMAL(6, 4) NULL,
+            anchor_year SMALLINT NULL,
+            anchor_price DECIMAL(12, 2) NULL,
+            anchor_date DATE NULL,
+            price_watermark INT NULL,
+            listing_watermark DATE NULL,
+            fitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (scope, scope_key),
+            INDEX idx_model_version (model_version)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+
+        # 기존 데이터베이스에 추가된 컬럼/인덱스 반영
+        # 등록 현황은 연료별로 행이 나뉘므로 (모델, 지역, 날짜, 연료) 단위로 유일
+        self.ensure_column(cursor, 'RegistrationStats', 'fuel_type',
+                           "ADD COLUMN fuel_type VARCHAR(30) NOT NULL DEFAULT '' AFTER region")
+        if not self.has_index(cursor, 'RegistrationStats', 'unique_registration_fuel'):
+            self.dedupe_registration_stats(cursor)
+            self.ensure_index(cursor, 'RegistrationStats', 'unique_registration_fuel',
+                              "ADD UNIQUE KEY unique_registration_fuel (model_id, region, registration_date, fuel_type)",
+                              required=True)
+        if self.has_index(cursor, 'RegistrationStats', 'unique_registration'):
+            cursor.execute("ALTER TABLE RegistrationStats DROP INDEX unique_registration")
+            print("SUCCESS: RegistrationStats.unique_registration 인덱스 제거 (unique_registration_fuel로 대체)")
+        self.ensure_column(cursor, 'RegistrationStats', 'updated_at',
+                           "ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
+        self.ensure_index(cursor, 'RegistrationStats', 'idx_updated_at', "ADD INDEX idx_updated_at (updated_at)")
+        self.ensure_index(cursor, 'UsedCarPrice', 'idx_created_at', "ADD INDEX idx_created_at (created_at)")
+        self.ensure_index(cursor, 'NewCarPrice', 'idx_created_at', "ADD INDEX idx_created_at (created_at)")
+        self.ensure_index(cursor, 'RecallInfo', 'idx_updated_at', "ADD INDEX idx_updated_at (updated_at)")
+        # 리콜 번호 하나가 여러 모델에 걸리므로 (recall_number, model_id) 단위로 유일
+        if not self.has_index(cursor, 'RecallInfo', 'unique_recall_model'):
+            self.dedupe_recall_info(cursor)
+            self.ensure_index(cursor, 'RecallInfo', 'unique_recall_model',
+                              "ADD UNIQUE KEY unique_recall_model (recall_number, model_id)", required=True)
+        if self.has_index(cursor, 'RecallInfo', 'unique_recall_number'):
+            cursor.execute("ALTER TABLE RecallInfo DROP INDEX unique_recall_number")
+            print("SUCCESS: RecallInfo.unique_recall_number 인덱스 제거 (unique_recall_model로 대체)")
+        self.ensure_column(cursor, 'RecallInfo', 'production_start',
+                           "ADD COLUMN production_start DATE NULL AFTER production_period")
+        self.ensure_column(cursor, 'RecallInfo', 'production_end',
+                           "ADD COLUMN production_end DATE NULL AFTER production_start")
+        self.ensure_index(cursor, 'RecallInfo', 'idx_model_production',
+                          "ADD INDEX idx_model_production (model_id, production_start, production_end)")
+        self.ensure_index(cursor, 'car_recall_history', 'idx_car_number_check_date',
+                          "ADD INDEX idx_car_number_check_date (car_number, check_date)")
+        self.ensure_index(cursor, 'car_recall_history', 'idx_vin_check_date',
+                          "ADD INDEX idx_vin_check_date (vin, check_date)")
+        # 리콜 목록이 빠짐없이 수집된 기간 (coverage_start ~ covered_until)
+        self.ensure_column(cursor, 'CrawlCheckpoint', 'coverage_start',
+                           "ADD COLUMN coverage_start DATE NULL AFTER status")
+        self.ensure_column(cursor, 'CrawlCheckpoint', 'covered_until',
+                           "ADD COLUMN covered_until DATE NULL AFTER coverage_start")
+        # 확인 이력은 (식별자, 확인일, 결과) 단위로 유일 (recall_id/car_number가 NULL이면 기존 키는 충돌하지 않음)
+        self.ensure_column(cursor, 'car_recall_history', 'identifier',
+                           "ADD COLUMN identifier VARCHAR(50) NOT NULL DEFAULT '' AFTER vin")
+        self.ensure_column(cursor, 'car_recall_history', 'result_key',
+                           "ADD COLUMN result_key CHAR(32) NOT NULL DEFAULT '' AFTER notes")
+        if not self.has_index(cursor, 'car_recall_history', 'unique_recall_check'):
+            self.dedupe_recall_checks(cursor)
+            self.ensure_index(cursor, 'car_recall_history', 'unique_recall_check',
+                              "ADD UNIQUE KEY unique_recall_check (identifier, check_date, result_key)",
+                              required=True)
+        for column in ('p25_price', 'median_price', 'p75_price'):
+            self.ensure_column(cursor, 'UsedCarPrice', column, f"ADD COLUMN {column} DECIMAL(12, 2) NULL AFTER max_price")
+        
         connection.commit()
         print("SUCCESS: 모든 테이블 (리콜 테이블 포함) 생성 완료!")
         
         cursor.close()
         connection.close()
         
+    def has_index(self, cursor, table, index_name):
+        """테이블에 인덱스가 있는지 확인"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = %s AND table_name = %s AND index_name = %s
+        """, (self.database_name, table, index_name))
+        return cursor.fetchone()[0] > 0
+        
+    def ensure_index(self, cursor, table, index_name, alter_clause, required=False):
+        """기존 테이블에 인덱스가 없으면 추가 (CREATE TABLE IF NOT EXISTS 보완)
+
+        required=True면 추가 실패 시 경고 대신 예외 (upsert가 기대는 유니크 키)
+        """
+        if self.has_index(cursor, table, index_name):
+            return
+        try:
+            cursor.execute(f"ALTER TABLE {table} {alter_clause}")
+            print(f"SUCCESS: {table}.{index_name} 인덱스 추가")
+        except Error as e:
+            if required:
+                print(f"ERROR: {table}.{index_name} 인덱스 추가 실패: {e}")
+                raise
+            print(f"WARNING: {table}.{index_name} 인덱스 추가 실패 (중복 데이터 확인 필요): {e}")
+            
+    def dedupe_registration_stats(self, cursor):
+        """(model_id, region, registration_date, fuel_type)가 같은 RegistrationStats 중복 행 정리
+
+        기존 INSERT 경로는 같은 파일을 다시 적재할 때마다 행을 추가했으므로 가장 최근 행만 유지
+        """
+        cursor.execute("""
+            DELETE older FROM RegistrationStats older
+            JOIN RegistrationStats newer
+              ON newer.model_id = older.model_id AND newer.region = older.region
+             AND newer.registration_date = older.registration_date AND newer.fuel_type = older.fuel_type
+             AND newer.stat_id > older.stat_id
+        """)
+        if cursor.rowcount:
+            print(f"SUCCESS: RegistrationStats 중복 행 {cursor.rowcount}건 정리")
+            
+    def dedupe_recall_checks(self, cursor):
+        """car_recall_history의 식별자/결과 키를 채우고 (식별자, 확인일, 결과)가 같은 중복 행 정리
+
+        결과 키는 DBHelper.insert_car_recall_checks와 같은 MD5(notes), 가장 최근 행 유지
+        """
+        cursor.execute("""
+            UPDATE car_recall_history
+            SET identifier = COALESCE(car_number, vin, ''), result_key = MD5(COALESCE(notes, ''))
+            WHERE identifier = '' OR result_key = ''
+        """)
+        cursor.execute("""
+            DELETE older FROM car_recall_history older
+            JOIN car_recall_history newer
+              ON newer.identifier = older.identifier AND newer.check_date <=> older.check_date
+             AND newer.result_key = older.result_key AND newer.id > older.id
+        """)
+        if cursor.rowcount:
+            print(f"SUCCESS: car_recall_history 중복 행 {cursor.rowcount}건 정리")
+            
+    def dedupe_recall_info(self, cursor):
+        """(recall_number, model_id)가 같은 RecallInfo 중복 행 정리 (가장 최근 행 유지)
+
+        car_recall_history가 참조하는 행은 유지할 행으로 옮긴 뒤 삭제
+        """
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS recall_keep")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE recall_keep AS
+            SELECT r.id, k.keep_id
+            FROM RecallInfo r
+            JOIN (
+                SELECT recall_number, model_id, MAX(id) AS keep_id
+                FROM RecallInfo
+                WHERE recall_number IS NOT NULL AND model_id IS NOT NULL
+                GROUP BY recall_number, model_id
+                HAVING COUNT(*) > 1
+            ) k ON k.recall_number = r.recall_number AND k.model_id = r.model_id
+            WHERE r.id <> k.keep_id
+        """)
+        # 같은 차량번호에 유지 행 이력이 이미 있으면 (unique_car_recall) 옮기지 않고 삭제
+        cursor.execute("""
+            UPDATE IGNORE car_recall_history h
+            JOIN recall_keep k ON k.id = h.recall_id
+            SET h.recall_id = k.keep_id
+        """)
+        cursor.execute("DELETE h FROM car_recall_history h JOIN recall_keep k ON k.id = h.recall_id")
+        cursor.execute("DELETE r FROM RecallInfo r JOIN recall_keep k ON k.id = r.id")
+        if cursor.rowcount:
+            print(f"SUCCESS: RecallInfo 중복 행 {cursor.rowcount}건 정리")
+        cursor.execute("DROP TEMPORARY TABLE recall_keep")
+        
+    def ensure_column(self, cursor, table, column_name, alter_clause):
+        """기존 테이블에 컬럼이 없으면 추가"""
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND column_name = %s
+        """, (self.database_name, table, column_name))
+        if cursor.fetchone()[0]:
+            return
+        try:
+            cursor.execute(f"ALTER TABLE {table} {alter_clause}")
+            print(f"SUCCESS: {table}.{column_name} 컬럼 추가")
+        except Error as e:
+            print(f"WARNING: {table}.{column_name} 컬럼 추가 실패: {e}")
+        
     def initialize_with_sample_data(self):
         """데이터베이스 초기화 및 샘플 데이터 생성"""
         self.create_database()
@@ -353,6 +630,10 @@ class DatabaseManager:
         
         print("SUCCESS: 데이터베이스 삭제 완료")
         
+        # 프로세스 내 CarModel 캐시도 비움
+        from database.db_helper import db_helper
+        db_helper.model_resolver.invalidate()
+        
         # 재생성
         self.initialize_with_sample_data()
 
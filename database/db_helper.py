@@ -1,37 +1,64 @@
 """
 Database connection and query helper functions
 """
-import mysql.connector
 from mysql.connector import Error
 import pandas as pd
+import hashlib
 from contextlib import contextmanager
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.config import DATABASE_CONFIG
+from config.config import DATABASE_CONFIG, MILEAGE_BANDS, MILEAGE_BAND_UNKNOWN
+from database.connection_pool import ConnectionPool
+from database.car_model_resolver import CarModelResolver
+from database.bulk_writer import BulkWriter
+from database.production_period import parse_production_period
 import logging
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RECALL_INFO_COLUMNS = [
+    'model_id', 'recall_number', 'recall_date', 'recall_title', 'recall_reason',
+    'defect_content', 'correction_method', 'production_period', 'production_start', 'production_end',
+    'affected_units',
+    'target_quantity', 'corrected_quantity', 'correction_rate', 'severity_level',
+    'recall_type', 'device_category', 'recall_status', 'detail_url', 'source', 'collected_date'
+]
+RECALL_INFO_UPDATE_COLUMNS = ['recall_title', 'recall_reason', 'affected_units', 'correction_rate']
+
+
+def synthetic_recall_number(record):
+    """Stable recall_number for list rows that do not show one (model + date + title hash)"""
+    key = '|'.join(str(record.get(field) or '') for field in
+                   ('manufacturer', 'model_name', 'model_id', 'recall_date', 'recall_title'))
+    return 'H' + hashlib.md5(key.encode('utf-8')).hexdigest()[:20]
+
 class DBHelper:
     def __init__(self):
         self.config = DATABASE_CONFIG
+        self.pool = ConnectionPool(self.config)
+        self.model_resolver = CarModelResolver(self)
+        self.bulk_writer = BulkWriter(self)
         
     @contextmanager
     def get_db_connection(self):
-        """Database connection management with context manager"""
-        connection = None
+        """Borrow a pooled connection (context manager)"""
         try:
-            connection = mysql.connector.connect(**self.config)
-            yield connection
+            with self.pool.connection() as connection:
+                yield connection
         except Error as e:
             logger.error(f"Database connection error: {e}")
             raise
-        finally:
-            if connection and connection.is_connected():
-                connection.close()
+                
+    def get_pool_stats(self):
+        """Connection pool metrics (waits, borrow latency, in-use count)"""
+        return self.pool.stats()
+        
+    def close_pool(self):
+        """Close idle pooled connections"""
+        self.pool.close_all()
                 
     def execute_query(self, query, params=None, fetch=True):
         """Execute single query"""
@@ -94,7 +121,10 @@ class DBHelper:
             kwargs.get('segment', 'General'),
             kwargs.get('fuel_type', 'Gasoline')
         )
-        return self.execute_query(query, params, fetch=False)
+        result = self.execute_query(query, params, fetch=False)
+        if result:
+            self.model_resolver.invalidate(manufacturer, model_name)
+        return result
         
     def get_car_model_id(self, manufacturer, model_name, release_year=None):
         """Get car model ID"""
@@ -154,6 +184,120 @@ class DBHelper:
         params = (model_id, region, registration_date, registration_count, cumulative_count)
         return self.execute_query(query, params, fetch=False)
         
+    def upsert_registration_stats_frame(self, df, chunk_size=None, mode='batch'):
+        """Bulk upsert RegistrationStats rows from a DataFrame with model_id already mapped.
+
+        Rows are keyed on (model_id, region, registration_date, fuel_type); a frame
+        without fuel_type is written with an empty fuel type.
+        """
+        columns = ['model_id', 'region', 'fuel_type', 'registration_date', 'registration_count', 'cumulative_count']
+        if 'fuel_type' not in df.columns:
+            df = df.assign(fuel_type='')
+        return self.bulk_writer.write_frame(
+            'RegistrationStats', df, columns,
+            update_columns=['registration_count', 'cumulative_count'],
+            chunk_size=chunk_size, mode=mode
+        )
+        
+    def insert_used_car_prices_frame(self, df, chunk_size=None, mode='batch'):
+        """Bulk insert UsedCarPrice rows from a DataFrame with model_id already mapped"""
+        columns = ['model_id', 'year', 'mileage_range', 'avg_price', 'min_price', 'max_price',
+                   'sample_count', 'data_source', 'collected_date']
+        return self.bulk_writer.write_frame('UsedCarPrice', df, columns, chunk_size=chunk_size, mode=mode)
+        
+    def upsert_used_car_listings(self, df, chunk_size=None):
+        """Upsert UsedCarListing rows (first_seen is kept, everything else is refreshed)"""
+        columns = ['source', 'listing_id', 'model_id', 'year', 'mileage', 'price', 'first_seen', 'last_seen']
+        return self.bulk_writer.upsert_frame(
+            'UsedCarListing', df, columns,
+            update_columns=['model_id', 'year', 'mileage', 'price', 'last_seen'],
+            chunk_size=chunk_size
+        )
+        
+    @staticmethod
+    def _mileage_band_sql(bands=None):
+        """CASE expression mapping UsedCarListing.mileage to band labels (+ params)"""
+        clauses, params = ["WHEN mileage IS NULL THEN %s"], [MILEAGE_BAND_UNKNOWN]
+        for upper, label in (bands or MILEAGE_BANDS):
+            if upper is None:
+                clauses.append("ELSE %s")
+            else:
+                clauses.append("WHEN mileage < %s THEN %s")
+                params.append(upper)
+            params.append(label)
+        if not clauses[-1].startswith('ELSE'):
+            clauses.append("ELSE %s")
+            params.append(MILEAGE_BAND_UNKNOWN)
+        return "CASE " + ' '.join(clauses) + " END", params
+        
+    def aggregate_used_car_prices(self, source, since, model_ids=None, by_mileage=True,
+                                  bands=None, collected_date=None):
+        """Rebuild UsedCarPrice aggregates from UsedCarListing in SQL.
+
+        Listings of `source` seen on/after `since` are grouped by model, year and
+        mileage band (or year only when by_mileage=False) with avg/min/max and
+        nearest-rank p25/median/p75. Rows previously written for the same
+        source/collected_date (and models) are replaced, so re-running with other
+        bands needs no re-crawl. Returns the number of UsedCarPrice rows written.
+        """
+        collected_date = collected_date or pd.Timestamp.now().date()
+        if by_mileage:
+            band_sql, band_params = self._mileage_band_sql(bands)
+        else:
+            band_sql, band_params = "CONCAT(year, '년식 평균')", []
+        
+        where = "source = %s AND last_seen >= %s"
+        where_params = [source, since]
+        model_filter = ""
+        if model_ids:
+            placeholders = ', '.join(['%s'] * len(model_ids))
+            where += f" AND model_id IN ({placeholders})"
+            model_filter = f" AND model_id IN ({placeholders})"
+            where_params += list(model_ids)
+        
+        delete_query = f"DELETE FROM UsedCarPrice WHERE data_source = %s AND collected_date = %s{model_filter}"
+        delete_params = [source, collected_date] + list(model_ids or [])
+        
+        insert_query = f"""
+        INSERT INTO UsedCarPrice
+        (model_id, year, mileage_range, avg_price, min_price, max_price,
+         p25_price, median_price, p75_price, sample_count, data_source, collected_date)
+        SELECT model_id, year, mileage_range,
+               ROUND(AVG(price)), MIN(price), MAX(price),
+               MIN(CASE WHEN rn >= CEIL(0.25 * cnt) THEN price END),
+               MIN(CASE WHEN rn >= CEIL(0.50 * cnt) THEN price END),
+               MIN(CASE WHEN rn >= CEIL(0.75 * cnt) THEN price END),
+               COUNT(*), %s, %s
+        FROM (
+            SELECT model_id, year, mileage_range, price,
+                   ROW_NUMBER() OVER (PARTITION BY model_id, year, mileage_range ORDER BY price) AS rn,
+                   COUNT(*) OVER (PARTITION BY model_id, year, mileage_range) AS cnt
+            FROM (
+                SELECT model_id, year, price, {band_sql} AS mileage_range
+                FROM UsedCarListing
+                WHERE {where}
+            ) banded
+        ) ranked
+        GROUP BY model_id, year, mileage_range
+        """
+        insert_params = [source, collected_date] + band_params + where_params
+        
+        with self.get_db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                connection.start_transaction()
+                cursor.execute(delete_query, delete_params)
+                cursor.execute(insert_query, insert_params)
+                written = cursor.rowcount
+                connection.commit()
+                return written
+            except Error as e:
+                connection.rollback()
+                logger.error(f"UsedCarPrice aggregation error ({source}): {e}")
+                raise
+            finally:
+                cursor.close()
+        
     def get_used_car_prices(self, model_id=None, year=None):
         """Query used car prices"""
         query = "SELECT * FROM UsedCarPrice WHERE 1=1"
@@ -250,6 +394,41 @@ class DBHelper:
         params = (source, status, records_collected, error_message)
         return self.execute_query(query, params, fetch=False)
         
+    def get_crawl_checkpoint(self, source):
+        """CrawlCheckpoint row of a source (None before the first incremental run)"""
+        result = self.execute_query("SELECT * FROM CrawlCheckpoint WHERE source = %s", (source,))
+        return result[0] if result else None
+        
+    def save_crawl_checkpoint(self, source, **fields):
+        """Upsert the given CrawlCheckpoint columns of a source"""
+        columns = ['source'] + list(fields)
+        query = f"""
+        INSERT INTO CrawlCheckpoint ({', '.join(columns)})
+        VALUES ({', '.join(['%s'] * len(columns))})
+        ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in fields)}
+        """
+        return self.execute_query(query, [source] + list(fields.values()), fetch=False)
+        
+    def get_recall_coverage(self, source='car.go.kr'):
+        """(coverage_start, covered_until) of the recall list crawl: every recall dated in that
+        range is stored. (None, None) before the first finished crawl"""
+        checkpoint = self.get_crawl_checkpoint(source) or {}
+        return checkpoint.get('coverage_start'), checkpoint.get('covered_until')
+        
+    def get_recall_keys_on(self, recall_date, source='car.go.kr'):
+        """(recall_number or recall_title, manufacturer, model_name) keys already stored for one recall_date"""
+        rows = self.execute_query("""
+            SELECT ri.recall_number, ri.recall_title, cm.manufacturer, cm.model_name
+            FROM RecallInfo ri
+            JOIN CarModel cm ON cm.model_id = ri.model_id
+            WHERE ri.recall_date = %s AND ri.source = %s
+        """, (recall_date, source)) or []
+        keys = set()
+        for row in rows:
+            keys.update((value, row['manufacturer'], row['model_name'])
+                        for value in (row['recall_number'], row['recall_title']) if value)
+        return keys
+        
     def get_latest_prices_comparison(self, model_id):
         """Latest used/new car price comparison data for specific model"""
         # 중고차 최신 평균가
@@ -275,17 +454,288 @@ class DBHelper:
             'new_prices': new_prices.to_dict('records')[0] if not new_prices.empty else {}
         }
 
+    def get_model_score_inputs(self, model_ids=None):
+        """Pre-aggregated value-score inputs for every model in one grouped query"""
+        model_filter = ""
+        params = []
+        if model_ids:
+            model_filter = " AND model_id IN (" + ', '.join(['%s'] * len(model_ids)) + ")"
+            
+        query = f"""
+        SELECT cm.model_id, cm.manufacturer, cm.model_name, cm.segment,
+               u.used_avg_price, n.new_avg_price, n.new_min_price,
+               COALESCE(r.recall_count, 0) AS recall_count,
+               COALESCE(r.severe_recalls, 0) AS severe_recalls,
+               g.total_registrations,
+               (g.model_id IS NOT NULL) AS has_registrations
+        FROM CarModel cm
+        LEFT JOIN (
+            SELECT model_id, AVG(avg_price) AS used_avg_price
+            FROM UsedCarPrice
+            WHERE collected_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY){model_filter}
+            GROUP BY model_id
+        ) u ON u.model_id = cm.model_id
+        LEFT JOIN (
+            SELECT model_id, AVG(base_price) AS new_avg_price, MIN(base_price) AS new_min_price
+            FROM NewCarPrice
+            WHERE valid_from <= CURDATE() AND valid_until >= CURDATE(){model_filter}
+            GROUP BY model_id
+        ) n ON n.model_id = cm.model_id
+        LEFT JOIN (
+            SELECT model_id, COUNT(*) AS recall_count,
+                   SUM(severity_level IN ('심각', '매우심각')) AS severe_recalls
+            FROM RecallInfo
+            WHERE 1=1{model_filter}
+            GROUP BY model_id
+        ) r ON r.model_id = cm.model_id
+        LEFT JOIN (
+            SELECT model_id, SUM(registration_count) AS total_registrations
+            FROM RegistrationStats
+            WHERE 1=1{model_filter}
+            GROUP BY model_id
+        ) g ON g.model_id = cm.model_id
+        WHERE 1=1{model_filter.replace('model_id', 'cm.model_id')}
+        ORDER BY cm.model_id
+        """
+        if model_ids:
+            params = list(model_ids) * 5
+        return self.fetch_dataframe(query, params)
+        
+    # === FuelEfficiency ===
+    
+    def upsert_fuel_efficiency_frame(self, df, chunk_size=None):
+        """Upsert FuelEfficiency rows from a DataFrame with model_id already mapped"""
+        columns = ['model_id', 'model_year', 'fuel_type', 'displacement', 'city_efficiency',
+                   'highway_efficiency', 'combined_efficiency', 'source', 'collected_date']
+        return self.bulk_writer.upsert_frame('FuelEfficiency', df, columns, update_columns=columns[4:],
+                                             chunk_size=chunk_size)
+        
+    def get_fuel_cost_inputs(self, model_ids=None):
+        """Every model with its latest-model-year combined efficiency per fuel type (trims averaged).
+
+        Models without efficiency data come back once with NULL efficiency columns.
+        """
+        model_filter = ""
+        params = []
+        if model_ids:
+            model_filter = " AND model_id IN (" + ', '.join(['%s'] * len(model_ids)) + ")"
+            params = list(model_ids) * 3
+        query = f"""
+        SELECT cm.model_id, cm.fuel_type AS model_fuel_type, e.fuel_type, e.model_year,
+               e.combined_efficiency, e.trims
+        FROM CarModel cm
+        LEFT JOIN (
+            SELECT fe.model_id, fe.fuel_type, fe.model_year,
+                   AVG(fe.combined_efficiency) AS combined_efficiency, COUNT(*) AS trims
+            FROM FuelEfficiency fe
+            JOIN (
+                SELECT model_id, MAX(model_year) AS model_year
+                FROM FuelEfficiency
+                WHERE combined_efficiency > 0{model_filter}
+                GROUP BY model_id
+            ) latest ON latest.model_id = fe.model_id AND latest.model_year = fe.model_year
+            WHERE fe.combined_efficiency > 0{model_filter.replace('model_id', 'fe.model_id')}
+            GROUP BY fe.model_id, fe.fuel_type, fe.model_year
+        ) e ON e.model_id = cm.model_id
+        WHERE 1=1{model_filter.replace('model_id', 'cm.model_id')}
+        ORDER BY cm.model_id
+        """
+        return self.fetch_dataframe(query, params)
+        
+    def get_used_price_history(self, model_ids=None):
+        """Average used price per (model_id, model year) for every model in one grouped query"""
+        query = "SELECT model_id, year, AVG(avg_price) AS avg_price FROM UsedCarPrice"
+        params = []
+        if model_ids:
+            query += " WHERE model_id IN (" + ', '.join(['%s'] * len(model_ids)) + ")"
+            params = list(model_ids)
+        query += " GROUP BY model_id, year ORDER BY model_id, year DESC"
+        return self.fetch_dataframe(query, params)
+        
+    # === DepreciationModel (fitted depreciation coefficients) ===
+
+    def get_used_price_observations(self, after_price_id=None, before=None):
+        """UsedCarPrice rows with the model's segment, inserted after `after_price_id` and before `before`.
+
+        Rows of sources that keep UsedCarListing are skipped: they are rolling-window
+        aggregates of the same listings, which get_listing_observations reads once each.
+        """
+        query = """
+        SELECT ucp.price_id, ucp.model_id, cm.segment, ucp.year, ucp.mileage_range, ucp.avg_price,
+               ucp.sample_count, ucp.collected_date
+        FROM UsedCarPrice ucp
+        JOIN CarModel cm ON cm.model_id = ucp.model_id
+        WHERE ucp.avg_price > 0 AND ucp.year IS NOT NULL
+          AND ucp.data_source NOT IN (SELECT DISTINCT source FROM UsedCarListing)
+        """
+        params = []
+        if after_price_id is not None:
+            query += " AND ucp.price_id > %s"
+            params.append(after_price_id)
+        if before is not None:
+            query += " AND ucp.created_at < %s"
+            params.append(before)
+        return self.fetch_dataframe(query, params)
+
+    def get_listing_observations(self, since=None, before=None, bands=None):
+        """UsedCarListing rows first seen after `since` and before `before`, one observation per listing"""
+        band_sql, band_params = self._mileage_band_sql(bands)
+        query = f"""
+        SELECT ucl.model_id, cm.segment, ucl.year, {band_sql} AS mileage_range, ucl.price AS avg_price,
+               1 AS sample_count, ucl.first_seen AS collected_date
+        FROM UsedCarListing ucl
+        JOIN CarModel cm ON cm.model_id = ucl.model_id
+        WHERE ucl.price > 0 AND ucl.year IS NOT NULL
+        """
+        params = list(band_params)
+        if since is not None:
+            query += " AND ucl.first_seen > %s"
+            params.append(since)
+        if before is not None:
+            query += " AND ucl.first_seen < %s"
+            params.append(before)
+        return self.fetch_dataframe(query, params)
+
+    def get_depreciation_models(self, model_version, scope=None, with_statistics=False):
+        """Stored depreciation fits of one model version (sufficient statistics only on request)"""
+        columns = "scope, scope_key, segment, coefficients, annual_depreciation, anchor_year, anchor_price"
+        if with_statistics:
+            columns += ", xtx, xty, yty, weight_sum, n_obs, anchor_date, price_watermark, listing_watermark"
+        query = f"SELECT {columns} FROM DepreciationModel WHERE model_version = %s"
+        params = [model_version]
+        if scope:
+            query += " AND scope = %s"
+            params.append(scope)
+        return self.fetch_dataframe(query, params)
+
+    def upsert_depreciation_models(self, frame, replace=False):
+        """Write DepreciationModel rows; replace=True first drops every stored fit (full refit)"""
+        if replace:
+            self.execute_query("DELETE FROM DepreciationModel", fetch=False)
+        columns = ['scope', 'scope_key', 'model_version', 'segment', 'coefficients', 'xtx', 'xty', 'yty',
+                   'weight_sum', 'n_obs', 'rmse', 'annual_depreciation', 'anchor_year', 'anchor_price',
+                   'anchor_date', 'price_watermark', 'listing_watermark']
+        return self.bulk_writer.upsert_frame('DepreciationModel', frame, columns, update_columns=columns[2:])
+
+    def get_depreciation_rates(self, model_version, model_ids=None):
+        """Fitted anchor price and annual depreciation per model -> DataFrame"""
+        query = ("SELECT CAST(scope_key AS UNSIGNED) AS model_id, anchor_price, annual_depreciation "
+                 "FROM DepreciationModel WHERE scope = 'model' AND model_version = %s "
+                 "AND anchor_price IS NOT NULL")
+        params = [model_version]
+        if model_ids:
+            query += " AND scope_key IN (" + ', '.join(['%s'] * len(model_ids)) + ")"
+            params += [str(model_id) for model_id in model_ids]
+        return self.fetch_dataframe(query, params)
+
+    # === ModelScore (materialised value scores) ===
+    
+    def get_score_source_watermarks(self):
+        """Current high-water timestamps of the score input tables"""
+        query = """
+        SELECT (SELECT MAX(created_at) FROM UsedCarPrice) AS used_price_watermark,
+               (SELECT MAX(created_at) FROM NewCarPrice) AS new_price_watermark,
+               (SELECT MAX(updated_at) FROM RecallInfo) AS recall_watermark,
+               (SELECT MAX(updated_at) FROM RegistrationStats) AS registration_watermark
+        """
+        return self.execute_query(query)[0]
+        
+    def get_changed_score_model_ids(self, score_version):
+        """Models whose inputs changed since the last ModelScore refresh (or that have no score yet)"""
+        marks = self.execute_query("""
+        SELECT MAX(used_price_watermark) AS used_price_watermark,
+               MAX(new_price_watermark) AS new_price_watermark,
+               MAX(recall_watermark) AS recall_watermark,
+               MAX(registration_watermark) AS registration_watermark
+        FROM ModelScore WHERE score_version = %s
+        """, (score_version,))[0]
+        
+        epoch = '1970-01-01 00:00:00'
+        query = """
+        SELECT model_id FROM UsedCarPrice WHERE created_at >= %s
+        UNION SELECT model_id FROM NewCarPrice WHERE created_at >= %s
+        UNION SELECT model_id FROM RecallInfo WHERE updated_at >= %s
+        UNION SELECT model_id FROM RegistrationStats WHERE updated_at >= %s
+        UNION SELECT cm.model_id FROM CarModel cm
+              LEFT JOIN ModelScore ms ON ms.model_id = cm.model_id AND ms.score_version = %s
+              WHERE ms.model_id IS NULL
+        """
+        params = (
+            marks['used_price_watermark'] or epoch,
+            marks['new_price_watermark'] or epoch,
+            marks['recall_watermark'] or epoch,
+            marks['registration_watermark'] or epoch,
+            score_version
+        )
+        return [row['model_id'] for row in self.execute_query(query, params) if row['model_id'] is not None]
+        
+    def upsert_model_scores(self, scores_df, score_version, watermarks):
+        """Write ModelScore rows for the given score frame"""
+        frame = scores_df[['model_id', 'price_score', 'reliability_score',
+                           'popularity_score', 'total_score']].copy()
+        frame['score_version'] = score_version
+        for key in ('used_price_watermark', 'new_price_watermark', 'recall_watermark', 'registration_watermark'):
+            frame[key] = watermarks.get(key)
+        columns = ['model_id', 'score_version', 'price_score', 'reliability_score', 'popularity_score',
+                   'total_score', 'used_price_watermark', 'new_price_watermark', 'recall_watermark',
+                   'registration_watermark']
+        return self.bulk_writer.upsert_frame('ModelScore', frame, columns, update_columns=columns[2:])
+        
+    def get_model_score(self, model_id, score_version):
+        """Primary-key lookup of a materialised score"""
+        result = self.execute_query(
+            "SELECT * FROM ModelScore WHERE model_id = %s AND score_version = %s",
+            (model_id, score_version)
+        )
+        return result[0] if result else None
+        
+    def get_model_scores(self, model_ids, score_version):
+        """Materialised scores for many models in one query -> DataFrame"""
+        if not model_ids:
+            return pd.DataFrame(columns=['model_id', 'price_score', 'reliability_score',
+                                         'popularity_score', 'total_score'])
+        query = ("SELECT model_id, price_score, reliability_score, popularity_score, total_score "
+                 "FROM ModelScore WHERE score_version = %s AND model_id IN ("
+                 + ', '.join(['%s'] * len(model_ids)) + ")")
+        return self.fetch_dataframe(query, [score_version] + list(model_ids))
+        
+    def update_recall_severity(self, ids_by_level, chunk_size=1000):
+        """Set RecallInfo.severity_level for many rows: {level: [id, ...]} -> rows updated"""
+        updated = 0
+        with self.get_db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                for level, ids in ids_by_level.items():
+                    ids = list(ids)
+                    for start in range(0, len(ids), chunk_size):
+                        chunk = ids[start:start + chunk_size]
+                        placeholders = ', '.join(['%s'] * len(chunk))
+                        cursor.execute(
+                            f"UPDATE RecallInfo SET severity_level = %s WHERE id IN ({placeholders})",
+                            [level] + chunk
+                        )
+                        updated += cursor.rowcount
+                connection.commit()
+            except Error as e:
+                connection.rollback()
+                logger.error(f"Recall severity update error: {e}")
+                raise
+            finally:
+                cursor.close()
+        return updated
+        
     def insert_recall_info(self, **kwargs):
         """Register recall information"""
         query = """
         INSERT INTO RecallInfo (
             model_id, recall_number, recall_date, recall_title, recall_reason,
-            defect_content, correction_method, production_period, affected_units,
-            target_quantity, corrected_quantity, correction_rate, severity_level,
+            defect_content, correction_method, production_period, production_start, production_end,
+            affected_units, target_quantity, corrected_quantity, correction_rate, severity_level,
             recall_type, device_category, recall_status, detail_url, source, collected_date
         ) VALUES (
             %(model_id)s, %(recall_number)s, %(recall_date)s, %(recall_title)s, %(recall_reason)s,
-            %(defect_content)s, %(correction_method)s, %(production_period)s, %(affected_units)s,
+            %(defect_content)s, %(correction_method)s, %(production_period)s, %(production_start)s,
+            %(production_end)s, %(affected_units)s,
             %(target_quantity)s, %(corrected_quantity)s, %(correction_rate)s, %(severity_level)s,
             %(recall_type)s, %(device_category)s, %(recall_status)s, %(detail_url)s, %(source)s, %(collected_date)s
         )
@@ -320,8 +770,123 @@ class DBHelper:
             'collected_date': kwargs.get('collected_date', datetime.now().date())
         }
 
+        data['production_start'], data['production_end'] = parse_production_period(data['production_period'])
+
         return self.execute_insert(query, data)
 
+    def insert_recall_info_many(self, records):
+        """Upsert a page of recalls with one multi-row statement and one commit.
+
+        records: dicts with the insert_recall_info fields plus either model_id or
+        manufacturer/model_name (resolved for the whole batch at once). Rows
+        without a recall_number get a synthetic one so the upsert stays keyed on
+        (recall_number, model_id); one recall number covering several models
+        keeps one row per model. If the batch statement fails, rows are retried one by one
+        inside the same transaction. Returns {'saved': n, 'errors': [{'index',
+        'recall_number', 'error'}, ...]}.
+        """
+        result = {'saved': 0, 'errors': []}
+        records = list(records)
+        if not records:
+            return result
+
+        to_resolve = [record for record in records if not record.get('model_id')]
+        model_ids = self.resolve_car_models([
+            {'manufacturer': record.get('manufacturer') or '확인필요',
+             'model_name': record.get('model_name') or '확인필요'}
+            for record in to_resolve
+        ]) if to_resolve else {}
+
+        rows, indexes = [], []
+        today = pd.Timestamp.now().date()
+        for index, record in enumerate(records):
+            model_id = record.get('model_id') or model_ids.get(
+                (record.get('manufacturer') or '확인필요', record.get('model_name') or '확인필요'))
+            recall_number = record.get('recall_number') or synthetic_recall_number(record)
+            if not model_id:
+                result['errors'].append({'index': index, 'recall_number': recall_number,
+                                         'error': 'model_id could not be resolved'})
+                continue
+            rows.append((
+                model_id, recall_number, record.get('recall_date'), record.get('recall_title', ''),
+                record.get('recall_reason', ''), record.get('defect_content', ''),
+                record.get('correction_method', ''), record.get('production_period', ''),
+                *parse_production_period(record.get('production_period')),
+                record.get('affected_units', 0), record.get('target_quantity', 0),
+                record.get('corrected_quantity', 0), record.get('correction_rate', 0.0),
+                record.get('severity_level', 'Unknown'), record.get('recall_type', 'Safety'),
+                record.get('device_category', ''), record.get('recall_status', 'In Progress'),
+                record.get('detail_url', ''), record.get('source', 'car.go.kr'),
+                record.get('collected_date') or today
+            ))
+            indexes.append(index)
+        if not rows:
+            return result
+
+        suffix = ", updated_at=CURRENT_TIMESTAMP"
+        batch_query = BulkWriter.build_upsert_query(
+            'RecallInfo', RECALL_INFO_COLUMNS, len(rows), RECALL_INFO_UPDATE_COLUMNS) + suffix
+        with self.get_db_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                connection.start_transaction()
+                try:
+                    cursor.execute(batch_query, [value for row in rows for value in row])
+                    result['saved'] = len(rows)
+                except Error as e:
+                    # 배치 실패 시 같은 트랜잭션 안에서 행 단위로 재시도해 불량 행만 보고
+                    logger.warning(f"Recall batch upsert failed, retrying row by row: {e}")
+                    connection.rollback()
+                    connection.start_transaction()
+                    row_query = BulkWriter.build_upsert_query(
+                        'RecallInfo', RECALL_INFO_COLUMNS, 1, RECALL_INFO_UPDATE_COLUMNS) + suffix
+                    for index, row in zip(indexes, rows):
+                        try:
+                            cursor.execute(row_query, row)
+                            result['saved'] += 1
+                        except Error as row_error:
+                            result['errors'].append({'index': index, 'recall_number': row[1],
+                                                     'error': str(row_error)})
+                connection.commit()
+            except Error as e:
+                connection.rollback()
+                logger.error(f"Recall batch insert error: {e}")
+                raise
+            finally:
+                cursor.close()
+        result['errors'].sort(key=lambda error: error['index'])
+        return result
+
+    def backfill_production_periods(self, chunk_size=1000):
+        """Parse production_period into production_start/end for rows that lack them -> rows updated"""
+        rows = self.execute_query("""
+        SELECT id, production_period FROM RecallInfo
+        WHERE production_period IS NOT NULL AND production_period <> ''
+          AND production_start IS NULL AND production_end IS NULL
+        """)
+        updates = []
+        for row in rows:
+            start, end = parse_production_period(row['production_period'])
+            if start or end:
+                updates.append((start, end, row['id']))
+        updated = 0
+        for start in range(0, len(updates), chunk_size):
+            updated += self.execute_many(
+                "UPDATE RecallInfo SET production_start = %s, production_end = %s WHERE id = %s",
+                updates[start:start + chunk_size]
+            )
+        logger.info(f"Production period backfill: {len(updates)}/{len(rows)} rows parsed")
+        return updated
+
+    def get_recall_applicability_rows(self):
+        """Columns needed by RecallApplicabilityIndex for every recall with a model"""
+        return self.execute_query("""
+        SELECT id, model_id, recall_number, recall_date, recall_title, severity_level,
+               recall_status, production_start, production_end
+        FROM RecallInfo
+        WHERE model_id IS NOT NULL
+        """)
+
     def get_recall_statistics(self, manufacturer=None, model_name=None, days=365):
         """Query recall statistics"""
         base_query = """
@@ -365,54 +930,63 @@ class DBHelper:
 
     def insert_car_recall_check(self, car_number, recall_results):
         """Save recall check results by vehicle"""
-        for recall in recall_results:
-            query = """
-            INSERT INTO car_recall_history (
-                car_number, model_id, recall_status, check_date, notes
-            ) VALUES (
-                %(car_number)s, %(model_id)s, %(recall_status)s, %(check_date)s, %(notes)s
-            )
-            ON DUPLICATE KEY UPDATE
-                recall_status=VALUES(recall_status),
-                check_date=VALUES(check_date)
-            """
-
-            # 모델 ID 찾기
-            model_id = self.get_or_insert_car_model(recall.get('manufacturer'), recall.get('model_name'))
+        model_ids = self.resolve_car_models(recall_results)
+        today = pd.Timestamp.now().date()
+        rows = [{
+            'car_number': car_number,
+            'model_id': model_ids.get((recall.get('manufacturer'), recall.get('model_name'))),
+            'recall_status': recall.get('recall_status', 'Check Required'),
+            'check_date': recall.get('collected_date', today),
+            'notes': recall.get('recall_reason', '')
+        } for recall in recall_results]
+        return self.insert_car_recall_checks(rows)
 
-            from datetime import datetime
-            data = {
-                'car_number': car_number,
-                'model_id': model_id,
-                'recall_status': recall.get('recall_status', 'Check Required'),
-                'check_date': recall.get('collected_date', datetime.now().date()),
-                'notes': recall.get('recall_reason', '')
-            }
-
-            self.execute_insert(query, data)
+    def insert_car_recall_checks(self, rows, chunk_size=None):
+        """Bulk upsert car_recall_history rows (dicts; missing columns are written as NULL).
 
+        Rows are keyed on (identifier, check_date, result_key): the identifier is
+        car_number or vin and result_key is MD5(notes), so re-checking a car on
+        the same day updates its rows instead of appending new ones.
+        """
+        columns = ['car_number', 'vin', 'identifier', 'model_id', 'recall_id', 'recall_status',
+                   'check_date', 'notes', 'result_key']
+        keyed = []
+        for row in rows:
+            notes = row.get('notes') or ''
+            keyed.append({**row, 'notes': notes,
+                          'identifier': row.get('car_number') or row.get('vin') or '',
+                          'result_key': hashlib.md5(notes.encode('utf-8')).hexdigest()})
+        return self.bulk_writer.upsert(
+            'car_recall_history', columns,
+            [tuple(row.get(column) for column in columns) for row in keyed],
+            update_columns=['recall_status'],
+            chunk_size=chunk_size
+        )
 
-    
-    def get_or_insert_car_model(self, manufacturer, model_name, fuel_type=None, **kwargs):
-        """Query or insert car model"""
-        # 먼저 모델 ID 조회 시도
-        query = "SELECT model_id FROM CarModel WHERE manufacturer = %s AND model_name = %s LIMIT 1"
-        result = self.execute_query(query, (manufacturer, model_name))
-        model_id = result[0]['model_id'] if result else None
-        
-        # 모델이 존재하지 않으면 새로 삽입
-        if not model_id:
-            self.insert_car_model(
-                manufacturer=manufacturer, 
-                model_name=model_name, 
-                fuel_type=fuel_type,
-                **kwargs
+    def get_recently_checked(self, identifiers, since, column='car_number', chunk_size=1000):
+        """Identifiers with a car_recall_history row checked on/after `since` (column: car_number or vin)"""
+        if column not in ('car_number', 'vin'):
+            raise ValueError(f"unsupported identifier column: {column}")
+        identifiers = list(identifiers)
+        checked = set()
+        for start in range(0, len(identifiers), chunk_size):
+            chunk = identifiers[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            rows = self.execute_query(
+                f"SELECT DISTINCT {column} AS identifier FROM car_recall_history "
+                f"WHERE {column} IN ({placeholders}) AND check_date >= %s",
+                chunk + [since]
             )
-            # 다시 조회하여 ID 반환
-            result = self.execute_query(query, (manufacturer, model_name))
-            model_id = result[0]['model_id'] if result else None
+            checked.update(row['identifier'] for row in rows)
+        return checked
         
-        return model_id
+    def get_or_insert_car_model(self, manufacturer, model_name, fuel_type=None, **kwargs):
+        """Query or insert car model (served from the CarModel identity cache)"""
+        return self.model_resolver.resolve(manufacturer, model_name, fuel_type=fuel_type, **kwargs)
+
+    def resolve_car_models(self, records):
+        """Resolve many (manufacturer, model_name) pairs to model IDs in a few round trips"""
+        return self.model_resolver.resolve_many(records)
 
     def execute_insert(self, query, data):
         """Execute INSERT query"""
@@ -0,0 +1,81 @@
+"""
+Bulk ingestion of the DATA_FILES CSV exports into MySQL
+"""
+import os
+import sys
+import logging
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import DATA_FILES, CRAWLING_CONFIG
+from database.db_helper import db_helper
+
+logger = logging.getLogger(__name__)
+
+CSV_READ_CHUNK = 200000
+
+
+def _map_model_ids(df):
+    """Attach model_id to a frame with manufacturer/model_name columns"""
+    names = df[['manufacturer', 'model_name']].drop_duplicates()
+    model_ids = db_helper.resolve_car_models(names.to_dict('records'))
+    id_frame = pd.DataFrame(
+        [(mf, mn, model_id) for (mf, mn), model_id in model_ids.items()],
+        columns=['manufacturer', 'model_name', 'model_id']
+    )
+    return df.merge(id_frame, on=['manufacturer', 'model_name'], how='inner')
+
+
+def ingest_used_car_prices_csv(file_path=None, mode='auto', chunk_size=None):
+    """Load DATA_FILES['used_car_prices'] (manufacturer, model_name, year, ... columns) into UsedCarPrice"""
+    file_path = file_path or DATA_FILES['used_car_prices']
+    if not os.path.exists(file_path):
+        logger.error(f"File not found: {file_path}")
+        return 0
+
+    total = 0
+    for chunk in pd.read_csv(file_path, chunksize=CSV_READ_CHUNK):
+        if 'model_id' not in chunk.columns:
+            chunk = _map_model_ids(chunk)
+        for col, default in (('mileage_range', None), ('min_price', None), ('max_price', None),
+                             ('sample_count', 0), ('data_source', 'csv')):
+            if col not in chunk.columns:
+                chunk[col] = default
+        if 'collected_date' not in chunk.columns:
+            chunk['collected_date'] = pd.Timestamp.now().date()
+
+        stats = db_helper.insert_used_car_prices_frame(chunk, chunk_size=chunk_size, mode=mode)
+        total += stats['rows']
+
+    logger.info(f"UsedCarPrice CSV ingest completed: {total} rows ({file_path})")
+    return total
+
+
+def ingest_registration_file(file_path=None, mode='auto', convert_to=None):
+    """Stream a registration workbook / CSV / Parquet into RegistrationStats,
+    or convert it once to a cleaned .parquet/.csv when convert_to is given"""
+    from crawlers.public_data_crawler import PublicDataCrawler
+    crawler = PublicDataCrawler(CRAWLING_CONFIG.get('public_data', {}))
+    file_path = file_path or CRAWLING_CONFIG.get('public_data', {}).get('file_path')
+    if convert_to:
+        return crawler.convert_registration_file(file_path, convert_to)
+    return crawler.ingest_registration_file(file_path, mode=mode)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CSV / registration file bulk ingest')
+    parser.add_argument('--file', default=None, help="input path (default: DATA_FILES['used_car_prices'])")
+    parser.add_argument('--mode', choices=['batch', 'infile', 'auto'], default='auto')
+    parser.add_argument('--registration', action='store_true',
+                        help='input is a registration xlsx/csv/parquet file (RegistrationStats)')
+    parser.add_argument('--convert-to', default=None,
+                        help='with --registration: write a cleaned .parquet/.csv instead of loading')
+    args = parser.parse_args()
+
+    if args.registration:
+        ingest_registration_file(args.file, mode=args.mode, convert_to=args.convert_to)
+    else:
+        ingest_used_car_prices_csv(args.file, mode=args.mode)
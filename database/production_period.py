@@ -0,0 +1,64 @@
+"""
+RecallInfo.production_period text -> (production_start, production_end) dates
+
+Handles the formats seen on car.go.kr and in manual imports:
+    2019.03.15 ~ 2020.12.31     2019-03-15~2020-12-31     2019/03/15 - 2020/12/31
+    2019년 3월 15일 ~ 2020년 12월 31일     2019.03 ~ 2020.12     2019년식 ~ 2021년식
+    2019.03.15 이후 / ~ 2020.12.31 (open-ended)     2020.05.01 (single day)
+Month- and year-precision bounds widen to the first/last day of the period.
+"""
+import re
+import calendar
+from datetime import date
+
+# YYYY[.-/년] M[.-/월] D[일] | YYYY[.-/년] M[월] | YYYY[년][식]
+_DATE_RE = re.compile(
+    r'(?P<year>(?:19|20)\d{2})\s*(?:[.\-/]|년)?\s*'
+    r'(?:(?P<month>1[0-2]|0?[1-9])(?!\d)\s*(?:[.\-/]|월)?\s*'
+    r'(?:(?P<day>3[01]|[12]\d|0?[1-9])(?!\d)\s*일?)?)?'
+    r'\s*(?:식)?'
+)
+_RANGE_SEP_RE = re.compile(r'\s*(?:~|～|∼|부터|에서|-{1,2}(?=\s*(?:19|20)\d{2}))\s*')
+_OPEN_END_RE = re.compile(r'이후|부터\s*$|~\s*$')
+_OPEN_START_RE = re.compile(r'이전|까지|^\s*~')
+
+
+def _bound(match, end=False):
+    year = int(match.group('year'))
+    month = match.group('month')
+    day = match.group('day')
+    if month is None:
+        return date(year, 12, 31) if end else date(year, 1, 1)
+    month = int(month)
+    if day is None:
+        return date(year, month, calendar.monthrange(year, month)[1]) if end else date(year, month, 1)
+    try:
+        return date(year, month, int(day))
+    except ValueError:
+        return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def parse_production_period(text):
+    """'2019.03.15 ~ 2020.12.31' -> (date(2019, 3, 15), date(2020, 12, 31)); unparseable -> (None, None)"""
+    if not text:
+        return None, None
+    text = str(text).strip()
+    parts = _RANGE_SEP_RE.split(text, maxsplit=1)
+    if len(parts) == 2:
+        start_match = _DATE_RE.search(parts[0])
+        end_match = _DATE_RE.search(parts[1])
+        start = _bound(start_match) if start_match else None
+        end = _bound(end_match, end=True) if end_match else None
+    else:
+        match = _DATE_RE.search(text)
+        if not match:
+            return None, None
+        if _OPEN_END_RE.search(text):
+            start, end = _bound(match), None
+        elif _OPEN_START_RE.search(text):
+            start, end = None, _bound(match, end=True)
+        else:
+            start, end = _bound(match), _bound(match, end=True)
+    if start and end and start > end:
+        start, end = end, start
+    return start, end
@@ -0,0 +1,130 @@
+"""
+In-process recall applicability index: which stored recalls apply to a car
+(model + production date / model year), without touching the network
+"""
+import time
+import bisect
+import threading
+import logging
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+
+class RecallApplicabilityIndex:
+    """RecallInfo rows grouped per model and ordered by production_start.
+
+    applicable() is a dict lookup plus a bisect over the model's recalls, so a
+    lookup costs microseconds. Recalls whose production period could not be
+    parsed apply to every car of the model and are flagged period_known=False.
+    The index reloads itself (one query) once it is older than max_age seconds.
+
+    RecallInfo only holds what the recall list crawl has stored, so an empty
+    applicable() result only means "no recall" when covers() is true: the crawl
+    has stored every recall dated from the car's production window onward and
+    finished within coverage_max_age_days. The recall list spans every maker,
+    so the coverage window is the same for all models.
+    """
+
+    def __init__(self, db, max_age=3600, coverage_max_age_days=7):
+        self.db = db
+        self.max_age = max_age
+        self.coverage_max_age_days = coverage_max_age_days
+        self._lock = threading.RLock()
+        self._by_model = {}   # model_id -> (starts, recalls) ordered by production_start
+        self._undated = {}    # model_id -> [recall, ...] (production period unknown)
+        self._coverage = (None, None)  # (coverage_start, covered_until)
+        self.loaded_at = None
+
+    # === 캐시 관리 ===
+
+    def load(self):
+        """(Re)build the index from RecallInfo"""
+        rows = self.db.get_recall_applicability_rows() or []
+        coverage = self.db.get_recall_coverage()
+        by_model, undated = {}, {}
+        for row in rows:
+            recall = dict(row)
+            if recall.get('production_start') is None and recall.get('production_end') is None:
+                recall['period_known'] = False
+                undated.setdefault(recall['model_id'], []).append(recall)
+            else:
+                recall['period_known'] = True
+                by_model.setdefault(recall['model_id'], []).append(recall)
+
+        index = {}
+        for model_id, recalls in by_model.items():
+            # 시작일 없는 (이전 전부) 리콜은 가장 앞에 정렬
+            recalls.sort(key=lambda r: r['production_start'] or date.min)
+            index[model_id] = ([r['production_start'] or date.min for r in recalls], recalls)
+
+        with self._lock:
+            self._by_model = index
+            self._undated = undated
+            self._coverage = coverage
+            self.loaded_at = time.monotonic()
+        logger.info(f"Recall applicability index loaded: {len(rows)} recalls, {len(index)} models, "
+                    f"coverage {coverage[0]} ~ {coverage[1]}")
+
+    def is_stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age
+
+    def _ensure_fresh(self):
+        if self.is_stale():
+            self.load()
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+
+    # === 조회 ===
+
+    @staticmethod
+    def _window(production_date=None, model_year=None):
+        if production_date is not None:
+            return production_date, production_date
+        if model_year is not None:
+            return date(int(model_year), 1, 1), date(int(model_year), 12, 31)
+        return None, None
+
+    def covers(self, production_date=None, model_year=None):
+        """Whether every stored-source recall that could apply to a car built then is in RecallInfo"""
+        self._ensure_fresh()
+        with self._lock:
+            coverage_start, covered_until = self._coverage
+        window_start, _ = self._window(production_date, model_year)
+        if coverage_start is None or covered_until is None or window_start is None:
+            return False
+        if self.coverage_max_age_days is not None and \
+                (date.today() - covered_until).days > self.coverage_max_age_days:
+            return False
+        # 생산 이후 발표된 리콜만 해당되므로 생산 시점부터 빠짐없이 수집돼 있어야 함
+        return window_start >= coverage_start
+
+    def applicable(self, model_id, production_date=None, model_year=None):
+        """Recalls of model_id whose production period covers the car.
+
+        production_date (date) is matched exactly; with only model_year the
+        recall applies when its period overlaps that calendar year; with
+        neither every recall of the model is returned.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            starts, recalls = self._by_model.get(model_id, ((), ()))
+            undated = self._undated.get(model_id, [])
+
+        window_start, window_end = self._window(production_date, model_year)
+        if window_start is None:
+            return list(recalls) + list(undated)
+
+        # 생산 시작일이 창 끝 이전인 리콜만 후보 (bisect), 그중 종료일이 창 시작 이후인 것
+        candidates = recalls[:bisect.bisect_right(starts, window_end)]
+        matched = [r for r in candidates if r['production_end'] is None or r['production_end'] >= window_start]
+        return matched + list(undated)
+
+    def applicable_by_name(self, manufacturer, model_name, production_date=None, model_year=None):
+        """Same as applicable() with the model resolved through the CarModel cache"""
+        model_id = self.db.model_resolver.lookup(manufacturer, model_name)
+        if not model_id:
+            return []
+        return self.applicable(model_id, production_date=production_date, model_year=model_year)
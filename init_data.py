@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from database.db_helper import db_helper
 from config.config import POPULAR_MODELS, CAR_SEGMENTS
+from analyzers.severity_classifier import classify_severity
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -200,15 +201,8 @@ class DataInitializer:
                 recall_date = datetime.now().date() - timedelta(days=random.randint(30, 365))
                 title = random.choice(recall_titles)
                 
-                # 심각도 결정
-                if '에어백' in title or '브레이크' in title or '조향' in title:
-                    severity = '매우심각'
-                elif '엔진' in title or '변속기' in title:
-                    severity = '심각'
-                elif '배출가스' in title or '연료' in title:
-                    severity = '보통'
-                else:
-                    severity = '경미'
+                # 심각도 결정 (크롤러와 같은 키워드 표)
+                severity = classify_severity(title)
                 
                 # 간단한 INSERT 쿼리로 처리
                 query = """
@@ -232,6 +232,47 @@ class EnhancedDataScheduler:
             self.stats['total_runs'] += 1
             self.stats['last_run'] = datetime.now().isoformat()
 
+    def refresh_model_scores(self, full=False):
+        """가성비 점수 테이블(ModelScore) 갱신"""
+        start_time = datetime.now()
+        logger.info(f" 모델 점수 갱신 시작 ({'전체' if full else '증분'})...")
+        
+        try:
+            from analyzers.price_analyzer import PriceAnalyzer
+            refreshed = PriceAnalyzer().refresh_model_scores(full=full)
+            duration = (datetime.now() - start_time).total_seconds()
+            logger.info(f" 모델 점수 갱신 완료: {refreshed}개 모델 (소요시간: {duration:.1f}초)")
+            return refreshed
+        except Exception as e:
+            logger.error(f"[ERROR] 모델 점수 갱신 실패: {e}")
+            return 0
+
+    def refit_depreciation_models(self, full=False):
+        """감가 모델 계수(DepreciationModel) 재적합 - 기본은 새 가격 행만 반영하는 증분"""
+        start_time = datetime.now()
+        logger.info(f" 감가 모델 재적합 시작 ({'전체' if full else '증분'})...")
+        
+        try:
+            from analyzers.depreciation_model import DepreciationModel
+            stats = DepreciationModel().refit(full=full)
+            duration = (datetime.now() - start_time).total_seconds()
+            logger.info(f" 감가 모델 재적합 완료: {stats['models']}개 모델 (소요시간: {duration:.1f}초)")
+            return stats['models']
+        except Exception as e:
+            logger.error(f"[ERROR] 감가 모델 재적합 실패: {e}")
+            return 0
+
+    def reclassify_recall_severity(self):
+        """리콜 심각도 일괄 재분류 (심각도 키워드 변경 후)"""
+        try:
+            from analyzers.recall_analyzer import RecallAnalyzer
+            summary = RecallAnalyzer().reclassify_severity()
+            logger.info(f" 리콜 심각도 재분류 완료: {summary or '변경 없음'}")
+            return summary
+        except Exception as e:
+            logger.error(f"[ERROR] 리콜 심각도 재분류 실패: {e}")
+            return {}
+
     def weekly_recall_update(self):
         """주간 리콜 정보 업데이트"""
         start_time = datetime.now()
@@ -244,6 +285,9 @@ class EnhancedDataScheduler:
             
             recall_collected = self.retry_with_backoff(lambda: self.recall_crawler.crawl_and_save(car_list))
             logger.info(f" 리콜 정보 크롤링 완료: {recall_collected}건 수집")
+            backfilled = db_helper.backfill_production_periods()
+            if backfilled:
+                logger.info(f" 리콜 생산기간 파싱: {backfilled}건")
             
             keywords = self.config.get('alerts', {}).get('critical_recall_keywords', ['화재', '브레이크'])
             placeholders = ','.join(['%s'] * len(keywords))
@@ -295,6 +339,9 @@ class EnhancedDataScheduler:
             with db_helper.get_db_connection():
                 health_status['database'] = True
             logger.info(" 데이터베이스 연결 정상")
+            pool_stats = db_helper.get_pool_stats()
+            logger.info(f" 커넥션 풀: 사용중 {pool_stats['in_use']}/{pool_stats['pool_size']}, "
+                        f"대기 {pool_stats['waits']}회, 평균 대여 {pool_stats['avg_borrow_ms']:.1f}ms")
             
             resources = self.check_system_resources()
             if resources:
@@ -336,6 +383,8 @@ class EnhancedDataScheduler:
             price_days = retention_conf.get('price_data_days', 30)
             deleted_prices = db_helper.execute_query(f"DELETE FROM UsedCarPrice WHERE collected_date < DATE_SUB(CURDATE(), INTERVAL {price_days} DAY)", fetch=False)
             logger.info(f" {price_days}일 이상된 가격 데이터 {deleted_prices}건 정리")
+            deleted_listings = db_helper.execute_query(f"DELETE FROM UsedCarListing WHERE last_seen < DATE_SUB(CURDATE(), INTERVAL {price_days} DAY)", fetch=False)
+            logger.info(f" {price_days}일 이상 미노출 매물 {deleted_listings}건 정리")
             
             log_days = retention_conf.get('log_data_days', 90)
             deleted_logs = db_helper.execute_query(f"DELETE FROM CrawlingLog WHERE started_at < DATE_SUB(NOW(), INTERVAL {log_days} DAY)", fetch=False)
@@ -355,6 +404,12 @@ class EnhancedDataScheduler:
     def setup_schedule(self):
         """스케줄 설정"""
         schedule.every().day.at("03:00").do(self.daily_price_update)
+        # 당일 적재분은 재집계될 수 있어 전날까지 적재된 가격/매물 행만 반영. 가격 행은 30일 뒤 정리되지만
+        # 충분통계량에 누적되므로 전체 재적합(refit_depreciation_models(full=True))은 정기 실행하지 않음
+        schedule.every().day.at("04:15").do(self.refit_depreciation_models)
+        schedule.every().day.at("04:30").do(self.refresh_model_scores)
+        # 최근 30일 가격 기준이 매일 이동하므로 주 1회 전체 재계산
+        schedule.every().sunday.at("03:30").do(self.refresh_model_scores, full=True)
         if self.config.get('email', {}).get('send_daily_reports', True):
             schedule.every().day.at("23:30").do(self.generate_daily_report)
         
@@ -394,7 +449,7 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description='데이터 수집 스케줄러')
     parser.add_argument('--config', default='config/scheduler_config.json', help='설정 파일 경로 (JSON)')
-    parser.add_argument('--task', choices=['price', 'recall', 'registration', 'health', 'cleanup', 'report', 'backup'], help='특정 작업만 실행')
+    parser.add_argument('--task', choices=['price', 'recall', 'registration', 'scores', 'depreciation', 'severity', 'health', 'cleanup', 'report', 'backup'], help='특정 작업만 실행')
     
     args = parser.parse_args()
     
@@ -406,6 +461,9 @@ if __name__ == "__main__":
             'price': scheduler.daily_price_update,
             'recall': scheduler.weekly_recall_update,
             'registration': scheduler.monthly_registration_update,
+            'scores': scheduler.refresh_model_scores,
+            'depreciation': scheduler.refit_depreciation_models,
+            'severity': scheduler.reclassify_recall_severity,
             'health': scheduler.enhanced_health_check,
             'cleanup': scheduler.cleanup_old_data_enhanced,
             'report': scheduler.generate_daily_report,